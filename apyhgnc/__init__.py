@@ -1,8 +1,52 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
-from apyhgnc.apyhgnc import info, fetch, afetch, search, asearch
-from apyhgnc.classes import Info, Fetch, Search
+import importlib
+from typing import Any, List
+
 __author__ = """Roberto Preste"""
 __email__ = "robertopreste@gmail.com"
 __version__ = '0.2.6'
+
+# Public names and the submodule defining them; submodules (and pandas,
+# requests or aiohttp along with them) are only imported on first access.
+_EXPORTS = {
+    "info": "apyhgnc", "ainfo": "apyhgnc", "fetch": "apyhgnc",
+    "afetch": "apyhgnc", "search": "apyhgnc", "asearch": "apyhgnc",
+    "fetch_many": "apyhgnc", "afetch_many": "apyhgnc",
+    "snapshot": "apyhgnc", "resolve_symbols": "apyhgnc",
+    "iter_search": "apyhgnc", "aiter_search": "apyhgnc",
+    "query_many": "apyhgnc", "id_map": "apyhgnc",
+    "suggest": "apyhgnc", "suggest_many": "apyhgnc",
+    "Info": "classes", "Fetch": "classes", "Search": "classes",
+    "AsyncHGNCClient": "aio",
+    "Client": "client",
+    "DiskCache": "cache", "MemoryCache": "cache",
+    "FuzzyIndex": "fuzzy",
+    "Schema": "schema",
+    "Snapshot": "snapshot",
+    "Stats": "stats",
+    "write_table": "tables", "read_table": "tables",
+    "RateLimiter": "throttle",
+}
+
+# submodules, also loaded on first access as attributes of the package
+_SUBMODULES = set(_EXPORTS.values())
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import asyncio
+import pandas as pd
+from typing import Union, Optional, List, Iterable, Tuple, AsyncIterator
+from .apyhgnc import _concat_terms
+from .classes import Info, Search, Fetch, _Server
+from .client import Client
+from .schema import Schema
+
+
+class AsyncHGNCClient:
+    """Asynchronous HGNC client owning a single pooled session.
+
+    All the queries issued through the same instance share one
+    ``Client`` (and so one ``aiohttp.ClientSession``), which is closed
+    when leaving the ``async with`` block. Bulk helpers run at most
+    ``concurrency`` queries at a time.
+
+    Args:
+        client (Optional[Client]): pooled client to use; if given, it is
+            not closed on exit (default: a new client, created with
+            ``client_kwargs``)
+        concurrency (int): maximum number of queries in flight for the
+            bulk helpers (default: 10)
+        typed (Union[bool, Schema]): convert results using a typed
+            schema (True for the default one) (default: False)
+        host (Optional[str]): base URL of the HGNC REST service
+            (default: http://rest.genenames.org/)
+        **client_kwargs: arguments used to create the new client
+
+    Examples:
+        >>> async with AsyncHGNCClient(concurrency=20) as hgnc:
+        ...     await hgnc.fetch("symbol", "ZNF3")
+        ...     await hgnc.search(symbol=["BRAF", "ZNF3"])
+        ...     await hgnc.gather([hgnc.fetch_query("symbol", s)
+        ...                        for s in symbols])
+        ...     async for query, df in hgnc.as_completed(queries):
+        ...         process(df)
+    """
+
+    def __init__(self,
+                 client: Optional[Client] = None,
+                 concurrency: int = 10,
+                 typed: Union[bool, Schema] = False,
+                 host: Optional[str] = None,
+                 **client_kwargs) -> None:
+        self._owned = client is None
+        self._client = client if client is not None \
+            else Client(**client_kwargs)
+        self._concurrency = concurrency
+        self._typed = typed
+        self._host = host
+        self._semaphore = None
+
+    @property
+    def client(self) -> Client:
+        """Return the pooled client used to perform the calls.
+
+        Returns:
+            Client
+        """
+        return self._client
+
+    def search_query(self, *args, **kwargs) -> Search:
+        """Create a search query bound to this client.
+
+        Returns:
+            Search
+        """
+        return Search(*args, client=self._client, typed=self._typed,
+                      host=self._host, **kwargs)
+
+    def fetch_query(self, field: str, term: Union[str, int]) -> Fetch:
+        """Create a fetch query bound to this client.
+
+        Args:
+            field (str): HGNC field to query
+            term (Union[str,int]): query term
+
+        Returns:
+            Fetch
+        """
+        return Fetch(field, term, client=self._client, typed=self._typed,
+                     host=self._host)
+
+    async def info(self) -> Info:
+        """Retrieve basic information from HGNC.
+
+        Returns:
+            Info
+        """
+        return await Info(client=self._client, host=self._host).aload()
+
+    async def search(self, *args, **kwargs) -> pd.DataFrame:
+        """Launch an asynchronous search on HGNC.
+
+        Args:
+            *args: either a single term to search all available fields,
+                or a specific field and term to restrict the search
+            **kwargs: one or more keyword arguments with a field and a
+                string or list of strings representing the search term(s)
+
+        Returns:
+            pd.DataFrame
+        """
+        return await self._run(self.search_query(*args, **kwargs))
+
+    async def fetch(self, field: str, term: Union[str, int]) -> pd.DataFrame:
+        """Launch an asynchronous fetch from HGNC.
+
+        Args:
+            field (str): HGNC field to query
+            term (Union[str,int]): query term
+
+        Returns:
+            pd.DataFrame
+        """
+        return await self._run(self.fetch_query(field, term))
+
+    async def _run(self, query: _Server) -> pd.DataFrame:
+        """Run a query, waiting for a free concurrency slot.
+
+        Queries created without an explicit client are run with this one.
+
+        Args:
+            query (_Server): Search or Fetch query
+
+        Returns:
+            pd.DataFrame
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        if query._client is None:
+            query._client = self._client
+        async with self._semaphore:
+            return await query.aquery()
+
+    async def gather(self,
+                     queries: Iterable[_Server],
+                     return_exceptions: bool = False) -> List[pd.DataFrame]:
+        """Run several queries concurrently, returning results in order.
+
+        Args:
+            queries (Iterable[_Server]): Search or Fetch queries
+            return_exceptions (bool): return the exception raised by a
+                failed query in its place instead of raising it
+                (default: False)
+
+        Returns:
+            List[pd.DataFrame]
+        """
+        return await asyncio.gather(*[self._run(query) for query in queries],
+                                    return_exceptions=return_exceptions)
+
+    async def as_completed(
+            self,
+            queries: Iterable[_Server]) -> AsyncIterator[Tuple[_Server,
+                                                               pd.DataFrame]]:
+        """Run several queries concurrently, yielding results as they
+        complete.
+
+        Queries still running when the iteration is interrupted are
+        cancelled.
+
+        Args:
+            queries (Iterable[_Server]): Search or Fetch queries
+
+        Returns:
+            AsyncIterator[Tuple[_Server, pd.DataFrame]]: each query
+                along with its result
+        """
+        async def _pair(query: _Server) -> Tuple[_Server, pd.DataFrame]:
+            return query, await self._run(query)
+
+        tasks = [asyncio.ensure_future(_pair(query)) for query in queries]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_many(self,
+                         field: str,
+                         terms: List[Union[str, int]]) -> pd.DataFrame:
+        """Launch a bulk fetch from HGNC, as ``afetch_many()`` would.
+
+        Args:
+            field (str): HGNC field to query
+            terms (List[Union[str,int]]): query terms
+
+        Returns:
+            pd.DataFrame
+        """
+        frames = await self.gather([self.fetch_query(field, term)
+                                    for term in terms])
+        return _concat_terms(terms, frames)
+
+    async def aclose(self) -> None:
+        """Close the pooled client, if owned by this instance."""
+        if self._owned:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncHGNCClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return "HGNC AsyncHGNCClient"
@@ -1,15 +1,37 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+from __future__ import annotations
+import os
 import asyncio
-import pandas as pd
-from typing import Union
-from .classes import Info, Search, Fetch
+from typing import Union, Optional, List, Dict, Any, Iterator, \
+    AsyncIterator, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from .classes import Info, Search, Fetch, _Server
+from .client import Client, get_default_client
+from .schema import Schema
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    from .snapshot import Snapshot
 
-def info() -> Info:
+
+def info(client: Optional[Client] = None,
+         ttl: float = 3600.0,
+         path: Optional[str] = None) -> Info:
     """Retrieve basic information from HGNC.
 
+    The info response is fetched on first use and cached process-wide 
+    for ``ttl`` seconds, so repeated calls are effectively free.
+
+    Args:
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        ttl (float): number of seconds the info response is considered 
+            fresh (default: 3600)
+        path (Optional[str]): json file used to persist the info response 
+            across processes (default: None)
+
     Returns:
         Info
 
@@ -20,11 +42,39 @@ def info() -> Info:
         >>> i.lastModified      # date of last HGNC database modification
         >>> i.numDoc            # number of entries in HGNC database
     """
-    i = Info()
+    i = Info(client=client, ttl=ttl, path=path)
     return i
 
 
-def search(*args, **kwargs) -> pd.DataFrame:
+async def ainfo(client: Optional[Client] = None,
+                ttl: float = 3600.0,
+                path: Optional[str] = None) -> Info:
+    """Retrieve basic information from HGNC asynchronously.
+
+    Args:
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        ttl (float): number of seconds the info response is considered 
+            fresh (default: 3600)
+        path (Optional[str]): json file used to persist the info response 
+            across processes (default: None)
+
+    Returns:
+        Info
+
+    Examples:
+        >>> i = await apyhgnc.ainfo()
+        >>> i.lastModified      # date of last HGNC database modification
+    """
+    i = Info(client=client, ttl=ttl, path=path)
+    return await i.aload()
+
+
+def search(*args,
+           client: Optional[Client] = None,
+           typed: Union[bool, Schema] = False,
+           fields: Optional[List[str]] = None,
+           **kwargs) -> pd.DataFrame:
     """Launch a synchronous search on HGNC.
 
     Args:
@@ -32,6 +82,12 @@ def search(*args, **kwargs) -> pd.DataFrame:
             or a specific field and term to restrich the search
         **kwargs: one or more keywork arguments with a field and a
             string or list of strings representing the search term(s)
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
 
     Returns:
         pd.DataFrame
@@ -43,11 +99,15 @@ def search(*args, **kwargs) -> pd.DataFrame:
         >>> apyhgnc.search(symbol=["BRAF", "ZNF"])  # search with OR
         >>> apyhgnc.search(symbol="BRAF", status="Approved")  # search multiple keywords
     """
-    s = Search(*args, **kwargs)
+    s = Search(*args, client=client, typed=typed, fields=fields, **kwargs)
     return s.query()
 
 
-async def asearch(*args, **kwargs) -> pd.DataFrame:
+async def asearch(*args,
+                  client: Optional[Client] = None,
+                  typed: Union[bool, Schema] = False,
+                  fields: Optional[List[str]] = None,
+                  **kwargs) -> pd.DataFrame:
     """Launch an asynchronous search on HGNC.
 
     Args:
@@ -55,6 +115,12 @@ async def asearch(*args, **kwargs) -> pd.DataFrame:
             or a specific field and term to restrich the search
         **kwargs: one or more keywork arguments with a field and a
             string or list of strings representing the search term(s)
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
 
     Returns: 
         pd.DataFrame
@@ -64,16 +130,107 @@ async def asearch(*args, **kwargs) -> pd.DataFrame:
         >>> loop = asyncio.get_event_loop()
         >>> loop.run_until_complete(apyhgnc.asearch("symbol", "BRAF"))
     """
-    s = Search(*args, **kwargs)
+    s = Search(*args, client=client, typed=typed, fields=fields, **kwargs)
     return await s.aquery()
 
 
-def fetch(field: str, term: Union[str, int]) -> pd.DataFrame:
+def iter_search(*args,
+                rows: int = 1000,
+                records: bool = False,
+                client: Optional[Client] = None,
+                typed: Union[bool, Schema] = False,
+                fields: Optional[List[str]] = None,
+                host: Optional[str] = None,
+                **kwargs
+                ) -> Iterator[Union[pd.DataFrame, List[Dict[str, Any]]]]:
+    """Launch a synchronous search on HGNC, yielding one page at a time.
+
+    Args:
+        *args: either a single term to search all available fields,
+            or a specific field and term to restrich the search
+        rows (int): number of results per page (default: 1000)
+        records (bool): yield lists of entries instead of dataframes 
+            (default: False)
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
+        host (Optional[str]): base URL of the HGNC REST service 
+            (default: http://rest.genenames.org/)
+        **kwargs: one or more keywork arguments with a field and a
+            string or list of strings representing the search term(s)
+
+    Returns:
+        Iterator[Union[pd.DataFrame, List[Dict[str, Any]]]]
+
+    Example:
+        >>> for page in apyhgnc.iter_search(status="Approved", rows=5000):
+        ...     process(page)
+    """
+    s = Search(*args, client=client, typed=typed, fields=fields,
+               host=host, **kwargs)
+    return s.iter_query(rows, records)
+
+
+def aiter_search(*args,
+                 rows: int = 1000,
+                 records: bool = False,
+                 client: Optional[Client] = None,
+                 typed: Union[bool, Schema] = False,
+                 fields: Optional[List[str]] = None,
+                 host: Optional[str] = None,
+                 **kwargs
+                 ) -> AsyncIterator[Union[pd.DataFrame,
+                                          List[Dict[str, Any]]]]:
+    """Launch an asynchronous search on HGNC, yielding one page at a time.
+
+    Args:
+        *args: either a single term to search all available fields,
+            or a specific field and term to restrich the search
+        rows (int): number of results per page (default: 1000)
+        records (bool): yield lists of entries instead of dataframes 
+            (default: False)
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
+        host (Optional[str]): base URL of the HGNC REST service 
+            (default: http://rest.genenames.org/)
+        **kwargs: one or more keywork arguments with a field and a
+            string or list of strings representing the search term(s)
+
+    Returns:
+        AsyncIterator[Union[pd.DataFrame, List[Dict[str, Any]]]]
+
+    Example:
+        >>> async for page in apyhgnc.aiter_search(status="Approved"):
+        ...     process(page)
+    """
+    s = Search(*args, client=client, typed=typed, fields=fields,
+               host=host, **kwargs)
+    return s.aiter_query(rows, records)
+
+
+def fetch(field: str,
+          term: Union[str, int],
+          client: Optional[Client] = None,
+          typed: Union[bool, Schema] = False,
+          fields: Optional[List[str]] = None) -> pd.DataFrame:
     """Launch a synchronous fetch from HGNC.
 
     Args: 
         field (str): HGNC field to query
         term (Union[str,int]): query term
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
 
     Returns:
         pd.DataFrame
@@ -81,16 +238,26 @@ def fetch(field: str, term: Union[str, int]) -> pd.DataFrame:
     Example:
         >>> apyhgnc.fetch("symbol", "ZNF3")
     """
-    f = Fetch(field, term)
+    f = Fetch(field, term, client=client, typed=typed, fields=fields)
     return f.query()
 
 
-async def afetch(field: str, term: Union[str, int]) -> pd.DataFrame:
+async def afetch(field: str,
+                 term: Union[str, int],
+                 client: Optional[Client] = None,
+                 typed: Union[bool, Schema] = False,
+                 fields: Optional[List[str]] = None) -> pd.DataFrame:
     """Launch an asynchronous fetch from HGNC.
 
     Args:
         field (str): HGNC field to query
         term (Union[str,int]): query term
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
 
     Returns: 
         pd.DataFrame
@@ -100,5 +267,361 @@ async def afetch(field: str, term: Union[str, int]) -> pd.DataFrame:
         >>> loop = asyncio.get_event_loop()
         >>> loop.run_until_complete(apyhgnc.afetch("symbol", "ZNF3"))
     """
-    f = Fetch(field, term)
+    f = Fetch(field, term, client=client, typed=typed, fields=fields)
     return await f.aquery()
+
+
+_SNAPSHOT = None
+
+
+def snapshot(path: Optional[str] = None,
+             client: Optional[Client] = None,
+             update: bool = False) -> Snapshot:
+    """Load a local snapshot of HGNC, downloading it only if needed.
+
+    If ``path`` exists, the snapshot is loaded from it (either a file 
+    stored with ``Snapshot.save()`` or a copy of the HGNC complete set in 
+    json format); otherwise the complete set is downloaded and, if a path 
+    was given, stored there for later runs. Without a path, the snapshot 
+    is downloaded once and kept for the lifetime of the process. With 
+    ``update``, an existing snapshot is brought up to date incrementally 
+    (see ``Snapshot.update()``) and stored again if HGNC was modified; 
+    this requires a snapshot stored with ``Snapshot.save()``, as a copy 
+    of the complete set cannot be stored back.
+
+    Args:
+        path (Optional[str]): path of the stored snapshot
+        client (Optional[Client]): pooled client used to download the 
+            snapshot (default: the shared default client)
+        update (bool): patch the entries changed since the snapshot was 
+            taken (default: False)
+
+    Returns:
+        Snapshot
+
+    Raises:
+        ValueError: if ``update`` is requested for a copy of the complete 
+            set in json format
+
+    Example:
+        >>> snap = apyhgnc.snapshot("hgnc.pkl.gz")
+        >>> snap.fetch("symbol", "ZNF3")
+        >>> snap = apyhgnc.snapshot("hgnc.arrow", update=True)  # nightly
+    """
+    global _SNAPSHOT
+    from .snapshot import Snapshot
+    if path is None:
+        if _SNAPSHOT is None:
+            _SNAPSHOT = Snapshot.download(client=client)
+        elif update:
+            _SNAPSHOT.update(client)
+        return _SNAPSHOT
+    complete_set = path.endswith((".json", ".json.gz"))
+    if update and complete_set:
+        raise ValueError("only snapshots stored with Snapshot.save() can "
+                         "be updated, not {}".format(path))
+    if os.path.exists(path):
+        snap = Snapshot.from_json(path) if complete_set \
+            else Snapshot.load(path)
+        if update:
+            last_modified = snap.last_modified
+            snap.update(client)
+            if snap.last_modified != last_modified:
+                snap.save(path)
+        return snap
+    snap = Snapshot.download(client=client)
+    snap.save(path)
+    return snap
+
+
+def resolve_symbols(terms: List[str],
+                    snap: Optional[Snapshot] = None) -> pd.DataFrame:
+    """Map gene symbols, possibly outdated, to approved ones.
+
+    Terms are resolved against the approved, previous and alias symbols 
+    of a local snapshot, reporting ambiguous and withdrawn matches; see 
+    ``Snapshot.resolve_symbols()`` for details.
+
+    Args:
+        terms (List[str]): gene symbols to resolve
+        snap (Optional[Snapshot]): snapshot used to resolve the symbols 
+            (default: the process-wide snapshot returned by 
+            ``snapshot()``)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> apyhgnc.resolve_symbols(["BRAF", "ERBB", "her1", "NOTAGENE"])
+    """
+    snap = snap or snapshot()
+    return snap.resolve_symbols(terms)
+
+
+def id_map(from_field: str,
+           to_field: str,
+           ids: List[Union[str, int]],
+           snap: Optional[Snapshot] = None) -> pd.DataFrame:
+    """Map identifiers of an HGNC field to the ones of another field.
+
+    Identifiers are translated using lookup tables built once from a 
+    local snapshot, instead of one request per identifier; see 
+    ``Snapshot.id_map()`` for details.
+
+    Args:
+        from_field (str): HGNC field of the input identifiers
+        to_field (str): HGNC field of the output identifiers
+        ids (List[Union[str,int]]): identifiers to map
+        snap (Optional[Snapshot]): snapshot used to map the identifiers 
+            (default: the process-wide snapshot returned by 
+            ``snapshot()``)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> apyhgnc.id_map("ensembl_gene_id", "entrez_id", ensembl_ids)
+    """
+    snap = snap or snapshot()
+    return snap.id_map(from_field, to_field, ids)
+
+
+def suggest(term: str,
+            max_distance: int = 2,
+            limit: Optional[int] = 5,
+            snap: Optional[Snapshot] = None) -> pd.DataFrame:
+    """Suggest gene symbols close to a possibly misspelled term.
+
+    Approved, previous and alias symbols within ``max_distance`` edits 
+    are found through an edit-distance index of a local snapshot; see 
+    ``Snapshot.suggest()`` for details.
+
+    Args:
+        term (str): possibly misspelled gene symbol
+        max_distance (int): maximum edit distance (default: 2)
+        limit (Optional[int]): maximum number of suggestions (default: 5)
+        snap (Optional[Snapshot]): snapshot used to suggest the symbols 
+            (default: the process-wide snapshot returned by 
+            ``snapshot()``)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> apyhgnc.suggest("BRAFF")
+    """
+    snap = snap or snapshot()
+    return snap.suggest(term, max_distance, limit)
+
+
+def suggest_many(terms: List[str],
+                 max_distance: int = 2,
+                 limit: Optional[int] = 5,
+                 snap: Optional[Snapshot] = None) -> pd.DataFrame:
+    """Suggest gene symbols for a whole list of terms.
+
+    See ``Snapshot.suggest_many()`` for details.
+
+    Args:
+        terms (List[str]): possibly misspelled gene symbols
+        max_distance (int): maximum edit distance (default: 2)
+        limit (Optional[int]): maximum number of suggestions per term 
+            (default: 5)
+        snap (Optional[Snapshot]): snapshot used to suggest the symbols 
+            (default: the process-wide snapshot returned by 
+            ``snapshot()``)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> apyhgnc.suggest_many(df["gene"])
+    """
+    snap = snap or snapshot()
+    return snap.suggest_many(terms, max_distance, limit)
+
+
+def _concat_terms(terms: List[Union[str, int]],
+                  frames: List[Union[pd.DataFrame, Exception]]
+                  ) -> pd.DataFrame:
+    """Concatenate per-term results, flagging terms without a match.
+
+    Args:
+        terms (List[Union[str,int]]): query terms, in input order
+        frames (List[Union[pd.DataFrame, Exception]]): results (or 
+            errors) for each term
+
+    Returns:
+        pd.DataFrame
+    """
+    import pandas as pd
+    parts = []
+    for term, df in zip(terms, frames):
+        if isinstance(df, BaseException):
+            df = pd.DataFrame({"query_term": [term],
+                               "query_status": ["error"],
+                               "query_error": [repr(df)]})
+        elif df.empty:
+            df = pd.DataFrame({"query_term": [term],
+                               "query_status": ["not found"]})
+        else:
+            df = df.assign(query_term=term, query_status="found")
+        parts.append(df)
+    if not parts:
+        return pd.DataFrame(columns=["query_term", "query_status"])
+    df = pd.concat(parts, ignore_index=True, sort=False)
+    cols = [c for c in ["query_term", "query_status", "query_error"]
+            if c in df.columns]
+    return df[cols + [c for c in df.columns if c not in cols]]
+
+
+def query_many(queries: List[_Server],
+               workers: int = 10,
+               return_exceptions: bool = False
+               ) -> List[Union[pd.DataFrame, Exception]]:
+    """Run several synchronous queries in a pool of threads.
+
+    All the queries share the pooled session of their client, so that 
+    sync callers get concurrent requests without running an event loop. 
+    Results are returned in input order.
+
+    Args:
+        queries (List[_Server]): Search or Fetch queries
+        workers (int): number of worker threads (default: 10)
+        return_exceptions (bool): return the exception raised by a failed 
+            query in its place instead of raising it (default: False)
+
+    Returns:
+        List[Union[pd.DataFrame, Exception]]
+
+    Example:
+        >>> apyhgnc.query_many([Search(symbol="BRAF"), Fetch("symbol", "ZNF3")])
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(query.query) for query in queries]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    for other in futures:
+                        other.cancel()
+                    raise
+                results.append(e)
+    return results
+
+
+class _Deferred:
+    """Query built only when it is performed."""
+
+    def __init__(self, cls: type, *args, **kwargs) -> None:
+        self._cls = cls
+        self._args = args
+        self._kwargs = kwargs
+
+    def query(self) -> pd.DataFrame:
+        return self._cls(*self._args, **self._kwargs).query()
+
+
+def fetch_many(field: str,
+               terms: List[Union[str, int]],
+               concurrency: int = 10,
+               client: Optional[Client] = None,
+               typed: Union[bool, Schema] = False,
+               fields: Optional[List[str]] = None,
+               return_exceptions: bool = False,
+               host: Optional[str] = None) -> pd.DataFrame:
+    """Launch a synchronous bulk fetch from HGNC.
+
+    Requests are issued by ``concurrency`` worker threads sharing the 
+    pooled session of the client, so no event loop is needed (and the 
+    function can be called from Jupyter); see ``afetch_many()`` for 
+    details on the returned dataframe.
+
+    Args:
+        field (str): HGNC field to query
+        terms (List[Union[str,int]]): query terms
+        concurrency (int): number of worker threads (default: 10)
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
+        return_exceptions (bool): flag terms whose request failed with an 
+            "error" status instead of raising (default: False)
+        host (Optional[str]): base URL of the HGNC REST service 
+            (default: http://rest.genenames.org/)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> apyhgnc.fetch_many("symbol", ["ZNF3", "BRAF", "NOTAGENE"])
+    """
+    client = client or get_default_client()
+    # queries are built by the workers, so that an invalid term only
+    # fails its own request
+    queries = [_Deferred(Fetch, field, term, client=client, typed=typed,
+                         fields=fields, host=host)
+               for term in terms]
+    frames = query_many(queries, concurrency, return_exceptions)
+    return _concat_terms(terms, frames)
+
+
+async def afetch_many(field: str,
+                      terms: List[Union[str, int]],
+                      concurrency: int = 10,
+                      client: Optional[Client] = None,
+                      typed: Union[bool, Schema] = False,
+                      fields: Optional[List[str]] = None,
+                      return_exceptions: bool = False,
+                      host: Optional[str] = None) -> pd.DataFrame:
+    """Launch an asynchronous bulk fetch from HGNC.
+
+    At most ``concurrency`` requests are in flight at any time, all 
+    sharing the same pooled session. Results are concatenated in input 
+    order, with a ``query_term`` column holding the term that produced 
+    each row and a ``query_status`` column set to "found", or to 
+    "not found" for terms without a match (which get a single row). With 
+    ``return_exceptions``, terms whose request failed get a single row 
+    with an "error" status and the error in a ``query_error`` column.
+
+    Args:
+        field (str): HGNC field to query
+        terms (List[Union[str,int]]): query terms
+        concurrency (int): maximum number of requests in flight 
+            (default: 10)
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
+        return_exceptions (bool): flag terms whose request failed with an 
+            "error" status instead of raising (default: False)
+        host (Optional[str]): base URL of the HGNC REST service 
+            (default: http://rest.genenames.org/)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> import asyncio
+        >>> loop = asyncio.get_event_loop()
+        >>> loop.run_until_complete(
+        ...     apyhgnc.afetch_many("symbol", ["ZNF3", "BRAF"], concurrency=5)
+        ... )
+    """
+    client = client or get_default_client()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(term: Union[str, int]) -> pd.DataFrame:
+        async with semaphore:
+            return await Fetch(field, term, client=client, typed=typed,
+                               fields=fields, host=host).aquery()
+
+    frames = await asyncio.gather(*[_fetch(term) for term in terms],
+                                  return_exceptions=return_exceptions)
+    return _concat_terms(terms, frames)
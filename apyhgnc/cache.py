@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+_DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "apyhgnc",
+                             "responses.sqlite")
+
+
+class DiskCache:
+    """Persistent cache of HGNC responses, keyed by request URL.
+
+    Responses are stored zlib-compressed in a SQLite database, so they
+    survive across processes and reruns. Entries older than ``ttl``
+    seconds are ignored, and the least recently used entries are evicted
+    once the stored payloads exceed ``max_size`` bytes. The whole cache is
+    dropped when HGNC's ``lastModified`` date changes; the client checks
+    it at most once every ``check_interval`` seconds.
+
+    Expired entries stored along with an ETag or Last-Modified header are
+    kept, so that the client can revalidate them with a conditional
+    request instead of downloading them again.
+
+    The number of cache hits and misses is available from the ``hits``
+    and ``misses`` attributes.
+
+    Args:
+        path (str): path of the SQLite database
+            (default: ~/.cache/apyhgnc/responses.sqlite)
+        ttl (Optional[float]): seconds an entry stays valid; None means
+            entries never expire (default: None)
+        max_size (int): maximum size in bytes of the stored payloads
+            (default: 256 MiB)
+        check_interval (float): seconds between two checks of HGNC's
+            lastModified date (default: 3600)
+
+    Examples:
+        >>> cache = DiskCache("hgnc.sqlite", ttl=7 * 24 * 3600)
+        >>> with Client(cache=cache) as client:
+        ...     Fetch("symbol", "ZNF3", client=client).query()
+    """
+
+    def __init__(self,
+                 path: str = _DEFAULT_PATH,
+                 ttl: Optional[float] = None,
+                 max_size: int = 256 * 1024 ** 2,
+                 check_interval: float = 3600.0) -> None:
+        self._path = path
+        self._ttl = ttl
+        self._max_size = max_size
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                               "(url TEXT PRIMARY KEY, value BLOB, "
+                               "stored REAL, accessed REAL, size INTEGER, "
+                               "validators TEXT)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta "
+                               "(key TEXT PRIMARY KEY, value TEXT)")
+            columns = [row[1] for row in self._conn.execute(
+                "PRAGMA table_info(responses)")]
+            if "validators" not in columns:
+                self._conn.execute("ALTER TABLE responses "
+                                   "ADD COLUMN validators TEXT")
+        # running total of the stored sizes, to avoid summing them up on 
+        # every set
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) "
+                                        "FROM responses").fetchone()[0]
+
+    @property
+    def path(self) -> str:
+        """Return the path of the SQLite database.
+
+        Returns:
+            str
+        """
+        return self._path
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?",
+                                 (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                           (key, value))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for the given URL, if any.
+
+        Args:
+            key (str): request URL
+
+        Returns:
+            Optional[Dict[str, Any]]
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored FROM responses "
+                                     "WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, stored = row
+            if self._ttl is not None and time.time() - stored > self._ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute("UPDATE responses SET accessed = ? "
+                                   "WHERE url = ?", (time.time(), key))
+        return json.loads(zlib.decompress(value).decode("utf-8"))
+
+    def set(self,
+            key: str,
+            value: Dict[str, Any],
+            validators: Optional[Dict[str, str]] = None) -> None:
+        """Store the response for the given URL.
+
+        Args:
+            key (str): request URL
+            value (Dict[str, Any]): json response to store
+            validators (Optional[Dict[str, str]]): ETag and/or 
+                Last-Modified headers of the response (default: None)
+        """
+        blob = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT size FROM responses "
+                                     "WHERE url = ?", (key,)).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO responses "
+                               "(url, value, stored, accessed, size, "
+                               "validators) VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, blob, now, now, len(blob),
+                                json.dumps(validators or {})))
+            self._size += len(blob) - (row[0] if row else 0)
+            self._evict()
+
+    def stale(self,
+              key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """Return an expired response that can be revalidated, if any.
+
+        Args:
+            key (str): request URL
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], Dict[str, str]]]: the response 
+                and its ETag and/or Last-Modified headers
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value, validators "
+                                     "FROM responses WHERE url = ?",
+                                     (key,)).fetchone()
+        if row is None or not row[1]:
+            return None
+        validators = json.loads(row[1])
+        if not validators:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8")), \
+            validators
+
+    def touch(self, key: str) -> None:
+        """Mark a revalidated response as fresh.
+
+        Args:
+            key (str): request URL
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET stored = ?, "
+                               "accessed = ? WHERE url = ?", (now, now, key))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_size."""
+        if self._size <= self._max_size:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses "
+                                  "ORDER BY accessed").fetchall()
+        for url, size in rows:
+            if self._size <= self._max_size:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._size -= size
+
+    def clear(self) -> None:
+        """Remove all the cached responses."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def needs_check(self) -> bool:
+        """Return True if HGNC's lastModified date should be checked.
+
+        Returns:
+            bool
+        """
+        with self._lock:
+            checked = self._get_meta("checked")
+        return checked is None or \
+            time.time() - float(checked) > self._check_interval
+
+    def invalidate(self, last_modified: str) -> bool:
+        """Drop all cached responses if HGNC has been modified since they
+        were stored.
+
+        Args:
+            last_modified (str): current lastModified date from HGNC
+
+        Returns:
+            bool: True if the cache was cleared
+        """
+        with self._lock, self._conn:
+            previous = self._get_meta("lastModified")
+            changed = previous is not None and previous != last_modified
+            if changed:
+                self._conn.execute("DELETE FROM responses")
+                self._size = 0
+            self._set_meta("lastModified", last_modified)
+            self._set_meta("checked", str(time.time()))
+        return changed
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) "
+                                      "FROM responses").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return "HGNC DiskCache"
+
+
+class MemoryCache:
+    """In-process LRU cache of HGNC responses, keyed by request URL.
+
+    Meant for long-running processes that query the same entries over
+    and over. At most ``maxsize`` responses are kept, the least recently
+    used being dropped first, and each entry expires ``ttl`` seconds after
+    being stored. Like ``DiskCache``, the cache is dropped when HGNC's
+    ``lastModified`` date changes; expired entries with an ETag or 
+    Last-Modified header are kept for revalidation. The number of cache 
+    hits and misses is available from the ``hits`` and ``misses`` 
+    attributes.
+
+    Args:
+        maxsize (int): maximum number of responses to keep
+            (default: 1024)
+        ttl (Optional[float]): seconds an entry stays valid; None means
+            entries never expire (default: 3600)
+        check_interval (float): seconds between two checks of HGNC's
+            lastModified date (default: 3600)
+
+    Examples:
+        >>> client = Client(cache=MemoryCache(maxsize=10000))
+        >>> fetch("symbol", "TP53", client=client)  # network
+        >>> fetch("symbol", "TP53", client=client)  # memory
+        >>> client.cache.hits, client.cache.misses
+        (1, 1)
+    """
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 ttl: Optional[float] = 3600.0,
+                 check_interval: float = 3600.0) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._check_interval = check_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_modified = None
+        self._checked = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for the given URL, if any.
+
+        Args:
+            key (str): request URL
+
+        Returns:
+            Optional[Dict[str, Any]]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored, validators = entry
+            if self._ttl is not None and time.time() - stored > self._ttl:
+                if not validators:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self,
+            key: str,
+            value: Dict[str, Any],
+            validators: Optional[Dict[str, str]] = None) -> None:
+        """Store the response for the given URL.
+
+        Args:
+            key (str): request URL
+            value (Dict[str, Any]): json response to store
+            validators (Optional[Dict[str, str]]): ETag and/or 
+                Last-Modified headers of the response (default: None)
+        """
+        with self._lock:
+            self._entries[key] = (value, time.time(), validators or {})
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def stale(self,
+              key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """Return an expired response that can be revalidated, if any.
+
+        Args:
+            key (str): request URL
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], Dict[str, str]]]: the response 
+                and its ETag and/or Last-Modified headers
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or not entry[2]:
+            return None
+        return entry[0], entry[2]
+
+    def touch(self, key: str) -> None:
+        """Mark a revalidated response as fresh.
+
+        Args:
+            key (str): request URL
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], time.time(), entry[2])
+                self._entries.move_to_end(key)
+
+    def clear(self) -> None:
+        """Remove all the cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def needs_check(self) -> bool:
+        """Return True if HGNC's lastModified date should be checked.
+
+        Returns:
+            bool
+        """
+        return self._checked is None or \
+            time.time() - self._checked > self._check_interval
+
+    def invalidate(self, last_modified: str) -> bool:
+        """Drop all cached responses if HGNC has been modified since they
+        were stored.
+
+        Args:
+            last_modified (str): current lastModified date from HGNC
+
+        Returns:
+            bool: True if the cache was cleared
+        """
+        with self._lock:
+            changed = self._last_modified is not None and \
+                self._last_modified != last_modified
+            if changed:
+                self._entries.clear()
+            self._last_modified = last_modified
+            self._checked = time.time()
+        return changed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return "HGNC MemoryCache"
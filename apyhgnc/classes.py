@@ -1,12 +1,61 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+from __future__ import annotations
+import os
+import json
+import math
+import time
 import asyncio
-import aiohttp
-import requests
-import urllib.parse
-import pandas as pd
-from typing import Dict, Any, Union, List
+import tempfile
+from typing import Dict, Any, Callable, Union, List, Optional, Iterator, \
+    AsyncIterator, TYPE_CHECKING
+from .client import Client, get_default_client
+from .fields import SEARCHABLE_FIELDS, STORED_FIELDS
+from .query import check_field, check_fields, quote, build_terms
+from .schema import Schema
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+
+def _project(docs: List[Dict[str, Any]],
+             fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Drop the fields not requested from the given entries.
+
+    Args:
+        docs (List[Dict[str, Any]]): HGNC entries
+        fields (Optional[List[str]]): fields to keep (default: all)
+
+    Returns:
+        List[Dict[str, Any]]
+    """
+    if fields is None:
+        return docs
+    return [{field: doc[field] for field in fields if field in doc}
+            for doc in docs]
+
+
+def _frame_from_docs(docs: List[Dict[str, Any]],
+                     schema: Optional[Schema],
+                     fields: Optional[List[str]]) -> pd.DataFrame:
+    """Build a DataFrame from the given entries.
+
+    Args:
+        docs (List[Dict[str, Any]]): HGNC entries
+        schema (Optional[Schema]): typed schema used for the conversion
+        fields (Optional[List[str]]): fields to keep (default: all)
+
+    Returns:
+        pd.DataFrame
+    """
+    import pandas as pd
+    if schema is not None:
+        return schema.to_frame(docs, fields)
+    if fields is not None:
+        return pd.DataFrame.from_records(_project(docs, fields),
+                                         columns=fields)
+    return pd.DataFrame.from_records(docs)
 
 
 class _Server:
@@ -15,6 +64,13 @@ class _Server:
     Arguments:
             host (str): url for the desired HGNC REST service 
                 (default: http://rest.genenames.org)
+            client (Optional[Client]): pooled client used to perform 
+                the calls (default: the shared default client)
+            typed (Union[bool, Schema]): convert results using a typed 
+                schema (True for the default one) instead of letting 
+                pandas infer dtypes (default: False)
+            fields (Optional[List[str]]): only keep these fields of each 
+                entry, in this order (default: all the returned fields)
     
     Attributes: 
             url (str): return the URL used to retrieve results 
@@ -22,8 +78,29 @@ class _Server:
     _BASE_URL = "http://rest.genenames.org/"
 
     def __init__(self,
-                 host: str = _BASE_URL):
+                 host: str = _BASE_URL,
+                 client: Optional[Client] = None,
+                 typed: Union[bool, Schema] = False,
+                 fields: Optional[List[str]] = None):
         self._url = host
+        self._client = client
+        if typed is True:
+            typed = Schema()
+        self._schema = typed or None
+        self._fields = None
+        if fields is not None:
+            self._fields = check_fields(fields, _stored_fields())
+
+    @property
+    def client(self) -> Client:
+        """Return the pooled client used to perform the calls.
+
+        Returns:
+            Client
+        """
+        if self._client is None:
+            return get_default_client()
+        return self._client
 
     def _get_sync(self) -> Dict[str, Any]: 
         """Synchronous call to HGNC. 
@@ -34,16 +111,21 @@ class _Server:
         Returns:
             Dict[str, Any] 
         """
-        resp = requests.get(self._url,
-                            headers={"Accept": "application/json"})
-        return resp.json()
+        return self.client.get(self._url)
 
-    async def _get_async(self):
-        """Asynchronous call to HGNC."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self._url,
-                                   headers={"Accept": "application/json"}) as resp:
-                return await resp.json()
+    async def _get_async(self,
+                         convert: Optional[Callable[[Dict[str, Any]],
+                                                    Any]] = None) -> Any:
+        """Asynchronous call to HGNC.
+
+        Args:
+            convert (Optional[Callable[[Dict[str, Any]], Any]]): function 
+                converting the json response (default: None)
+
+        Returns:
+            Any: json dictionary, or its conversion
+        """
+        return await self.client.aget(self._url, convert=convert)
 
     @property
     def url(self) -> str:
@@ -54,9 +136,22 @@ class _Server:
         """
         return self._url
 
-    @staticmethod
-    def _to_frame(response: Dict[str, Any]) -> pd.DataFrame:
+    def _project(self,
+                 docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop the fields not requested from the given entries.
+
+        Args:
+            docs (List[Dict[str, Any]]): HGNC entries
+
+        Returns:
+            List[Dict[str, Any]]
+        """
+        return _project(docs, self._fields)
+
+    def _to_frame(self, response: Dict[str, Any]) -> pd.DataFrame:
         """Convert the given sync or async response to a DataFrame.
+
+        The time spent is recorded in the client stats, if enabled.
         
         Args:
             response (Dict[str, Any]): input response to convert
@@ -64,7 +159,57 @@ class _Server:
         Returns:
             pd.DataFrame
         """
-        return pd.DataFrame.from_records(response.get("docs"))
+        stats = self.client.stats
+        if stats is None:
+            return self._build_frame(response)
+        start = time.perf_counter()
+        df = self._build_frame(response)
+        stats.record_frame(len(df), time.perf_counter() - start)
+        return df
+
+    def _response_frame(self, resp: Dict[str, Any]) -> pd.DataFrame:
+        """Convert a whole json response to a DataFrame.
+
+        Args:
+            resp (Dict[str, Any]): json response
+
+        Returns:
+            pd.DataFrame
+        """
+        return self._to_frame(resp.get("response",
+                                       {"numFound": 0, "docs": []}))
+
+    def _build_frame(self, response: Dict[str, Any]) -> pd.DataFrame:
+        """Build a DataFrame from the docs of the given response.
+
+        Args:
+            response (Dict[str, Any]): input response to convert
+
+        Returns:
+            pd.DataFrame
+        """
+        return _frame_from_docs(response.get("docs"), self._schema,
+                                self._fields)
+
+    async def _ato_frame(self, response: Dict[str, Any]) -> pd.DataFrame:
+        """Convert the given async response to a DataFrame.
+
+        Large responses are converted in the client executor, if any, 
+        instead of on the event loop.
+
+        Args:
+            response (Dict[str, Any]): input response to convert
+
+        Returns:
+            pd.DataFrame
+        """
+        client = self.client
+        docs = response.get("docs") or []
+        if client.executor is None or len(docs) < client.offload_rows:
+            return self._to_frame(response)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(client.executor, self._to_frame,
+                                          response)
 
     def query(self) -> pd.DataFrame:
         """Perform a synchronous query on HGNC.
@@ -72,26 +217,54 @@ class _Server:
         Returns:
             pd.DataFrame 
         """
-        resp = self._get_sync()
-        response = resp.get("response", {"numFound": 0, "docs": []})
-
-        return self._to_frame(response)
+        return self._response_frame(self._get_sync())
 
     async def aquery(self) -> pd.DataFrame:
         """Perform an asynchronous query on HGNC. 
+
+        Large responses are decoded and converted in the client executor, 
+        if any, in a single call.
         
         Returns:
             pd.DataFrame
         """
-        resp = await self._get_async()
-        response = resp.get("response", {"numFound": 0, "docs": []})
+        return await self._get_async(convert=self._response_frame)
 
-        return self._to_frame(response)
+
+def _base_url(host: Optional[str] = None) -> str:
+    """Return the base URL of the HGNC REST service to query.
+
+    Args:
+        host (Optional[str]): base URL of the service (default: 
+            http://rest.genenames.org/)
+
+    Returns:
+        str
+    """
+    host = host or _Server._BASE_URL
+    return host if host.endswith("/") else host + "/"
 
 
 class Info:
     """Class used to retrieve information from HGNC.
 
+    The info response is requested lazily, on first access to any of its 
+    attributes, and cached process-wide for ``ttl`` seconds: every Info 
+    instance pointing to the same server shares it, so repeated field 
+    validation or lastModified checks do not hit the network. If a 
+    ``path`` is given, the response is also stored there and reused by 
+    later processes while still fresh.
+
+    Args:
+        client (Optional[Client]): pooled client used to perform the 
+            call (default: the shared default client)
+        ttl (float): number of seconds the info response is considered 
+            fresh (default: 3600)
+        path (Optional[str]): json file used to persist the info response 
+            across processes (default: None)
+        host (Optional[str]): base URL of the HGNC REST service, e.g. a 
+            local ``MockHGNCServer`` (default: http://rest.genenames.org/)
+
     Attributes: 
         url (str): return the URL used to retrieve results
         response (Dict[str, Any]): return the raw response produced by 
@@ -111,15 +284,29 @@ class Info:
         >>> i.storedFields      # list of stored fields
         >>> i.lastModified      # date of last HGNC database modification
         >>> i.numDoc            # number of entries in HGNC database
+        >>> i = await Info().aload()    # load without blocking the loop
     """
+    _CACHE = {}
 
-    def __init__(self) -> None:
-        self._url = "http://rest.genenames.org/info"
+    def __init__(self,
+                 client: Optional[Client] = None,
+                 ttl: float = 3600.0,
+                 path: Optional[str] = None,
+                 host: Optional[str] = None) -> None:
+        self._url = _base_url(host) + "info"
+        self._client = client
+        self._ttl = ttl
+        self._path = os.path.expanduser(path) if path else None
         self._searchable = None
         self._stored = None
         self._modified = None
         self._numdoc = None
-        self._response = self._get_sync()
+        self._response = None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the info responses cached in this process."""
+        cls._CACHE.clear()
 
     def _get_sync(self) -> Dict[str, Any]:
         """Synchronous call to HGNC. 
@@ -130,9 +317,109 @@ class Info:
         Returns:
             Dict[str, Any] 
         """
-        resp = requests.get(self._url,
-                            headers={"Accept": "application/json"})
-        return resp.json()
+        client = self._client or get_default_client()
+        return client.get(self._url, use_cache=False)
+
+    async def _get_async(self) -> Dict[str, Any]:
+        """Asynchronous call to HGNC.
+
+        Returns:
+            Dict[str, Any]
+        """
+        client = self._client or get_default_client()
+        return await client.aget(self._url, use_cache=False)
+
+    def _cached(self) -> Optional[Dict[str, Any]]:
+        """Return the cached info response, if still fresh.
+
+        The process-wide cache is looked up first, then the json file 
+        given as ``path`` (if any).
+
+        Returns:
+            Optional[Dict[str, Any]]
+        """
+        entry = Info._CACHE.get(self._url)
+        if entry is None and self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, encoding="utf-8") as f:
+                    data = json.load(f)
+                entry = (data["stored"], data["response"])
+            except (ValueError, KeyError):
+                entry = None
+            else:
+                Info._CACHE[self._url] = entry
+        if entry is not None and time.time() - entry[0] <= self._ttl:
+            return entry[1]
+        return None
+
+    def _store(self, response: Dict[str, Any]) -> None:
+        """Cache the given info response.
+
+        Args:
+            response (Dict[str, Any]): info response
+        """
+        stored = time.time()
+        Info._CACHE[self._url] = (stored, response)
+        if self._path:
+            folder = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(folder, exist_ok=True)
+            # a unique temporary file, so that concurrent processes never
+            # write to the same one
+            with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=folder, delete=False,
+                    prefix=".{}.".format(os.path.basename(self._path)),
+                    suffix=".tmp") as f:
+                json.dump({"stored": stored, "response": response}, f)
+            try:
+                os.replace(f.name, self._path)
+            except OSError:  # pragma: no cover
+                os.remove(f.name)
+                raise
+
+    def _refresh(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Use the given info response, dropping values read from an 
+        older one.
+
+        Args:
+            response (Dict[str, Any]): info response
+
+        Returns:
+            Dict[str, Any]
+        """
+        if response is not self._response:
+            self._searchable = None
+            self._stored = None
+            self._modified = None
+            self._numdoc = None
+            self._response = response
+        return response
+
+    def load(self) -> "Info":
+        """Make sure a fresh info response is available.
+
+        Returns:
+            Info
+        """
+        response = self._cached()
+        if response is None:
+            response = self._get_sync()
+            self._store(response)
+        self._refresh(response)
+        return self
+
+    async def aload(self) -> "Info":
+        """Make sure a fresh info response is available, without blocking 
+        the event loop.
+
+        Returns:
+            Info
+        """
+        response = self._cached()
+        if response is None:
+            response = await self._get_async()
+            self._store(response)
+        self._refresh(response)
+        return self
 
     @property
     def url(self) -> str:
@@ -150,7 +437,7 @@ class Info:
         Returns: 
             Dict[str,Any]
         """
-        return self._response
+        return self.load()._response
 
     @property
     def searchableFields(self) -> List[str]:
@@ -159,8 +446,9 @@ class Info:
         Returns: 
             List[str]
         """
+        response = self.response
         if self._searchable is None:
-            self._searchable = self.response.get("searchableFields", "")
+            self._searchable = response.get("searchableFields", "")
         return self._searchable
 
     @property
@@ -170,8 +458,9 @@ class Info:
         Returns: 
             List[str]
         """
+        response = self.response
         if self._stored is None:
-            self._stored = self.response.get("storedFields", "")
+            self._stored = response.get("storedFields", "")
         return self._stored
 
     @property
@@ -181,8 +470,9 @@ class Info:
         Returns: 
             str
         """
+        response = self.response
         if self._modified is None:
-            self._modified = self.response.get("lastModified", "")
+            self._modified = response.get("lastModified", "")
         return self._modified
 
     @property
@@ -193,22 +483,74 @@ class Info:
         Returns: 
             int
         """
+        response = self.response
         if self._numdoc is None:
-            self._numdoc = self.response.get("numDoc", 0)
+            self._numdoc = response.get("numDoc", 0)
         return self._numdoc
 
     def __repr__(self) -> str:
         return "HGNC Info results"
 
 
+def _info_fields(key: str, default: List[str]) -> List[str]:
+    """Return a list of fields, without any network round-trip.
+
+    Fields come from a cached info response if available, otherwise from 
+    the fields known at release time.
+
+    Args:
+        key (str): info response key holding the fields
+        default (List[str]): fields known at release time
+
+    Returns:
+        List[str]
+    """
+    for _, response in list(Info._CACHE.values()):
+        fields = response.get(key)
+        if fields:
+            return fields
+    return default
+
+
+def _searchable_fields() -> List[str]:
+    """Return the searchable fields, without any network round-trip.
+
+    Returns:
+        List[str]
+    """
+    return _info_fields("searchableFields", SEARCHABLE_FIELDS)
+
+
+def _stored_fields() -> List[str]:
+    """Return the stored fields (plus the search score), without any 
+    network round-trip.
+
+    Returns:
+        List[str]
+    """
+    return _info_fields("storedFields", STORED_FIELDS) + ["score"]
+
+
 class Search(_Server):
     """Class used to look for entries of interest on HGNC.
+
+    Long OR lists given as keyword arguments are transparently split into
+    several requests whose URLs stay below ``_MAX_URL_LENGTH``; their
+    results are merged and deduplicated by hgnc_id.
     
     Args:
         *args: either a single term to search all available fields,
             or a specific field and term to restrich the search
         **kwargs: one or more keywork arguments with a field and a
             string or list of strings representing the search term(s)
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            result (default: all the returned fields)
+        host (Optional[str]): base URL of the HGNC REST service, e.g. a 
+            local ``MockHGNCServer`` (default: http://rest.genenames.org/)
 
     Examples:
         >>> Search("BRAF")              # search all searchable fields
@@ -217,30 +559,254 @@ class Search(_Server):
         >>> Search(symbol=["BRAF", "ZNF"])              # search with OR
         >>> Search(symbol="BRAF", status="Approved")    # search multiple keywords
     """
-
-    def __init__(self, *args, **kwargs): 
-        self._url = self._BASE_URL + "search/"
-        if args:
-            if len(args) == 1:
-                term = urllib.parse.quote_plus(args[0])
-                self._url += term
-            elif len(args) == 2:
-                field = urllib.parse.quote_plus(args[0])
-                term = urllib.parse.quote_plus(args[1])
-                self._url += "{}/{}".format(field, term)
+    _MAX_URL_LENGTH = 2000
+
+    def __init__(self, *args,
+                 client: Optional[Client] = None,
+                 typed: Union[bool, Schema] = False,
+                 fields: Optional[List[str]] = None,
+                 host: Optional[str] = None,
+                 **kwargs): 
+        self._base = _base_url(host)
+        self._url = self._base + "search/"
+        self._chunks = []
+        if args and kwargs:
+            raise ValueError("use either positional or keyword arguments")
+        if len(args) == 1:
+            self._url += quote(args[0])
+        elif len(args) == 2:
+            field = check_field(args[0], _searchable_fields())
+            self._url += "{}/{}".format(field, quote(args[1]))
+        elif args:
+            raise ValueError("too many positional arguments")
         elif kwargs:
-            q = []
-            for key in kwargs:
-                if isinstance(kwargs[key], list):
-                    term = "+OR+".join(list(map(urllib.parse.quote_plus,
-                                                kwargs[key])))
-                else:
-                    term = urllib.parse.quote_plus(kwargs[key])
-                q.append("{}:{}".format(key, term))
-            self._url += "+AND+".join(q)
-        super().__init__(self._url)
+            terms = build_terms(kwargs, _searchable_fields())
+            self._chunks = [self._base + "search/" + q
+                            for q in self._split_terms(terms)]
+            self._url += self._join_terms(terms)
+        else:
+            raise ValueError("no search terms given")
+        super().__init__(self._url, client, typed, fields)
+        if not self._chunks:
+            self._chunks = [self._url]
         # self._response = self.get_sync()
 
+    @staticmethod
+    def _join_terms(terms: Dict[str, List[str]]) -> str:
+        """Join quoted terms into a field:term+OR+term+AND+... query.
+
+        Args:
+            terms (Dict[str, List[str]]): quoted terms for each field
+
+        Returns:
+            str
+        """
+        return "+AND+".join("{}:{}".format(key, "+OR+".join(values))
+                            for key, values in terms.items())
+
+    def _split_terms(self, terms: Dict[str, List[str]]) -> List[str]:
+        """Split the longest OR list so that each query fits in a URL.
+
+        Args:
+            terms (Dict[str, List[str]]): quoted terms for each field
+
+        Returns:
+            List[str]
+        """
+        budget = self._MAX_URL_LENGTH - len(self._base + "search/")
+        if len(self._join_terms(terms)) <= budget:
+            return [self._join_terms(terms)]
+        key = max(terms, key=lambda k: len("+OR+".join(terms[k])))
+        budget -= len(self._join_terms(dict(terms, **{key: []})))
+        chunks, chunk, size = [], [], 0
+        for term in terms[key]:
+            extra = len(term) + (len("+OR+") if chunk else 0)
+            if chunk and size + extra > budget:
+                chunks.append(chunk)
+                chunk, size, extra = [], 0, len(term)
+            chunk.append(term)
+            size += extra
+        chunks.append(chunk)
+        return [self._join_terms(dict(terms, **{key: chunk}))
+                for chunk in chunks]
+
+    @classmethod
+    def _merge(cls, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge the responses of several chunks, dropping duplicates.
+
+        Entries are deduplicated on hgnc_id before being converted, so 
+        that duplicates are dropped even when hgnc_id is not among the 
+        returned fields, and sorted by decreasing score.
+
+        Args:
+            responses (List[Dict[str, Any]]): responses of each chunk
+
+        Returns:
+            Dict[str, Any]: merged response
+        """
+        docs, seen = [], set()
+        for response in responses:
+            docs.extend(cls._unseen(response.get("docs") or [], seen))
+        if any("score" in doc for doc in docs):
+            docs.sort(key=lambda doc: -doc.get("score", -math.inf))
+        return {"numFound": len(docs), "docs": docs}
+
+    def query(self) -> pd.DataFrame:
+        """Perform a synchronous query on HGNC.
+
+        Returns:
+            pd.DataFrame
+        """
+        if len(self._chunks) == 1:
+            return super().query()
+        responses = [self.client.get(url).get("response", {})
+                     for url in self._chunks]
+        return self._to_frame(self._merge(responses))
+
+    async def aquery(self) -> pd.DataFrame:
+        """Perform an asynchronous query on HGNC.
+
+        Chunks of a long OR query are issued concurrently.
+
+        Returns:
+            pd.DataFrame
+        """
+        if len(self._chunks) == 1:
+            return await super().aquery()
+        resps = await asyncio.gather(*[self.client.aget(url)
+                                       for url in self._chunks])
+        return await self._ato_frame(self._merge(
+            [resp.get("response", {}) for resp in resps]))
+
+    @staticmethod
+    def _page_url(url: str, start: int, rows: int) -> str:
+        """Return the URL of a page of results.
+
+        Args:
+            url (str): query URL
+            start (int): offset of the first result of the page
+            rows (int): number of results per page
+
+        Returns:
+            str
+        """
+        return "{}?start={}&rows={}".format(url, start, rows)
+
+    def _page(self,
+              docs: List[Dict[str, Any]],
+              seen: set,
+              records: bool) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        """Drop already seen entries from a page of results.
+
+        Args:
+            docs (List[Dict[str, Any]]): entries of the page
+            seen (set): hgnc_id of the entries already returned
+            records (bool): return a list of entries instead of a
+                dataframe
+
+        Returns:
+            Union[pd.DataFrame, List[Dict[str, Any]]]
+        """
+        docs = self._unseen(docs, seen)
+        if records:
+            return self._project(docs)
+        return self._to_frame({"docs": docs})
+
+    async def _apage(self,
+                     docs: List[Dict[str, Any]],
+                     seen: set,
+                     records: bool) -> Union[pd.DataFrame,
+                                             List[Dict[str, Any]]]:
+        """Drop already seen entries from a page of async results.
+
+        See ``_page()`` for details.
+
+        Returns:
+            Union[pd.DataFrame, List[Dict[str, Any]]]
+        """
+        docs = self._unseen(docs, seen)
+        if records:
+            return self._project(docs)
+        return await self._ato_frame({"docs": docs})
+
+    @staticmethod
+    def _unseen(docs: List[Dict[str, Any]],
+                seen: set) -> List[Dict[str, Any]]:
+        """Return the entries not seen yet, marking them as seen.
+
+        Args:
+            docs (List[Dict[str, Any]]): entries of the page
+            seen (set): hgnc_id of the entries already returned
+
+        Returns:
+            List[Dict[str, Any]]
+        """
+        docs = [doc for doc in docs if doc.get("hgnc_id") not in seen]
+        seen.update(doc.get("hgnc_id") for doc in docs)
+        return docs
+
+    def iter_query(self,
+                   rows: int = 1000,
+                   records: bool = False
+                   ) -> Iterator[Union[pd.DataFrame, List[Dict[str, Any]]]]:
+        """Perform a synchronous query on HGNC, one page at a time.
+
+        Results are requested ``rows`` at a time and yielded as soon as
+        each page is received, so that broad queries can be processed
+        with bounded memory.
+
+        Args:
+            rows (int): number of results per page (default: 1000)
+            records (bool): yield lists of entries instead of dataframes
+                (default: False)
+
+        Returns:
+            Iterator[Union[pd.DataFrame, List[Dict[str, Any]]]]
+        """
+        seen = set()
+        for url in self._chunks:
+            start, found = 0, 1
+            while start < found:
+                resp = self.client.get(self._page_url(url, start, rows))
+                response = resp.get("response", {"numFound": 0, "docs": []})
+                docs = response.get("docs", [])
+                if not docs:
+                    break
+                found = response.get("numFound", 0)
+                start += len(docs)
+                yield self._page(docs, seen, records)
+
+    async def aiter_query(self,
+                          rows: int = 1000,
+                          records: bool = False
+                          ) -> AsyncIterator[Union[pd.DataFrame,
+                                                   List[Dict[str, Any]]]]:
+        """Perform an asynchronous query on HGNC, one page at a time.
+
+        See ``iter_query()`` for details.
+
+        Args:
+            rows (int): number of results per page (default: 1000)
+            records (bool): yield lists of entries instead of dataframes
+                (default: False)
+
+        Returns:
+            AsyncIterator[Union[pd.DataFrame, List[Dict[str, Any]]]]
+        """
+        seen = set()
+        for url in self._chunks:
+            start, found = 0, 1
+            while start < found:
+                resp = await self.client.aget(self._page_url(url, start,
+                                                             rows))
+                response = resp.get("response", {"numFound": 0, "docs": []})
+                docs = response.get("docs", [])
+                if not docs:
+                    break
+                found = response.get("numFound", 0)
+                start += len(docs)
+                yield await self._apage(docs, seen, records)
+
     def __repr__(self):
         return "HGNC Search results"
 
@@ -251,19 +817,32 @@ class Fetch(_Server):
     Args:
         field (str): HGNC field to query
         term (Union[str,int]): query term
+        client (Optional[Client]): pooled client used to perform the 
+            calls (default: the shared default client)
+        typed (Union[bool, Schema]): convert results using a typed 
+            schema (True for the default one) (default: False)
+        fields (Optional[List[str]]): only keep these fields of each 
+            entry (default: all the stored fields)
+        host (Optional[str]): base URL of the HGNC REST service, e.g. a 
+            local ``MockHGNCServer`` (default: http://rest.genenames.org/)
 
     Example:
         >>> Fetch("symbol", "ZNF3")
+        >>> Fetch("symbol", "ZNF3", typed=True)
+        >>> Fetch("symbol", "ZNF3", fields=["hgnc_id", "ensembl_gene_id"])
     """
 
     def __init__(self,
                  field: str,
-                 term: Union[str, int]) -> None:
-        self._url = self._BASE_URL + "fetch/"
-        field = urllib.parse.quote_plus(field)
-        term = urllib.parse.quote_plus(term)
-        self._url += "{}/{}".format(field, term)
-        super().__init__(self._url)
+                 term: Union[str, int],
+                 client: Optional[Client] = None,
+                 typed: Union[bool, Schema] = False,
+                 fields: Optional[List[str]] = None,
+                 host: Optional[str] = None) -> None:
+        self._url = _base_url(host) + "fetch/"
+        field = check_field(field, _searchable_fields())
+        self._url += "{}/{}".format(field, quote(term))
+        super().__init__(self._url, client, typed, fields)
 
     def __repr__(self):
         return "HGNC Fetch results"
@@ -0,0 +1,742 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+from __future__ import annotations
+import time
+import asyncio
+import weakref
+import threading
+import urllib.parse
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (Dict, Any, AsyncIterator, Callable, Optional, Union,
+                    Tuple, TYPE_CHECKING)
+from .cache import DiskCache, MemoryCache
+from .schema import loads
+from .stats import Stats
+from .throttle import RateLimiter, backoff_delay
+
+if TYPE_CHECKING:  # pragma: no cover
+    import aiohttp
+    import requests
+
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+_HEADERS = {"Accept": "application/json",
+            "Accept-Encoding": _ACCEPT_ENCODING}
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _decode(content: bytes,
+            convert: Optional[Callable[[Any], Any]]) -> Tuple[Any, Any, float]:
+    """Decode a json response and convert it, in a single call.
+
+    Args:
+        content (bytes): json payload
+        convert (Optional[Callable[[Any], Any]]): function applied to the
+            decoded response, if any
+
+    Returns:
+        Tuple[Any, Any, float]: decoded response, its conversion (the 
+            response itself without ``convert``) and seconds spent 
+            decoding
+    """
+    start = time.perf_counter()
+    data = loads(content)
+    decoded = time.perf_counter() - start
+    return data, data if convert is None else convert(data), decoded
+
+
+def _run_ready(awaitable: Any) -> None:
+    """Run an awaitable that completes without suspending, outside of 
+    an event loop.
+
+    Args:
+        awaitable (Any): awaitable to run
+    """
+    try:
+        awaitable.send(None)
+    except StopIteration:
+        pass
+
+
+class Client:
+    """Pooled HTTP client shared by Info, Search and Fetch.
+
+    A client owns a ``requests.Session`` for synchronous calls and an
+    ``aiohttp.ClientSession`` for asynchronous calls, so that repeated
+    queries reuse open connections instead of paying a new TCP (and DNS)
+    setup every time. Sessions are created (and the requests and aiohttp
+    packages imported) lazily on first use; the asynchronous session is
+    bound to the event loop it was created in and is recreated if a
+    different loop is used. Concurrent asynchronous
+    calls for the same URL share a single network request.
+
+    Requests are throttled by a token-bucket rate limiter (HGNC asks
+    clients to stay under 10 requests per second), time out after
+    ``timeout`` seconds, and are retried with exponential backoff and
+    jitter on connection errors, timeouts, 429 and 5xx responses.
+
+    Responses are requested compressed (gzip, or brotli if installed).
+    When a cached response has expired, it is revalidated with a
+    conditional request using its ETag and Last-Modified headers, so
+    that an unchanged response costs a 304 instead of a full download.
+
+    Given an ``executor`` (a thread pool), asynchronous calls decode
+    responses of at least ``offload_threshold`` bytes in that executor,
+    along with their conversion to a dataframe in the same call, and
+    build dataframes of at least ``offload_rows`` entries there (e.g.
+    from cached responses), instead of on the event loop, so that large
+    results do not stall other coroutines; smaller ones stay inline.
+
+    Args:
+        limit (int): maximum number of simultaneous connections
+            (default: 100)
+        limit_per_host (int): maximum number of simultaneous connections
+            to the same host (default: 10)
+        keepalive_timeout (float): seconds an idle connection is kept
+            open for reuse (default: 30)
+        cache (Optional[Union[DiskCache, MemoryCache]]): cache used to 
+            store and serve responses by URL (default: None)
+        rate_limit (Optional[Union[float, RateLimiter]]): maximum number 
+            of requests per second, or a limiter shared with other 
+            clients; None disables throttling (default: 10)
+        timeout (Optional[float]): seconds before a request times out; 
+            None waits forever (default: 30)
+        retries (int): number of retries of a failed request 
+            (default: 3)
+        backoff (float): base delay in seconds of the exponential 
+            backoff between retries (default: 0.5)
+        stats (Optional[Stats]): record timings and counters of every 
+            request (default: None)
+        executor (Optional[Executor]): thread pool used to decode large 
+            responses and build their dataframes in asynchronous calls; 
+            None keeps them on the event loop (default: None)
+        offload_threshold (int): minimum size in bytes of a response 
+            decoded in the executor (default: 262144)
+        offload_rows (int): minimum number of entries of a dataframe 
+            built in the executor (default: 500)
+
+    Examples:
+        >>> with Client() as client:
+        ...     Fetch("symbol", "ZNF3", client=client).query()
+        >>> async with Client(limit_per_host=20) as client:
+        ...     await Fetch("symbol", "ZNF3", client=client).aquery()
+        >>> client = Client(executor=ThreadPoolExecutor(4))
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 10,
+                 keepalive_timeout: float = 30.0,
+                 cache: Optional[Union[DiskCache, MemoryCache]] = None,
+                 rate_limit: Optional[Union[float, RateLimiter]] = 10.0,
+                 timeout: Optional[float] = 30.0,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 stats: Optional[Stats] = None,
+                 executor: Optional[Executor] = None,
+                 offload_threshold: int = 256 * 1024,
+                 offload_rows: int = 500) -> None:
+        # results are handed back to the event loop, which would pay for
+        # unpickling them from a process pool
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError("executor must be a thread pool")
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._cache = cache
+        if rate_limit is not None and not isinstance(rate_limit,
+                                                     RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self._limiter = rate_limit
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._stats = stats
+        self._executor = executor
+        self._offload_threshold = offload_threshold
+        self._offload_rows = offload_rows
+        self._inflight = {}
+        self._session = None
+        self._lock = threading.Lock()
+        # one asynchronous session, and the generator closing it, per loop
+        self._asessions = weakref.WeakKeyDictionary()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the pooled synchronous session, creating it if needed.
+
+        Returns:
+            requests.Session
+        """
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=self._limit_per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(_HEADERS)
+                self._session = session
+            return self._session
+
+    @property
+    def asession(self) -> aiohttp.ClientSession:
+        """Return the pooled asynchronous session, creating it if needed.
+
+        Must be accessed from within a running event loop. Each event 
+        loop gets its own session, closed by that loop when it shuts down 
+        its asynchronous generators (as ``asyncio.run()`` does before 
+        closing it), or when the client is closed; a session is never 
+        used or closed from another loop.
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        import aiohttp
+        loop = asyncio.get_event_loop()
+        self._forget_closed_loops()
+        entry = self._asessions.get(loop)
+        if entry is None or entry[0].closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout)
+            session = aiohttp.ClientSession(connector=connector,
+                                            headers=_HEADERS)
+            # advance the generator to its yield, registering it with the 
+            # loop, so that the loop finalizes it when shutting down
+            closer = self._close_with_loop(session)
+            _run_ready(closer.asend(None))
+            entry = self._asessions[loop] = (session, closer)
+        return entry[0]
+
+    def _forget_closed_loops(self) -> None:
+        """Drop the sessions of the event loops already closed."""
+        for loop in [loop for loop in list(self._asessions)
+                     if loop.is_closed()]:
+            session, closer = self._asessions.pop(loop)
+            if not session.closed:
+                # a loop closed without shutting down its asynchronous 
+                # generators: its connections can no longer be closed
+                session.detach()
+            _run_ready(closer.aclose())
+
+    @staticmethod
+    async def _close_with_loop(
+            session: aiohttp.ClientSession) -> AsyncIterator[None]:
+        """Close a session once its event loop finalizes this generator.
+
+        Connections can no longer be closed once their loop is closed, 
+        so the session is closed while the loop shuts down.
+
+        Args:
+            session (aiohttp.ClientSession): session to close
+        """
+        try:
+            yield
+        finally:
+            if not session.closed:
+                await session.close()
+
+    @property
+    def cache(self) -> Optional[Union[DiskCache, MemoryCache]]:
+        """Return the cache used to store and serve responses, if any.
+
+        Returns:
+            Optional[Union[DiskCache, MemoryCache]]
+        """
+        return self._cache
+
+    @property
+    def stats(self) -> Optional[Stats]:
+        """Return the timings and counters of the requests, if recorded.
+
+        Returns:
+            Optional[Stats]
+        """
+        return self._stats
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """Return the executor used to offload work from the event loop.
+
+        Returns:
+            Optional[Executor]
+        """
+        return self._executor
+
+    @property
+    def offload_rows(self) -> int:
+        """Return the minimum number of entries of an offloaded dataframe.
+
+        Returns:
+            int
+        """
+        return self._offload_rows
+
+    @property
+    def limiter(self) -> Optional[RateLimiter]:
+        """Return the rate limiter used to throttle requests, if any.
+
+        Returns:
+            Optional[RateLimiter]
+        """
+        return self._limiter
+
+    def _request(self,
+                 url: str,
+                 timing: Dict[str, Any],
+                 headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Perform a throttled synchronous request, retrying on failure.
+
+        Args:
+            url (str): URL to retrieve
+            timing (Dict[str, Any]): updated with the seconds spent 
+                waiting ("wait") and the number of retries ("retries")
+            headers (Optional[Dict[str, str]]): additional request headers 
+                (default: None)
+
+        Returns:
+            requests.Response
+        """
+        import requests
+        for attempt in range(self._retries + 1):
+            timing["retries"] = attempt
+            if self._limiter is not None:
+                start = time.perf_counter()
+                self._limiter.acquire()
+                timing["wait"] += time.perf_counter() - start
+            try:
+                resp = self.session.get(url, headers=headers,
+                                        timeout=self._timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self._retries:
+                    raise
+                delay = backoff_delay(attempt, self._backoff)
+            else:
+                if resp.status_code not in _RETRY_STATUSES \
+                        or attempt == self._retries:
+                    return resp
+                delay = backoff_delay(attempt, self._backoff,
+                                      retry_after=resp.headers.get(
+                                          "Retry-After"))
+                resp.close()
+            timing["wait"] += delay
+            time.sleep(delay)
+
+    async def _arequest(
+            self,
+            url: str,
+            timing: Dict[str, Any],
+            headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientResponse:
+        """Perform a throttled asynchronous request, retrying on failure.
+
+        Args:
+            url (str): URL to retrieve
+            timing (Dict[str, Any]): updated with the seconds spent 
+                waiting ("wait") and the number of retries ("retries")
+            headers (Optional[Dict[str, str]]): additional request headers 
+                (default: None)
+
+        Returns:
+            aiohttp.ClientResponse
+        """
+        import aiohttp
+        timeout = aiohttp.ClientTimeout(total=self._timeout)
+        for attempt in range(self._retries + 1):
+            timing["retries"] = attempt
+            if self._limiter is not None:
+                start = time.perf_counter()
+                await self._limiter.aacquire()
+                timing["wait"] += time.perf_counter() - start
+            try:
+                resp = await self.asession.get(url, headers=headers,
+                                               timeout=timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self._retries:
+                    raise
+                delay = backoff_delay(attempt, self._backoff)
+            else:
+                if resp.status not in _RETRY_STATUSES \
+                        or attempt == self._retries:
+                    return resp
+                delay = backoff_delay(attempt, self._backoff,
+                                      retry_after=resp.headers.get(
+                                          "Retry-After"))
+                resp.release()
+            timing["wait"] += delay
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _info_url(url: str) -> str:
+        """Return the info URL of the server hosting the given URL.
+
+        Args:
+            url (str): any URL of the HGNC REST service
+
+        Returns:
+            str
+        """
+        return urllib.parse.urljoin(url, "/info")
+
+    def _check_cache(self, url: str) -> None:
+        """Invalidate the cache if HGNC has been modified meanwhile.
+
+        Args:
+            url (str): URL about to be retrieved
+        """
+        if self._cache.needs_check():
+            info = self.get(self._info_url(url), use_cache=False)
+            self._cache.invalidate(info.get("lastModified", ""))
+
+    async def _acheck_cache(self, url: str) -> None:
+        """Invalidate the cache if HGNC has been modified meanwhile.
+
+        Args:
+            url (str): URL about to be retrieved
+        """
+        if self._cache.needs_check():
+            info = await self.aget(self._info_url(url), use_cache=False)
+            self._cache.invalidate(info.get("lastModified", ""))
+
+    def _record_request(self,
+                        url: str,
+                        status: int,
+                        timing: Dict[str, Any],
+                        start: float,
+                        fetched: float,
+                        size: int,
+                        decoded: Optional[float] = None) -> None:
+        """Record a completed request, if stats are enabled.
+
+        Args:
+            url (str): requested URL
+            status (int): HTTP status of the response
+            timing (Dict[str, Any]): wait time and retries of the request
+            start (float): time the request started
+            fetched (float): time the response was downloaded
+            size (int): bytes downloaded
+            decoded (Optional[float]): seconds spent decoding the 
+                response (default: the time elapsed since ``fetched``)
+        """
+        if self._stats is not None:
+            if decoded is None:
+                decoded = time.perf_counter() - fetched
+            self._stats.record_request(
+                url, status, timing["wait"],
+                fetched - start - timing["wait"],
+                decoded, size, timing["retries"])
+
+    def _record_error(self,
+                      url: str,
+                      error: BaseException,
+                      timing: Dict[str, Any]) -> None:
+        """Record a failed request, if stats are enabled.
+
+        Args:
+            url (str): requested URL
+            error (BaseException): error raised by the request
+            timing (Dict[str, Any]): wait time and retries of the request
+        """
+        if self._stats is not None:
+            self._stats.record_error(url, error, timing["retries"])
+
+    def _record_cache(self, url: str, hit: bool) -> None:
+        """Record a cache lookup, if stats are enabled.
+
+        Args:
+            url (str): requested URL
+            hit (bool): whether the response was served from the cache
+        """
+        if self._stats is not None:
+            self._stats.record_cache(url, hit)
+
+    def _stale(self, url: str) -> Tuple[Optional[Dict[str, Any]],
+                                        Optional[Dict[str, str]]]:
+        """Return an expired cached response and its conditional headers.
+
+        Args:
+            url (str): URL about to be retrieved
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]: the 
+                cached response and the If-None-Match/If-Modified-Since 
+                headers to revalidate it, or (None, None)
+        """
+        entry = self._cache.stale(url)
+        if entry is None:
+            return None, None
+        value, validators = entry
+        headers = {}
+        if validators.get("ETag"):
+            headers["If-None-Match"] = validators["ETag"]
+        if validators.get("Last-Modified"):
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return value, headers
+
+    def _store(self, url: str, data: Dict[str, Any], resp_headers) -> None:
+        """Store a response in the cache, along with its validators.
+
+        Args:
+            url (str): requested URL
+            data (Dict[str, Any]): json response
+            resp_headers: headers of the response
+        """
+        validators = {key: resp_headers[key]
+                      for key in ("ETag", "Last-Modified")
+                      if resp_headers.get(key)}
+        self._cache.set(url, data, validators)
+
+    def get(self, url: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Synchronous call to HGNC.
+
+        Args:
+            url (str): URL to retrieve
+            use_cache (bool): serve and store the response using the 
+                client cache, if any (default: True)
+
+        Returns:
+            Dict[str, Any]
+        """
+        use_cache = use_cache and self._cache is not None
+        if use_cache:
+            self._check_cache(url)
+            cached = self._cache.get(url)
+            self._record_cache(url, cached is not None)
+            if cached is not None:
+                return cached
+            stale, headers = self._stale(url)
+        else:
+            stale, headers = None, None
+        timing = {"wait": 0.0, "retries": 0}
+        start = time.perf_counter()
+        try:
+            resp = self._request(url, timing, headers)
+            content = resp.content
+        except Exception as e:
+            self._record_error(url, e, timing)
+            raise
+        fetched = time.perf_counter()
+        if resp.status_code == 304 and stale is not None:
+            self._cache.touch(url)
+            self._record_request(url, 304, timing, start, fetched, 0)
+            return stale
+        data = loads(content)
+        self._record_request(url, resp.status_code, timing, start, fetched,
+                             len(content))
+        if use_cache and resp.status_code == 200:
+            self._store(url, data, resp.headers)
+        return data
+
+    async def aget(self,
+                   url: str,
+                   use_cache: bool = True,
+                   convert: Optional[Callable[[Dict[str, Any]], Any]] = None
+                   ) -> Any:
+        """Asynchronous call to HGNC.
+
+        Args:
+            url (str): URL to retrieve
+            use_cache (bool): serve and store the response using the 
+                client cache, if any (default: True)
+            convert (Optional[Callable[[Dict[str, Any]], Any]]): function 
+                converting the decoded response, such as to a dataframe; 
+                a large response is decoded and converted in a single 
+                executor call (default: None)
+
+        Returns:
+            Any: the decoded response, or its conversion
+        """
+        use_cache = use_cache and self._cache is not None
+        if use_cache:
+            await self._acheck_cache(url)
+            cached = self._cache.get(url)
+            self._record_cache(url, cached is not None)
+            if cached is not None:
+                return await self._aconvert(cached, convert)
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._aget(url, use_cache, convert))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+            return (await asyncio.shield(task))[1]
+        # the request is shared, but each caller converts the response
+        data = (await asyncio.shield(task))[0]
+        return await self._aconvert(data, convert)
+
+    async def _aconvert(self,
+                        data: Dict[str, Any],
+                        convert: Optional[Callable[[Dict[str, Any]], Any]]
+                        ) -> Any:
+        """Convert a decoded response, in the executor if it holds many 
+        entries.
+
+        Args:
+            data (Dict[str, Any]): decoded response
+            convert (Optional[Callable[[Dict[str, Any]], Any]]): function 
+                converting the response, if any
+
+        Returns:
+            Any
+        """
+        if convert is None:
+            return data
+        docs = (data.get("response") or {}).get("docs") or []
+        if self._executor is None or len(docs) < self._offload_rows:
+            return convert(data)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, convert, data)
+
+    async def _adecode(self,
+                       content: bytes,
+                       convert: Optional[Callable[[Dict[str, Any]], Any]]
+                       ) -> Tuple[Any, Any, float]:
+        """Decode a json response and convert it, in a single executor 
+        call if the response is large.
+
+        Args:
+            content (bytes): json payload
+            convert (Optional[Callable[[Dict[str, Any]], Any]]): function 
+                converting the response, if any
+
+        Returns:
+            Tuple[Any, Any, float]: see ``_decode()``
+        """
+        if self._executor is None or len(content) < self._offload_threshold:
+            data, _, decoded = _decode(content, None)
+            return data, await self._aconvert(data, convert), decoded
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, _decode, content,
+                                          convert)
+
+    async def _aget(self,
+                    url: str,
+                    use_cache: bool,
+                    convert: Optional[Callable[[Dict[str, Any]], Any]]
+                    ) -> Tuple[Any, Any]:
+        """Perform the network call behind ``aget()``.
+
+        Args:
+            url (str): URL to retrieve
+            use_cache (bool): store the response in the client cache
+            convert (Optional[Callable[[Dict[str, Any]], Any]]): function 
+                converting the response, if any
+
+        Returns:
+            Tuple[Any, Any]: decoded response and its conversion
+        """
+        stale, headers = self._stale(url) if use_cache else (None, None)
+        timing = {"wait": 0.0, "retries": 0}
+        start = time.perf_counter()
+        try:
+            async with await self._arequest(url, timing, headers) as resp:
+                content = await resp.read()
+                status = resp.status
+                resp_headers = resp.headers
+        except Exception as e:
+            self._record_error(url, e, timing)
+            raise
+        fetched = time.perf_counter()
+        if status == 304 and stale is not None:
+            self._cache.touch(url)
+            self._record_request(url, 304, timing, start, fetched, 0)
+            return stale, await self._aconvert(stale, convert)
+        data, converted, decoded = await self._adecode(content, convert)
+        self._record_request(url, status, timing, start, fetched,
+                             len(content), decoded)
+        if use_cache and status == 200:
+            self._store(url, data, resp_headers)
+        return data, converted
+
+    def _close_sync(self) -> None:
+        """Close the pooled synchronous session."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def _close_async(self) -> None:
+        """Close the pooled asynchronous session of the running loop."""
+        entry = self._asessions.pop(asyncio.get_event_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _close_idle(self) -> None:
+        """Close the asynchronous sessions of the event loops that are 
+        not running, from outside of any running loop."""
+        self._forget_closed_loops()
+        for loop in list(self._asessions):
+            if not loop.is_running():
+                closer = self._asessions.pop(loop)[1]
+                loop.run_until_complete(closer.aclose())
+
+    def close(self) -> None:
+        """Close the pooled sessions and release their connections.
+
+        Asynchronous sessions of loops still running (or of any loop, if 
+        called from a running loop) are left to be closed by their loops.
+        """
+        self._close_sync()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._close_idle()
+        else:
+            self._forget_closed_loops()
+
+    async def aclose(self) -> None:
+        """Close the pooled sessions from within an event loop."""
+        self._close_sync()
+        await self._close_async()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def __repr__(self) -> str:
+        return "HGNC Client"
+
+
+_DEFAULT_CLIENT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_client() -> Client:
+    """Return the process-wide client used when none is given explicitly.
+
+    Returns:
+        Client
+    """
+    global _DEFAULT_CLIENT
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = Client()
+        return _DEFAULT_CLIENT
+
+
+def set_default_client(client: Optional[Client]) -> None:
+    """Replace the process-wide client used when none is given explicitly.
+
+    Args:
+        client (Optional[Client]): new default client; if None, a fresh
+            client will be created on next use
+    """
+    global _DEFAULT_CLIENT
+    _DEFAULT_CLIENT = client
@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+# Fields advertised by the HGNC info request, used where a network
+# round-trip is not wanted
+SEARCHABLE_FIELDS = ["vega_id", "locus_group", "alias_symbol",
+                     "rna_central_id", "prev_name", "refseq_accession",
+                     "hgnc_id", "entrez_id", "symbol", "name", "mgd_id",
+                     "prev_symbol", "alias_name", "status", "locus_type",
+                     "rgd_id", "ensembl_gene_id", "omim_id", "ucsc_id",
+                     "uniprot_ids", "ena", "ccds_id", "gene_group_id",
+                     "location_sortable"]
+
+STORED_FIELDS = ["vega_id", "locus_group", "alias_symbol", "_version_",
+                 "uuid", "rna_central_id", "prev_name",
+                 "refseq_accession", "mirbase", "lsdb", "homeodb",
+                 "hgnc_id", "cosmic", "entrez_id", "symbol",
+                 "location", "name", "mgd_id", "snornabase",
+                 "prev_symbol", "bioparadigms_slc", "orphanet",
+                 "alias_name", "date_approved_reserved", "status",
+                 "pseudogene.org", "merops", "horde_id", "locus_type",
+                 "imgt", "iuphar", "rgd_id", "kznf_gene_catalog",
+                 "ensembl_gene_id", "gtrnadb", "mamit-trnadb",
+                 "gene_group", "omim_id", "date_name_changed", "cd",
+                 "date_modified", "lncipedia", "ucsc_id", "lncrnadb",
+                 "enzyme_id", "uniprot_ids",
+                 "intermediate_filament_db", "ena", "ccds_id",
+                 "pubmed_id", "date_symbol_changed", "gene_group_id",
+                 "location_sortable"]
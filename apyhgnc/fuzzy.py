@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _deletions(word: str, depth: int) -> Set[str]:
+    """Return the strings obtained deleting up to ``depth`` characters.
+
+    Args:
+        word (str): original string
+        depth (int): maximum number of deleted characters
+
+    Returns:
+        Set[str]: deletion variants, including the string itself
+    """
+    variants, frontier = {word}, {word}
+    for _ in range(depth):
+        frontier = {item[:i] + item[i + 1:] for item in frontier
+                    for i in range(len(item))}
+        variants |= frontier
+    return variants
+
+
+def _masks(word: str) -> Dict[str, int]:
+    """Return the bit mask of the positions of each character of a word.
+
+    Args:
+        word (str): pattern of the bit-parallel distance
+
+    Returns:
+        Dict[str, int]
+    """
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | 1 << i
+    return masks
+
+
+def _distance(masks: Dict[str, int], length: int, other: str) -> int:
+    """Return the Levenshtein distance between a pattern and a string.
+
+    Uses Myers' bit-parallel algorithm, processing a whole column of the
+    dynamic programming matrix per character of ``other``.
+
+    Args:
+        masks (Dict[str, int]): character masks of the pattern, as
+            returned by ``_masks()``
+        length (int): length of the pattern
+        other (str): string compared with the pattern
+
+    Returns:
+        int
+    """
+    if not length:
+        return len(other)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+    for char in other:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1 | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def distance(a: str, b: str) -> int:
+    """Return the Levenshtein distance between two strings.
+
+    Args:
+        a (str): first string
+        b (str): second string
+
+    Returns:
+        int: minimum number of single-character insertions, deletions and
+            substitutions turning a into b
+
+    Example:
+        >>> distance("BRAF", "BRAF1")
+    """
+    return _distance(_masks(a), len(a), b)
+
+
+class FuzzyIndex:
+    """Edit-distance index over a list of strings.
+
+    The index stores every string obtained by deleting up to
+    ``max_distance`` characters from each key (symmetric deletion, as in
+    SymSpell): two strings within that edit distance always share one of
+    these variants, so that a lookup only needs to hash the deletion
+    variants of the term, instead of comparing it with every key.
+    Candidates are then verified with a bit-parallel Levenshtein
+    distance. Variants are stored as sorted 64-bit hashes, along with the
+    key they come from, to keep memory low; hash collisions only add
+    candidates that are discarded by the verification.
+
+    Args:
+        keys (List[str]): strings to index
+        max_distance (int): largest edit distance supported by lookups
+            (default: 2)
+
+    Attributes:
+        keys (List[str]): return the indexed strings
+        max_distance (int): return the largest supported edit distance
+
+    Example:
+        >>> index = FuzzyIndex(["braf", "araf", "raf1"])
+        >>> index.lookup("brafx")
+    """
+
+    def __init__(self, keys: List[str], max_distance: int = 2) -> None:
+        if max_distance < 0:
+            raise ValueError("max_distance must be non-negative")
+        self._keys = list(keys)
+        self._max_distance = max_distance
+        hashes, positions = [], []
+        for pos, key in enumerate(self._keys):
+            variants = _deletions(key, max_distance)
+            hashes.extend(map(hash, variants))
+            positions.extend([pos] * len(variants))
+        hashes = np.array(hashes, dtype=np.int64)
+        order = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[order]
+        self._positions = np.array(positions, dtype=np.int32)[order]
+
+    @property
+    def keys(self) -> List[str]:
+        return self._keys
+
+    @property
+    def max_distance(self) -> int:
+        return self._max_distance
+
+    def _candidates(self, term: str, max_distance: int) -> List[int]:
+        """Return the positions of the keys sharing a deletion variant
+        with the given term.
+
+        Args:
+            term (str): term to look up
+            max_distance (int): maximum number of deleted characters
+
+        Returns:
+            List[int]
+        """
+        hashes = np.fromiter(map(hash, _deletions(term, max_distance)),
+                             dtype=np.int64)
+        starts = np.searchsorted(self._hashes, hashes, side="left")
+        counts = np.searchsorted(self._hashes, hashes,
+                                 side="right") - starts
+        found = counts > 0
+        starts, counts = starts[found], counts[found]
+        if not len(counts):
+            return []
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        rows = offsets + np.arange(counts.sum())
+        return np.unique(self._positions[rows]).tolist()
+
+    def lookup(self,
+               term: str,
+               max_distance: Optional[int] = None) -> List[Tuple[int, str]]:
+        """Return the keys within the given edit distance of a term.
+
+        Args:
+            term (str): term to look up
+            max_distance (Optional[int]): maximum edit distance, not
+                larger than the one of the index (default: the one of the
+                index)
+
+        Returns:
+            List[Tuple[int, str]]: distance and key of each match, from
+                the closest one
+        """
+        if max_distance is None:
+            max_distance = self._max_distance
+        if not 0 <= max_distance <= self._max_distance:
+            raise ValueError("max_distance must be between 0 and {}".format(
+                self._max_distance))
+        masks, length = _masks(term), len(term)
+        matches = []
+        for pos in self._candidates(term, max_distance):
+            key = self._keys[pos]
+            if abs(len(key) - length) > max_distance:
+                continue
+            found = _distance(masks, length, key)
+            if found <= max_distance:
+                matches.append((found, key))
+        return sorted(matches)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return "HGNC FuzzyIndex"
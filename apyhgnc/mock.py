@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import gzip
+import json
+import time
+import hashlib
+import threading
+import urllib.parse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, Any, List, Optional, Tuple
+from .fields import SEARCHABLE_FIELDS, STORED_FIELDS
+from .snapshot import Snapshot
+
+
+def _etag(body: Dict[str, Any]) -> str:
+    """Return the ETag of a response, ignoring its timing header.
+
+    Args:
+        body (Dict[str, Any]): json response
+
+    Returns:
+        str
+    """
+    content = {key: value for key, value in body.items()
+               if key != "responseHeader"}
+    digest = hashlib.sha1(json.dumps(content, sort_keys=True,
+                                     default=str).encode("utf-8"))
+    return '"{}"'.format(digest.hexdigest()[:20])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler answering as the HGNC REST service would."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        mock = self.server.mock
+        retry_after = mock._admit()
+        if retry_after is not None:
+            self._send(429, {"error": "too many requests"},
+                       {"Retry-After": str(retry_after)})
+            return
+        if mock.latency:
+            time.sleep(mock.latency)
+        url = urllib.parse.urlparse(self.path)
+        parts = [urllib.parse.unquote_plus(part)
+                 for part in url.path.split("/") if part]
+        params = urllib.parse.parse_qs(url.query)
+        try:
+            status, body = mock._answer(parts, params)
+        except ValueError as e:
+            status, body = 400, {"error": str(e)}
+        if status != 200:
+            self._send(status, body)
+            return
+        etag = _etag(body)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(status, body, {"ETag": etag})
+
+    def _send(self,
+              status: int,
+              body: Dict[str, Any],
+              headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class MockHGNCServer:
+    """Local stand-in for the HGNC REST service.
+
+    Serves info, fetch and search requests, and the complete set at
+    ``hgnc_complete_set.json``, from a ``Snapshot`` (such as the recorded
+    entries in ``tests/data``) on a local port, in a background thread,
+    so that queries can be tested and benchmarked reproducibly without
+    network access. Every response can
+    be delayed by ``latency`` seconds, and requests beyond ``rate_limit``
+    per second are answered with 429 and a Retry-After header.
+    Responses are gzipped when the client accepts it and carry an ETag;
+    requests with a matching If-None-Match header are answered with 304.
+
+    Search queries are evaluated locally, with the same Solr-style
+    grammar (see ``Snapshot.query_positions()``): terms match whole
+    values or wildcard patterns, and every score is 1.0.
+
+    Args:
+        snapshot (Optional[Snapshot]): entries to serve (default: the
+            entries of ``path``)
+        path (Optional[str]): json file holding the entries to serve, in
+            the format of the HGNC complete set (default: None)
+        latency (float): seconds each response is delayed (default: 0)
+        rate_limit (Optional[float]): maximum number of requests per
+            second; None disables the limit (default: None)
+        port (int): port to listen to, 0 for a free one (default: 0)
+
+    Attributes:
+        url (str): return the base URL of the server
+        requests (int): return the number of requests received
+
+    Examples:
+        >>> with MockHGNCServer(path="tests/data/hgnc_subset.json",
+        ...                     latency=0.05) as server:
+        ...     Fetch("symbol", "ZNF3", host=server.url).query()
+    """
+
+    def __init__(self,
+                 snapshot: Optional[Snapshot] = None,
+                 path: Optional[str] = None,
+                 latency: float = 0.0,
+                 rate_limit: Optional[float] = None,
+                 port: int = 0) -> None:
+        if snapshot is None:
+            if path is None:
+                raise ValueError("either snapshot or path is required")
+            snapshot = Snapshot.from_json(path)
+        self._snapshot = snapshot
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self._port = port
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._requests = 0
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server.
+
+        Returns:
+            str
+        """
+        if self._server is None:
+            raise ValueError("the server is not running")
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}/".format(host, port)
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests received.
+
+        Returns:
+            int
+        """
+        return self._requests
+
+    def _admit(self) -> Optional[int]:
+        """Count a new request, checking the rate limit.
+
+        Returns:
+            Optional[int]: seconds to wait before retrying, or None if the
+                request is allowed
+        """
+        with self._lock:
+            self._requests += 1
+            if self.rate_limit is None:
+                return None
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                return 1
+            self._recent.append(now)
+            return None
+
+    def _answer(self,
+                parts: List[str],
+                params: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        """Return the status and body answering the given request.
+
+        Args:
+            parts (List[str]): unquoted path components
+            params (Dict[str, List[str]]): query string parameters
+
+        Returns:
+            Tuple[int, Dict[str, Any]]
+        """
+        start = time.perf_counter()
+        snap = self._snapshot
+        if parts == ["info"]:
+            body = {"lastModified": snap.last_modified,
+                    "numDoc": len(snap),
+                    "searchableFields": SEARCHABLE_FIELDS,
+                    "storedFields": STORED_FIELDS}
+        elif parts == ["hgnc_complete_set.json"]:
+            docs = snap.docs(list(range(len(snap))))
+            body = {"response": {"numFound": len(docs), "start": 0,
+                                 "docs": docs}}
+        elif len(parts) == 3 and parts[0] == "fetch":
+            docs = snap.docs(snap.fetch_positions(parts[1], parts[2]))
+            body = {"response": {"numFound": len(docs), "start": 0,
+                                 "docs": docs}}
+        elif len(parts) in (2, 3) and parts[0] == "search":
+            positions = snap.search_positions(*parts[1:])
+            docs = [{"hgnc_id": doc.get("hgnc_id"), "score": 1.0,
+                     "symbol": doc.get("symbol")}
+                    for doc in snap.docs(positions)]
+            first = int(params.get("start", [0])[0])
+            rows = int(params.get("rows", [len(docs)])[0])
+            body = {"response": {"numFound": len(docs), "start": first,
+                                 "maxScore": 1.0,
+                                 "docs": docs[first:first + rows]}}
+        else:
+            return 404, {"error": "not found"}
+        elapsed = int((time.perf_counter() - start) * 1000)
+        body["responseHeader"] = {"status": 0, "QTime": elapsed}
+        return 200, body
+
+    def start(self) -> "MockHGNCServer":
+        """Start serving requests in a background thread.
+
+        Returns:
+            MockHGNCServer
+        """
+        if self._server is None:
+            self._server = _HTTPServer(("127.0.0.1", self._port), _Handler)
+            self._server.mock = self
+            self._thread = threading.Thread(target=self._server.serve_forever,
+                                            kwargs={"poll_interval": 0.05},
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "MockHGNCServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return "HGNC MockHGNCServer"
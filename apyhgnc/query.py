@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import difflib
+import urllib.parse
+from typing import Dict, Any, List, Optional, Union
+from .fields import SEARCHABLE_FIELDS, STORED_FIELDS
+
+
+def check_field(field: str, fields: Optional[List[str]] = None) -> str:
+    """Make sure the given field can be used to search or fetch entries.
+
+    Args:
+        field (str): HGNC field
+        fields (Optional[List[str]]): available searchable fields
+            (default: the fields known at release time)
+
+    Returns:
+        str
+
+    Example:
+        >>> check_field("symbl")    # ValueError, did you mean symbol?
+    """
+    fields = fields or SEARCHABLE_FIELDS
+    if field not in fields:
+        msg = "{} is not a searchable field".format(field)
+        close = difflib.get_close_matches(str(field), fields, n=1)
+        if close:
+            msg += " (did you mean {}?)".format(close[0])
+        raise ValueError(msg)
+    return field
+
+
+def check_fields(fields: List[str],
+                 available: Optional[List[str]] = None) -> List[str]:
+    """Make sure the given fields can be returned by HGNC.
+
+    Args:
+        fields (List[str]): HGNC fields to keep, in order
+        available (Optional[List[str]]): available stored fields
+            (default: the fields known at release time)
+
+    Returns:
+        List[str]: fields, without duplicates
+
+    Example:
+        >>> check_fields(["hgnc_id", "symbol", "ensembl_gene_id"])
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    available = available or STORED_FIELDS
+    for field in fields:
+        if field not in available:
+            msg = "{} is not a stored field".format(field)
+            close = difflib.get_close_matches(str(field), available, n=1)
+            if close:
+                msg += " (did you mean {}?)".format(close[0])
+            raise ValueError(msg)
+    if not fields:
+        raise ValueError("empty list of fields")
+    return list(dict.fromkeys(fields))
+
+
+def canonical_term(term: Union[str, int]) -> str:
+    """Return the canonical form of a single query term.
+
+    Args:
+        term (Union[str,int]): query term
+
+    Returns:
+        str
+    """
+    value = "" if term is None else str(term).strip()
+    if not value:
+        raise ValueError("empty query term")
+    return value
+
+
+def canonical_terms(terms: Any) -> List[str]:
+    """Return the canonical form of a term or list of OR-ed terms.
+
+    Terms are stripped, deduplicated and sorted, so that equivalent
+    queries produce the same URL (and hit the same cache entries).
+
+    Args:
+        terms (Any): query term or list of query terms
+
+    Returns:
+        List[str]
+    """
+    if not isinstance(terms, (list, tuple, set, frozenset)):
+        terms = [terms]
+    if not terms:
+        raise ValueError("empty list of query terms")
+    return sorted({canonical_term(term) for term in terms})
+
+
+def quote(term: Union[str, int]) -> str:
+    """Quote a canonical term to be used in a URL.
+
+    Args:
+        term (Union[str,int]): query term
+
+    Returns:
+        str
+    """
+    return urllib.parse.quote_plus(canonical_term(term))
+
+
+def build_terms(kwargs: Dict[str, Any],
+                fields: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """Validate keyword search terms and return them quoted, by field.
+
+    Fields are sorted and each list of terms is canonicalized.
+
+    Args:
+        kwargs (Dict[str, Any]): search terms for each field
+        fields (Optional[List[str]]): available searchable fields
+            (default: the fields known at release time)
+
+    Returns:
+        Dict[str, List[str]]
+
+    Example:
+        >>> build_terms({"symbol": ["ZNF3", "BRAF", "BRAF"]})
+        {'symbol': ['BRAF', 'ZNF3']}
+    """
+    return {check_field(field, fields): [urllib.parse.quote_plus(term)
+                                         for term in
+                                         canonical_terms(kwargs[field])]
+            for field in sorted(kwargs)}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+from __future__ import annotations
+import json
+from typing import Dict, Any, List, Optional, Union, TYPE_CHECKING
+from .fields import STORED_FIELDS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+LIST_FIELDS = {"alias_symbol", "alias_name", "prev_symbol", "prev_name",
+               "ccds_id", "ena", "enzyme_id", "gene_group",
+               "gene_group_id", "lsdb", "mgd_id", "omim_id", "pubmed_id",
+               "refseq_accession", "rgd_id", "rna_central_id",
+               "uniprot_ids", "mirbase", "lncipedia", "cd", "iuphar"}
+INTEGER_FIELDS = {"_version_", "entrez_id", "kznf_gene_catalog"}
+CATEGORICAL_FIELDS = {"status", "locus_type", "locus_group"}
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a json response, using orjson when available.
+
+    Args:
+        data (Union[bytes, str]): json payload
+
+    Returns:
+        Any
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow, which is only needed for Arrow list columns.
+
+    Returns:
+        Any: the pyarrow module
+    """
+    try:
+        import pyarrow
+    except ImportError:  # pragma: no cover
+        raise ImportError("pyarrow is required for Arrow list columns")
+    return pyarrow
+
+
+class Schema:
+    """Typed conversion of HGNC entries to a dataframe.
+
+    Entries are converted to a dataframe in a single pass, then the columns of
+    the stored fields are cast to their dtypes, one whole column at a time:
+    status, locus_type and locus_group become categorical, numeric ids become
+    nullable integers, and list-valued fields are either kept as python lists,
+    stored as Arrow list columns (requires pyarrow) or exploded into one row
+    per item. Fields not listed in the stored fields are left as they are.
+
+    Args:
+        stored_fields (Optional[List[str]]): HGNC stored fields
+            (default: the fields known at release time; use
+            ``Info().storedFields`` for the live list)
+        lists (str): how to store list-valued fields, either "object"
+            or "arrow" (default: "object")
+        explode (Optional[str]): list-valued field to explode into one
+            row per item (default: None)
+
+    Examples:
+        >>> Schema().to_frame(docs)
+        >>> Schema(Info().storedFields, lists="arrow").to_frame(docs)
+        >>> Fetch("symbol", "ZNF3", typed=Schema(explode="alias_symbol"))
+    """
+
+    def __init__(self,
+                 stored_fields: Optional[List[str]] = None,
+                 lists: str = "object",
+                 explode: Optional[str] = None) -> None:
+        if lists not in ("object", "arrow"):
+            raise ValueError("lists must be either 'object' or 'arrow'")
+        if lists == "arrow":
+            _pyarrow()
+        self._fields = set(stored_fields or STORED_FIELDS)
+        self._lists = lists
+        self._explode = explode
+
+    def dtype(self, field: str) -> Optional[Any]:
+        """Return the dtype used for the given field.
+
+        Args:
+            field (str): HGNC stored field
+
+        Returns:
+            Optional[Any]: None if the dtype is left to pandas
+        """
+        if field not in self._fields:
+            return None
+        if field in CATEGORICAL_FIELDS:
+            return "category"
+        if field in INTEGER_FIELDS:
+            return "Int64"
+        if field in LIST_FIELDS and self._lists == "arrow":
+            import pandas as pd
+            pa = _pyarrow()
+            return pd.ArrowDtype(pa.list_(pa.string()))
+        return None
+
+    def _column(self, values: pd.Series, dtype: Any) -> Any:
+        """Convert the values of a field to a typed column.
+
+        Args:
+            values (pd.Series): values of the field, NaN where missing
+            dtype (Any): dtype of the field, as returned by ``dtype()``
+
+        Returns:
+            Any
+        """
+        import pandas as pd
+        if dtype == "Int64":
+            try:
+                return values.astype("Int64")
+            except (TypeError, ValueError):
+                # ids stored as strings, such as entrez_id
+                return pd.to_numeric(values).astype("Int64")
+        if isinstance(dtype, pd.ArrowDtype):
+            pa = _pyarrow()
+            try:
+                array = pa.array(values, from_pandas=True).cast(
+                    dtype.pyarrow_dtype)
+            except pa.ArrowException:
+                # lists mixing strings and numbers
+                array = pa.array([[str(item) for item in value]
+                                  if isinstance(value, list) else None
+                                  for value in values],
+                                 type=dtype.pyarrow_dtype)
+            return pd.arrays.ArrowExtensionArray(array)
+        return values.astype(dtype)
+
+    def to_frame(self,
+                 docs: List[Dict[str, Any]],
+                 fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """Convert HGNC entries to a typed dataframe.
+
+        Args:
+            docs (List[Dict[str, Any]]): HGNC entries
+            fields (Optional[List[str]]): only convert these fields, in 
+                this order (default: all the fields of the entries)
+
+        Returns:
+            pd.DataFrame
+        """
+        import pandas as pd
+        df = pd.DataFrame.from_records(docs, columns=fields)
+        for field in df.columns:
+            dtype = self.dtype(field)
+            if dtype is not None:
+                df[field] = self._column(df[field], dtype)
+        if self._explode is not None and self._explode in df.columns:
+            df = df.explode(self._explode, ignore_index=True)
+        return df
+
+    def __repr__(self) -> str:
+        return "HGNC Schema"
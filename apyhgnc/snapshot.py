@@ -0,0 +1,1058 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import re
+import gzip
+import json
+import math
+import bisect
+import pandas as pd
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Union, Tuple
+from .client import Client, get_default_client
+from .fields import SEARCHABLE_FIELDS
+from .fuzzy import FuzzyIndex
+from .solr import evaluate, is_wildcard, parse_query, wildcard_regex
+from .tables import table_format, write_table, _read
+
+
+def _is_missing(value: Any) -> bool:
+    """Return True if the given cell holds no value.
+
+    Args:
+        value (Any): cell value
+
+    Returns:
+        bool
+    """
+    return value is None or value is pd.NA \
+        or (isinstance(value, float) and math.isnan(value))
+
+
+def _values(value: Any) -> List[Any]:
+    """Return the single values held by a (possibly list-valued) cell.
+
+    Args:
+        value (Any): cell value
+
+    Returns:
+        List[Any]
+    """
+    if isinstance(value, list):
+        return value
+    if _is_missing(value):
+        return []
+    return [value]
+
+
+def _key(value: Any) -> str:
+    """Return the index key used for the given value.
+
+    Args:
+        value (Any): value to index or look up
+
+    Returns:
+        str
+    """
+    return str(value).lower()
+
+
+_SYMBOL_FIELDS = ["symbol", "prev_symbol", "alias_symbol"]
+_WITHDRAWN = "~withdrawn"
+_SUGGESTION_COLUMNS = ["term", "suggestion", "distance", "hgnc_id", "symbol",
+                       "match_type", "status", "candidates"]
+_RANGE = re.compile(r"^\[(\S+) TO (\S+)\]$")
+
+
+def _unindex(index: Dict[str, List[int]], pos: int, value: Any) -> None:
+    """Remove an entry from the index of a field.
+
+    Args:
+        index (Dict[str, List[int]]): index of the field
+        pos (int): position of the entry
+        value (Any): value of the field in the entry
+    """
+    for item in _values(value):
+        positions = index.get(_key(item))
+        if positions is not None and pos in positions:
+            positions.remove(pos)
+            if not positions:
+                del index[_key(item)]
+
+
+def _timestamp(value: str) -> pd.Timestamp:
+    """Return a HGNC date, or date and time, as a UTC timestamp.
+
+    Args:
+        value (str): date such as "2019-09-02" or "2019-09-02T08:00:00Z"
+
+    Returns:
+        pd.Timestamp
+    """
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        return stamp.tz_localize("UTC")
+    return stamp.tz_convert("UTC")
+
+
+def _canonical(doc: Dict[str, Any]) -> str:
+    """Return a canonical form of an entry, used to compare entries.
+
+    Args:
+        doc (Dict[str, Any]): HGNC entry
+
+    Returns:
+        str
+    """
+    doc = {k: v for k, v in doc.items() if not _is_missing(v)}
+    # values read back from Arrow tables may be numpy arrays or scalars
+    return json.dumps(doc, sort_keys=True,
+                      default=lambda value: value.tolist())
+
+
+def _response_docs(resp: Dict[str, Any], url: str) -> List[Dict[str, Any]]:
+    """Return the entries of a response, checking that it holds them.
+
+    Args:
+        resp (Dict[str, Any]): json response
+        url (str): requested URL, reported in errors
+
+    Returns:
+        List[Dict[str, Any]]
+    """
+    if not isinstance(resp, dict) or "error" in resp \
+            or not isinstance(resp.get("response", {}).get("docs"), list):
+        raise ValueError("invalid response from {}: {}".format(url, resp))
+    return resp["response"]["docs"]
+
+
+def _object_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Convert Arrow-backed columns to object columns of python values.
+
+    Args:
+        frame (pd.DataFrame): HGNC entries
+
+    Returns:
+        pd.DataFrame
+    """
+    arrow = [col for col in frame.columns
+             if isinstance(frame[col].dtype, pd.ArrowDtype)]
+    if not arrow:
+        return frame
+    frame = frame.copy()
+    for col in arrow:
+        frame[col] = pd.Series([None if _is_missing(value) else value
+                                for value in frame[col]],
+                               index=frame.index, dtype=object)
+    return frame
+
+
+class Snapshot:
+    """Local copy of the whole HGNC database.
+
+    A snapshot holds every HGNC entry in a single (columnar) dataframe and
+    serves fetch and search requests from hash indexes, built on first use
+    for each searchable field, without any network round-trip. Lookups
+    are case-insensitive and match whole values (or whole items of
+    list-valued fields).
+
+    Args:
+        docs (List[Dict[str, Any]]): HGNC entries, as returned in the
+            ``docs`` of a fetch request
+        last_modified (Optional[str]): modification date of the snapshot
+            (default: the most recent date_modified among the entries)
+
+    Attributes:
+        frame (pd.DataFrame): return all the entries of the snapshot
+        last_modified (str): return the modification date of the snapshot
+
+    Examples:
+        >>> snap = Snapshot.download()
+        >>> snap.save("hgnc.pkl.gz")
+        >>> snap = Snapshot.load("hgnc.pkl.gz")
+        >>> snap.save("hgnc.arrow")
+        >>> snap = Snapshot.load("hgnc.arrow")     # memory-mapped
+        >>> snap.update()                           # fetch changed entries
+        >>> snap.fetch("symbol", "ZNF3")
+        >>> snap.search(symbol=["BRAF", "ZNF3"])
+        >>> snap.search("symbol:ZNF* AND status:Approved")
+        >>> snap.id_map("ensembl_gene_id", "uniprot_ids", ensembl_ids)
+    """
+    COMPLETE_SET_URL = "https://storage.googleapis.com/public-download-" \
+                       "files/hgnc/json/json/hgnc_complete_set.json"
+
+    def __init__(self,
+                 docs: List[Dict[str, Any]],
+                 last_modified: Optional[str] = None) -> None:
+        self._frame = pd.DataFrame(docs, dtype=object)
+        if last_modified is None:
+            last_modified = ""
+            if "date_modified" in self._frame.columns:
+                dates = self._frame["date_modified"].dropna()
+                if not dates.empty:
+                    last_modified = dates.max()
+        self._last_modified = last_modified
+        self._indexes = {}
+        self._sorted_keys = {}
+        self._symbol_index = None
+        self._spellings = {}
+        self._fuzzy_index = None
+        self._id_tables = {}
+
+    @classmethod
+    def _from_frame(cls,
+                    frame: pd.DataFrame,
+                    last_modified: str) -> "Snapshot":
+        """Create a snapshot from an existing dataframe.
+
+        Args:
+            frame (pd.DataFrame): HGNC entries
+            last_modified (str): modification date of the snapshot
+
+        Returns:
+            Snapshot
+        """
+        snap = cls([], last_modified)
+        snap._frame = frame
+        return snap
+
+    @classmethod
+    def download(cls,
+                 url: str = COMPLETE_SET_URL,
+                 client: Optional[Client] = None) -> "Snapshot":
+        """Download the HGNC complete set and create a snapshot from it.
+
+        Args:
+            url (str): URL of the complete set in json format
+            client (Optional[Client]): pooled client used to perform the
+                call (default: the shared default client)
+
+        Returns:
+            Snapshot
+        """
+        client = client or get_default_client()
+        return cls(_response_docs(client.get(url, use_cache=False), url))
+
+    @classmethod
+    def from_json(cls, path: str) -> "Snapshot":
+        """Create a snapshot from a local copy of the HGNC complete set.
+
+        Args:
+            path (str): path of the complete set in json format
+                (optionally gzipped)
+
+        Returns:
+            Snapshot
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            resp = json.load(f)
+        return cls(resp.get("response", {}).get("docs", []))
+
+    @classmethod
+    def load(cls, path: str, memory_map: bool = True) -> "Snapshot":
+        """Load a snapshot previously stored with ``save()``.
+
+        Parquet and Arrow IPC files are loaded as Arrow-backed columns; 
+        Arrow IPC files are memory-mapped (unless ``memory_map`` is 
+        False), so that processes loading the same file share its pages 
+        instead of each parsing a copy.
+
+        Args:
+            path (str): path of the stored snapshot
+            memory_map (bool): memory-map Parquet and Arrow IPC files 
+                (default: True)
+
+        Returns:
+            Snapshot
+        """
+        if table_format(path) is not None:
+            frame, metadata = _read(path, memory_map)
+            return cls._from_frame(frame, metadata.get("last_modified", ""))
+        data = pd.read_pickle(path)
+        return cls._from_frame(data["frame"], data["last_modified"])
+
+    def save(self, path: str) -> None:
+        """Store the snapshot to disk.
+
+        The format is inferred from the file extension: ".parquet" and 
+        ".arrow" (or ".feather") store a Parquet or Arrow IPC table 
+        (requires pyarrow); any other extension stores a pickle, 
+        compressed according to the extension (e.g. ".gz"). The file is 
+        replaced atomically, so that processes that memory-mapped the 
+        previous version are not affected.
+
+        Args:
+            path (str): destination path
+        """
+        folder, name = os.path.split(path)
+        tmp = os.path.join(folder, ".{}-{}".format(os.getpid(), name))
+        if table_format(path) is not None:
+            write_table(self._frame, tmp,
+                        {"last_modified": self._last_modified})
+        else:
+            pd.to_pickle({"frame": self._frame,
+                          "last_modified": self._last_modified}, tmp)
+        os.replace(tmp, path)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Return all the entries of the snapshot.
+
+        Returns:
+            pd.DataFrame
+        """
+        return self._frame
+
+    @property
+    def last_modified(self) -> str:
+        """Return the modification date of the snapshot.
+
+        Returns:
+            str
+        """
+        return self._last_modified
+
+    def patch(self, docs: List[Dict[str, Any]]) -> None:
+        """Replace or add the given entries, matched by hgnc_id.
+
+        Replaced entries keep their position and new entries are 
+        appended, so that the field indexes already built are patched 
+        in place; sorted keys, symbol, suggestion and identifier mapping 
+        tables are rebuilt on next use.
+
+        Args:
+            docs (List[Dict[str, Any]]): HGNC entries, as returned in the 
+                ``docs`` of a fetch request
+        """
+        if not docs:
+            return
+        size = len(self._frame)
+        positions = {}
+        if "hgnc_id" in self._frame.columns:
+            positions = {hgnc_id: pos for pos, hgnc_id
+                         in enumerate(self._frame["hgnc_id"])}
+        rows, added = [], size
+        for doc in docs:
+            hgnc_id = doc.get("hgnc_id")
+            if hgnc_id not in positions:
+                positions[hgnc_id] = added
+                added += 1
+            rows.append(positions[hgnc_id])
+        new = pd.DataFrame(docs, index=rows, dtype=object)
+        new = new[~new.index.duplicated(keep="last")]
+        frame = _object_frame(self._frame)
+        replaced = [pos for pos in new.index if pos < size]
+        for field, index in self._indexes.items():
+            if field in frame.columns:
+                values = frame[field].values
+                for pos in replaced:
+                    _unindex(index, pos, values[pos])
+        frame = pd.concat([frame, new], sort=False)
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        self._frame = frame.reset_index(drop=True)
+        for field, index in self._indexes.items():
+            if field in self._frame.columns:
+                values = self._frame[field].values
+                for pos in new.index:
+                    for item in _values(values[pos]):
+                        index.setdefault(_key(item), []).append(pos)
+        self._sorted_keys = {}
+        self._symbol_index = None
+        self._fuzzy_index = None
+        self._id_tables = {}
+
+    def _changed(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the given entries that are new or differ from the 
+        snapshot, matched by hgnc_id.
+
+        Args:
+            docs (List[Dict[str, Any]]): HGNC entries, as returned in the 
+                ``docs`` of a fetch request
+
+        Returns:
+            List[Dict[str, Any]]
+        """
+        frame = _object_frame(self._frame)
+        current = {}
+        if "hgnc_id" in frame.columns:
+            rows = frame.to_dict("records")
+            current = {row["hgnc_id"]: _canonical(row) for row in rows}
+        return [doc for doc in docs
+                if current.get(doc.get("hgnc_id")) != _canonical(doc)]
+
+    def update(self,
+               client: Optional[Client] = None,
+               host: Optional[str] = None,
+               url: str = COMPLETE_SET_URL) -> int:
+        """Bring the snapshot up to date with HGNC, incrementally.
+
+        HGNC cannot be searched by modification date, so if its 
+        ``lastModified`` date is newer than the one of the snapshot, the 
+        complete set is downloaded and compared with the snapshot: only 
+        the entries that are new or differ are patched into the snapshot 
+        with ``patch()``, so that the indexes already built are kept. The 
+        modification date of the snapshot is advanced only once the 
+        download succeeded.
+
+        Args:
+            client (Optional[Client]): pooled client used to perform the 
+                calls (default: the shared default client)
+            host (Optional[str]): base URL of the HGNC REST service 
+                (default: http://rest.genenames.org/)
+            url (str): URL of the complete set in json format
+
+        Returns:
+            int: number of entries replaced or added
+
+        Example:
+            >>> snap = Snapshot.load("hgnc.arrow")
+            >>> if snap.update():
+            ...     snap.save("hgnc.arrow")
+        """
+        from .classes import Info
+        client = client or get_default_client()
+        info = Info(client=client, ttl=0, host=host)
+        latest = info.lastModified
+        if not latest:
+            raise ValueError("invalid info response from {}: {}".format(
+                info.url, info.response))
+        if self._last_modified \
+                and _timestamp(latest) <= _timestamp(self._last_modified):
+            return 0
+        docs = _response_docs(client.get(url, use_cache=False), url)
+        changed = self._changed(docs)
+        self.patch(changed)
+        self._last_modified = latest
+        return len(changed)
+
+    def index(self, field: str) -> Dict[str, List[int]]:
+        """Return the index of the given searchable field.
+
+        The index maps each (lowercase) value of the field to the
+        positions of the entries holding it.
+
+        Args:
+            field (str): HGNC searchable field
+
+        Returns:
+            Dict[str, List[int]]
+        """
+        if field not in SEARCHABLE_FIELDS:
+            raise ValueError("{} is not a searchable field".format(field))
+        if field not in self._indexes:
+            index = defaultdict(list)
+            if field in self._frame.columns:
+                for pos, value in enumerate(self._frame[field].values):
+                    for item in _values(value):
+                        index[_key(item)].append(pos)
+            self._indexes[field] = dict(index)
+        return self._indexes[field]
+
+    def sorted_keys(self, field: str) -> List[str]:
+        """Return the sorted keys of the index of a field.
+
+        Sorted keys are used to find the values starting with a prefix 
+        by binary search, and are kept for the lifetime of the snapshot.
+
+        Args:
+            field (str): HGNC searchable field
+
+        Returns:
+            List[str]
+        """
+        if field not in self._sorted_keys:
+            self._sorted_keys[field] = sorted(self.index(field))
+        return self._sorted_keys[field]
+
+    def _wildcard(self, field: str, pattern: str) -> set:
+        """Return the positions of entries matching a wildcard term.
+
+        The characters before the first wildcard select a slice of the 
+        sorted keys of the field by binary search; the rest of the 
+        pattern is only checked on the keys in that slice.
+
+        Args:
+            field (str): HGNC searchable field
+            pattern (str): term with "*" and/or "?" wildcards
+
+        Returns:
+            set
+        """
+        pattern = _key(pattern)
+        prefix = re.split(r"[*?]", pattern, 1)[0]
+        keys = self.sorted_keys(field)
+        start = bisect.bisect_left(keys, prefix)
+        stop = bisect.bisect_left(keys, prefix + "\U0010ffff") \
+            if prefix else len(keys)
+        index = self.index(field)
+        positions = set()
+        if pattern == prefix + "*":
+            for key in keys[start:stop]:
+                positions.update(index[key])
+            return positions
+        regex = wildcard_regex(pattern)
+        for key in keys[start:stop]:
+            if regex.match(key):
+                positions.update(index[key])
+        return positions
+
+    def _term(self,
+              field: Optional[str],
+              term: Union[str, int],
+              quoted: bool = False) -> set:
+        """Return the positions of entries matching a single term.
+
+        Args:
+            field (Optional[str]): HGNC searchable field, or None to 
+                look up all searchable fields
+            term (Union[str,int]): exact value, range or wildcard term
+            quoted (bool): match the term literally (default: False)
+
+        Returns:
+            set
+        """
+        if field is None:
+            positions = set()
+            for name in SEARCHABLE_FIELDS:
+                positions |= self._term(name, term, quoted)
+            return positions
+        if field not in SEARCHABLE_FIELDS:
+            raise ValueError("{} is not a searchable field".format(field))
+        if not quoted:
+            bounds = _RANGE.match(str(term))
+            if bounds is not None:
+                return self._range(field, *bounds.groups())
+            if is_wildcard(str(term)):
+                return self._wildcard(field, str(term))
+        return set(self.index(field).get(_key(term), []))
+
+    def _lookup(self, field: str, terms: List[Union[str, int]]) -> set:
+        """Return the positions of entries matching any of the terms.
+
+        Args:
+            field (str): HGNC searchable field
+            terms (List[Union[str,int]]): terms to look up
+
+        Returns:
+            set
+        """
+        positions = set()
+        for term in terms:
+            positions |= self._term(field, term)
+        return positions
+
+    def query_positions(self,
+                        query: str,
+                        field: Optional[str] = None) -> List[int]:
+        """Return the positions of the entries matching a Solr query.
+
+        The query is parsed with ``parse_query()`` and evaluated locally 
+        with set operations: exact terms are looked up in the field 
+        indexes, wildcard terms in their sorted keys and ranges by 
+        comparing values. As on HGNC, every form of term is only allowed 
+        on searchable fields.
+
+        Args:
+            query (str): Solr-style query, such as the ones composed 
+                by ``Search``
+            field (Optional[str]): field of the terms without one 
+                (default: None, i.e. all searchable fields)
+
+        Returns:
+            List[int]
+
+        Example:
+            >>> snap.query_positions("symbol:ZNF* AND status:Approved")
+        """
+        if field is not None and field not in SEARCHABLE_FIELDS:
+            raise ValueError("{} is not a searchable field".format(field))
+        fields = set(SEARCHABLE_FIELDS) | set(self._frame.columns)
+        tree = parse_query(str(query), field, fields)
+        positions = evaluate(tree, self._term,
+                             lambda: set(range(len(self))))
+        return sorted(positions)
+
+    def _range(self, field: str, low: str, high: str) -> set:
+        """Return the positions of entries with a value within a range.
+
+        Values are compared as strings.
+
+        Args:
+            field (str): HGNC searchable field
+            low (str): lower bound (inclusive), or "*"
+            high (str): upper bound (inclusive), or "*"
+
+        Returns:
+            set
+        """
+        positions = set()
+        if field not in self._frame.columns:
+            return positions
+        for pos, value in enumerate(self._frame[field].values):
+            for item in _values(value):
+                item = str(item)
+                if (low == "*" or item >= low) \
+                        and (high == "*" or item <= high):
+                    positions.add(pos)
+        return positions
+
+    def docs(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """Return the entries at the given positions, as HGNC returns them.
+
+        Args:
+            positions (List[int]): positions of the entries
+
+        Returns:
+            List[Dict[str, Any]]
+        """
+        rows = self._frame.iloc[positions].to_dict("records")
+        return [{k: v for k, v in row.items() if not _is_missing(v)}
+                for row in rows]
+
+    def _records(self, positions: List[int]) -> pd.DataFrame:
+        """Return the entries at the given positions, as a fetch would.
+
+        Args:
+            positions (List[int]): positions of the entries
+
+        Returns:
+            pd.DataFrame
+        """
+        return pd.DataFrame.from_records(self.docs(positions))
+
+    def fetch(self, field: str, term: Union[str, int]) -> pd.DataFrame:
+        """Retrieve the entries matching the given field and term.
+
+        Args:
+            field (str): HGNC searchable field
+            term (Union[str,int]): query term
+
+        Returns:
+            pd.DataFrame
+
+        Example:
+            >>> snap.fetch("symbol", "ZNF3")
+        """
+        return self._records(self.fetch_positions(field, term))
+
+    def fetch_positions(self, field: str, term: Union[str, int]) -> List[int]:
+        """Return the positions of the entries matching a fetch request.
+
+        As with HGNC fetch requests, the term is matched literally, 
+        without wildcards.
+
+        Args:
+            field (str): HGNC searchable field
+            term (Union[str,int]): query term
+
+        Returns:
+            List[int]
+        """
+        return sorted(self._term(field, term, quoted=True))
+
+    def search_positions(self, *args, **kwargs) -> List[int]:
+        """Return the positions of the entries matching a search request.
+
+        Takes the same arguments as ``search()``.
+
+        Returns:
+            List[int]
+        """
+        if len(args) == 1:
+            return self.query_positions(args[0])
+        if len(args) == 2:
+            return self.query_positions(args[1], args[0])
+        positions = None
+        for field, terms in kwargs.items():
+            if not isinstance(terms, list):
+                terms = [terms]
+            found = self._lookup(field, terms)
+            positions = found if positions is None else positions & found
+        return sorted(positions or set())
+
+    def search(self, *args, **kwargs) -> pd.DataFrame:
+        """Look for entries of interest, as ``Search`` would.
+
+        Positional terms are Solr-style queries, evaluated locally (see 
+        ``query_positions()``); keyword terms may hold "*" and "?" 
+        wildcards. Only the hgnc_id, symbol and score fields are 
+        returned; since matches are not ranked, every score is 1.0.
+
+        Args:
+            *args: either a single query to search all searchable fields,
+                or a specific field and query to restrict the search
+            **kwargs: one or more keyword arguments with a field and a
+                string or list of strings representing the search term(s)
+
+        Returns:
+            pd.DataFrame
+
+        Examples:
+            >>> snap.search("BRAF")
+            >>> snap.search("symbol", "BRAF")
+            >>> snap.search(symbol=["BRAF", "ZNF3"], status="Approved")
+            >>> snap.search(symbol="ZNF*", status="Approved")
+            >>> snap.search("symbol:ZNF* AND NOT status:Approved")
+        """
+        positions = self.search_positions(*args, **kwargs)
+        if not positions:
+            return pd.DataFrame()
+        rows = self._frame.iloc[positions]
+        return pd.DataFrame({"hgnc_id": list(rows["hgnc_id"]),
+                             "score": [1.0] * len(rows),
+                             "symbol": list(rows["symbol"])})
+
+    @staticmethod
+    def _resolution(positions: Dict[int, str],
+                    hgnc_ids: List[str],
+                    symbols: List[str],
+                    withdrawn: List[bool]) -> Tuple:
+        """Return the resolution of a term matching the given entries.
+
+        Args:
+            positions (Dict[int, str]): matched entry positions, with the
+                field they were matched on
+            hgnc_ids (List[str]): hgnc_id of every entry
+            symbols (List[str]): symbol of every entry
+            withdrawn (List[bool]): whether every entry is withdrawn
+
+        Returns:
+            Tuple
+        """
+        current = [pos for pos in positions if not withdrawn[pos]]
+        if len(current) == 1:
+            pos = current[0]
+            return (hgnc_ids[pos], symbols[pos], positions[pos],
+                    "resolved", [symbols[pos]])
+        if current:
+            return (None, None, positions[current[0]], "ambiguous",
+                    sorted(symbols[pos] for pos in current))
+        pos = min(positions)
+        return (hgnc_ids[pos], symbols[pos], positions[pos], "withdrawn",
+                [symbols[pos]])
+
+    @classmethod
+    def _first_current(cls,
+                       fields: Dict[str, Dict[int, str]],
+                       hgnc_ids: List[str],
+                       symbols: List[str],
+                       withdrawn: List[bool]) -> Tuple:
+        """Return the resolution of a term on the first field where it 
+        matches a current entry, or on the first field at all if it only 
+        matches withdrawn entries.
+
+        Args:
+            fields (Dict[str, Dict[int, str]]): matched entry positions 
+                on each field, in lookup order
+            hgnc_ids (List[str]): hgnc_id of every entry
+            symbols (List[str]): symbol of every entry
+            withdrawn (List[bool]): whether every entry is withdrawn
+
+        Returns:
+            Tuple
+        """
+        for positions in fields.values():
+            if not all(withdrawn[pos] for pos in positions):
+                return cls._resolution(positions, hgnc_ids, symbols,
+                                       withdrawn)
+        return cls._resolution(next(iter(fields.values())), hgnc_ids,
+                               symbols, withdrawn)
+
+    def symbol_index(self) -> Tuple[Dict[str, Tuple], Dict[str, Tuple]]:
+        """Return the inverted indexes used to resolve gene symbols.
+
+        The first index maps exact symbols, the second one lowercase 
+        symbols, to their resolution. Symbols are looked up in the 
+        symbol, prev_symbol and alias_symbol fields, in this order: a 
+        term is matched on the first field where it belongs to a current 
+        entry, and only falls back to withdrawn entries when no current 
+        entry holds it.
+
+        Returns:
+            Tuple[Dict[str, Tuple], Dict[str, Tuple]]
+        """
+        if self._symbol_index is None:
+            spellings = {}
+            hgnc_ids = list(self._frame["hgnc_id"])
+            symbols = list(self._frame["symbol"])
+            withdrawn = [False] * len(self)
+            if "status" in self._frame.columns:
+                withdrawn = ["withdrawn" in str(status).lower()
+                             for status in self._frame["status"]]
+            args = (hgnc_ids, symbols, withdrawn)
+            found_exact, found_lower = defaultdict(dict), defaultdict(dict)
+            for field in _SYMBOL_FIELDS:
+                if field not in self._frame.columns:
+                    continue
+                for pos, value in enumerate(self._frame[field].values):
+                    for item in _values(value):
+                        item = str(item)
+                        if item.endswith(_WITHDRAWN):
+                            item = item[:-len(_WITHDRAWN)]
+                        found_exact[item].setdefault(field, {})[pos] = field
+                        found_lower[item.lower()].setdefault(
+                            field, {})[pos] = field
+                        spellings.setdefault(item.lower(), item)
+            exact = {item: self._first_current(fields, *args)
+                     for item, fields in found_exact.items()}
+            lower = {item: self._first_current(fields, *args)
+                     for item, fields in found_lower.items()}
+            self._symbol_index = (exact, lower)
+            self._spellings = spellings
+        return self._symbol_index
+
+    def id_table(self, from_field: str, to_field: str) -> pd.DataFrame:
+        """Return the lookup table mapping values of a field to another.
+
+        The table holds one row per pair of values found in the same 
+        entry (list-valued fields are exploded, missing values dropped), 
+        plus a ``key`` column with the lowercase ``from_field`` value. 
+        Pairs are extracted once for both directions, and each direction 
+        is kept for the lifetime of the snapshot.
+
+        Args:
+            from_field (str): HGNC field of the input identifiers
+            to_field (str): HGNC field of the output identifiers
+
+        Returns:
+            pd.DataFrame
+        """
+        if (from_field, to_field) not in self._id_tables:
+            for field in (from_field, to_field):
+                if field not in self._frame.columns:
+                    raise ValueError("{} is not a field of the "
+                                     "snapshot".format(field))
+            if from_field == to_field:
+                raise ValueError("from_field and to_field must differ")
+            pair = tuple(sorted((from_field, to_field)))
+            if pair not in self._id_tables:
+                pairs = self._frame[list(pair)]
+                for field in pair:
+                    pairs = pairs.explode(field)
+                self._id_tables[pair] = pairs.dropna().drop_duplicates()\
+                    .reset_index(drop=True)
+            pairs = self._id_tables[pair]
+            keys = pairs[from_field].map(_key)
+            self._id_tables[(from_field, to_field)] = pd.DataFrame(
+                {"key": keys.values, to_field: pairs[to_field].values})
+        return self._id_tables[(from_field, to_field)]
+
+    def id_map(self,
+               from_field: str,
+               to_field: str,
+               ids: List[Union[str, int]]) -> pd.DataFrame:
+        """Map identifiers of a field to the ones of another field.
+
+        Identifiers are matched case-insensitively, with a single 
+        vectorized join against ``id_table()``. The returned dataframe 
+        has a ``from_field`` and a ``to_field`` column, with one row per 
+        mapped pair (identifiers mapping to several values, as with 
+        list-valued fields, get several rows) in input order; 
+        identifiers without a match get a single row with a missing 
+        ``to_field``.
+
+        Args:
+            from_field (str): HGNC field of the input identifiers
+            to_field (str): HGNC field of the output identifiers
+            ids (List[Union[str,int]]): identifiers to map
+
+        Returns:
+            pd.DataFrame
+
+        Examples:
+            >>> snap.id_map("hgnc_id", "ensembl_gene_id", ["HGNC:13089"])
+            >>> snap.id_map("uniprot_ids", "entrez_id", ["P15056"])
+        """
+        table = self.id_table(from_field, to_field)
+        ids = pd.Series(ids, dtype=object)
+        query = pd.DataFrame({from_field: ids.values,
+                              "key": ids.astype(str).str.lower().values})
+        df = query.merge(table, on="key", how="left", sort=False)
+        return df[[from_field, to_field]]
+
+    @staticmethod
+    def _resolve(term: str,
+                 exact: Dict[str, Tuple],
+                 lower: Dict[str, Tuple]) -> Optional[Tuple]:
+        """Return the resolution of a term, preferring exact matches 
+        unless they are withdrawn and a case-insensitive one is not.
+
+        Args:
+            term (str): gene symbol to resolve
+            exact (Dict[str, Tuple]): resolutions of exact symbols
+            lower (Dict[str, Tuple]): resolutions of lowercase symbols
+
+        Returns:
+            Optional[Tuple]
+        """
+        found = exact.get(term)
+        other = lower.get(str(term).lower())
+        if found is None:
+            return other
+        if found[3] == "withdrawn" and other is not None \
+                and other[3] != "withdrawn":
+            return other
+        return found
+
+    def resolve_symbols(self, terms: List[str]) -> pd.DataFrame:
+        """Map gene symbols, possibly outdated, to approved ones.
+
+        Each term is looked up among approved, previous and alias 
+        symbols, first exactly and then case-insensitively. The returned 
+        dataframe has one row per term, in input order, with the 
+        following columns:
+
+        * term: the input term;
+        * hgnc_id, symbol: the matched entry (missing if ambiguous or 
+          not found);
+        * match_type: the field the term was matched on (symbol, 
+          prev_symbol or alias_symbol);
+        * status: "resolved", "ambiguous" (matches several entries), 
+          "withdrawn" (only matches withdrawn entries) or "not found";
+        * candidates: symbols of all the matched entries.
+
+        Args:
+            terms (List[str]): gene symbols to resolve
+
+        Returns:
+            pd.DataFrame
+
+        Example:
+            >>> snap.resolve_symbols(["BRAF", "ERBB", "her1", "NOTAGENE"])
+        """
+        exact, lower = self.symbol_index()
+        codes, uniques = pd.factorize(
+            pd.Series(terms, dtype=object).fillna(""))
+        missing = (None, None, None, "not found", [])
+        rows = [self._resolve(term, exact, lower) or missing
+                for term in uniques]
+        table = pd.DataFrame(rows, columns=["hgnc_id", "symbol",
+                                            "match_type", "status",
+                                            "candidates"])
+        df = table.iloc[codes].reset_index(drop=True)
+        df.insert(0, "term", list(terms))
+        return df
+
+    def fuzzy_index(self, max_distance: int = 2) -> FuzzyIndex:
+        """Return the edit-distance index of the gene symbols.
+
+        The index covers the lowercase keys of ``symbol_index()``, i.e. 
+        approved, previous and alias symbols; it is built on first use 
+        (a few seconds for the complete set) and kept for the lifetime 
+        of the snapshot, unless a larger ``max_distance`` is requested.
+
+        Args:
+            max_distance (int): largest edit distance supported by the 
+                index (default: 2)
+
+        Returns:
+            FuzzyIndex
+        """
+        if self._fuzzy_index is None \
+                or self._fuzzy_index.max_distance < max_distance:
+            self._fuzzy_index = FuzzyIndex(list(self.symbol_index()[1]),
+                                           max_distance)
+        return self._fuzzy_index
+
+    def _suggestions(self,
+                     term: str,
+                     max_distance: int,
+                     limit: Optional[int]) -> List[Tuple]:
+        """Return the symbols closest to a term, with their resolution.
+
+        Args:
+            term (str): possibly misspelled gene symbol
+            max_distance (int): maximum edit distance
+            limit (Optional[int]): maximum number of suggestions
+
+        Returns:
+            List[Tuple]: suggestion, distance, hgnc_id, symbol, 
+                match_type, status and candidates of each match
+        """
+        lower = self.symbol_index()[1]
+        index = self.fuzzy_index(max_distance)
+        matches = []
+        for found, key in index.lookup(str(term).lower(), max_distance):
+            hgnc_id, symbol, field, status, candidates = lower[key]
+            matches.append((found, _SYMBOL_FIELDS.index(field), key,
+                            (hgnc_id, symbol, field, status, candidates)))
+        matches.sort(key=lambda match: match[:3])
+        return [(self._spellings[key], found) + resolution
+                for found, _, key, resolution in matches[:limit]]
+
+    def suggest(self,
+                term: str,
+                max_distance: int = 2,
+                limit: Optional[int] = 5) -> pd.DataFrame:
+        """Suggest gene symbols close to a possibly misspelled term.
+
+        The term is compared case-insensitively with approved, previous 
+        and alias symbols through ``fuzzy_index()``. The returned 
+        dataframe has one row per suggestion, from the closest one (ties 
+        broken by symbol, previous symbol and alias matches, in this 
+        order), with the columns of ``resolve_symbols()`` plus the 
+        following ones:
+
+        * suggestion: the matched symbol, as spelled in the snapshot;
+        * distance: Levenshtein distance between term and suggestion 
+          (as a nullable integer).
+
+        Args:
+            term (str): possibly misspelled gene symbol
+            max_distance (int): maximum edit distance (default: 2)
+            limit (Optional[int]): maximum number of suggestions, or 
+                None for all of them (default: 5)
+
+        Returns:
+            pd.DataFrame
+
+        Example:
+            >>> snap.suggest("BRAFF")
+        """
+        rows = [(term,) + row for row in
+                self._suggestions(term, max_distance, limit)]
+        df = pd.DataFrame(rows, columns=_SUGGESTION_COLUMNS)
+        return df.astype({"distance": "Int64"})
+
+    def suggest_many(self,
+                     terms: List[str],
+                     max_distance: int = 2,
+                     limit: Optional[int] = 5) -> pd.DataFrame:
+        """Suggest gene symbols for a whole list of terms.
+
+        Like ``suggest()``, with the rows of all the terms in input 
+        order; each distinct term is looked up once, and terms without 
+        suggestions get a single row with status "not found".
+
+        Args:
+            terms (List[str]): possibly misspelled gene symbols
+            max_distance (int): maximum edit distance (default: 2)
+            limit (Optional[int]): maximum number of suggestions per 
+                term, or None for all of them (default: 5)
+
+        Returns:
+            pd.DataFrame
+
+        Example:
+            >>> snap.suggest_many(df["gene"])
+        """
+        terms = list(terms)
+        missing = [(None, None, None, None, None, "not found", [])]
+        found = {}
+        rows = []
+        for term in terms:
+            key = "" if _is_missing(term) else str(term)
+            if key not in found:
+                found[key] = self._suggestions(key, max_distance, limit) \
+                    if key else []
+            rows.extend((term,) + row for row in found[key] or missing)
+        df = pd.DataFrame(rows, columns=_SUGGESTION_COLUMNS)
+        return df.astype({"distance": "Int64"})
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def __repr__(self) -> str:
+        return "HGNC Snapshot"
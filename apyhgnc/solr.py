@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import re
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+from .fields import SEARCHABLE_FIELDS
+
+_TOKEN = re.compile(r"""\s*(?:(?P<paren>[()])
+                           |(?P<word>(?:[^\s()":\[]+:)?
+                                     (?:"[^"]*"|\[[^\]]*\]|[^\s()]*)))""",
+                    re.VERBOSE)
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+def is_wildcard(term: str) -> bool:
+    """Return True if the given term holds a "*" or "?" wildcard.
+
+    Args:
+        term (str): query term
+
+    Returns:
+        bool
+    """
+    return "*" in term or "?" in term
+
+
+def wildcard_regex(pattern: str) -> "re.Pattern":
+    """Return the regular expression matching a wildcard term.
+
+    Args:
+        pattern (str): term where "*" matches any sequence of characters
+            and "?" any single character
+
+    Returns:
+        re.Pattern
+    """
+    parts = [".*" if char == "*" else "." if char == "?" else re.escape(char)
+             for char in pattern]
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+def _tokenize(query: str, fields: Set[str]) -> List[Tuple]:
+    """Split a query into parentheses, operators and terms.
+
+    Args:
+        query (str): Solr-style query
+        fields (Set[str]): names recognised as fields before a ":"
+
+    Returns:
+        List[Tuple]: ("(",), (")",), ("op", operator) or
+            ("term", field, value, quoted) tokens
+    """
+    tokens, pos, query = [], 0, query.strip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None or match.end() == pos:
+            raise ValueError("invalid query: {}".format(query))
+        pos = match.end()
+        if match.group("paren"):
+            tokens.append((match.group("paren"), ))
+            continue
+        word = match.group("word")
+        if word in _OPERATORS:
+            tokens.append(("op", word))
+            continue
+        field, sep, value = word.partition(":")
+        if not sep or field not in fields:
+            field, value = None, word
+        quoted = len(value) > 1 and value[0] == value[-1] == '"'
+        if quoted:
+            value = value[1:-1]
+        tokens.append(("term", field, value, quoted))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser of Solr-style queries."""
+
+    def __init__(self, tokens: List[Tuple]) -> None:
+        self._tokens = tokens
+        self._pos = 0
+
+    def _peek(self) -> Optional[Tuple]:
+        if self._pos < len(self._tokens):
+            return self._tokens[self._pos]
+        return None
+
+    def _next(self) -> Tuple:
+        token = self._peek()
+        if token is None:
+            raise ValueError("unexpected end of query")
+        self._pos += 1
+        return token
+
+    def _operator(self, name: str) -> bool:
+        if self._peek() == ("op", name):
+            self._pos += 1
+            return True
+        return False
+
+    def parse(self, field: Optional[str]) -> Tuple:
+        node = self._and(field)
+        if self._peek() is not None:
+            raise ValueError("unexpected {!r} in query".format(
+                self._peek()[-1] if self._peek()[0] != "term"
+                else self._peek()[2]))
+        return node
+
+    def _and(self, field: Optional[str]) -> Tuple:
+        nodes = [self._or(field)]
+        while self._operator("AND"):
+            nodes.append(self._or(field))
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _or(self, field: Optional[str]) -> Tuple:
+        nodes = [self._unary(field)]
+        while self._operator("OR"):
+            # terms without a field inherit the one of the previous term
+            last = nodes[-1]
+            nodes.append(self._unary(last[1] if last[0] == "term"
+                                     else field))
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _unary(self, field: Optional[str]) -> Tuple:
+        if self._operator("NOT"):
+            return ("not", self._unary(field))
+        return self._primary(field)
+
+    def _primary(self, field: Optional[str]) -> Tuple:
+        token = self._next()
+        if token == ("(", ):
+            node = self._and(field)
+            if self._next() != (")", ):
+                raise ValueError("missing closing parenthesis")
+            return node
+        if token[0] != "term":
+            raise ValueError("unexpected {!r} in query".format(token[-1]))
+        _, own, value, quoted = token
+        if own is not None and not value and not quoted:
+            if self._peek() != ("(", ):
+                raise ValueError("missing term after {}:".format(own))
+            return self._primary(own)
+        words = [value]
+        # adjacent words form a single term, since values match as a whole
+        while not quoted and self._peek() is not None \
+                and self._peek()[0] == "term" \
+                and self._peek()[1] is None and not self._peek()[3]:
+            words.append(self._next()[2])
+        return ("term", own or field, " ".join(words), quoted)
+
+
+def parse_query(query: str,
+                field: Optional[str] = None,
+                fields: Optional[Iterable[str]] = None) -> Tuple:
+    """Parse a Solr-style query, as composed by ``Search``.
+
+    The grammar covers ``field:term`` clauses (the field is optional),
+    combined with ``AND``, ``OR`` and ``NOT`` and grouped with
+    parentheses, also after a field (``symbol:(BRAF OR ZNF3)``). As in
+    the queries built by ``Search``, ``OR`` binds tighter than ``AND``
+    and a term without a field following ``OR`` keeps the field of the
+    previous term (``symbol:BRAF OR ZNF3 AND status:Approved``). Terms
+    may hold "*" and "?" wildcards, be ``[low TO high]`` ranges, or be
+    quoted to be matched literally.
+
+    Args:
+        query (str): query to parse, already unquoted
+        field (Optional[str]): field of the terms without one (default:
+            None, i.e. all searchable fields)
+        fields (Optional[Iterable[str]]): names recognised as fields
+            (default: the searchable fields)
+
+    Returns:
+        Tuple: parse tree, made of ("and", nodes), ("or", nodes),
+            ("not", node) and ("term", field, value, quoted) nodes
+
+    Example:
+        >>> parse_query("symbol:ZNF* AND status:Approved")
+    """
+    fields = set(fields or SEARCHABLE_FIELDS)
+    tokens = _tokenize(query, fields)
+    if not tokens:
+        raise ValueError("empty query")
+    return _Parser(tokens).parse(field)
+
+
+def evaluate(node: Tuple,
+             lookup: Callable[[Optional[str], str, bool], Set[int]],
+             universe: Callable[[], Set[int]]) -> Set[int]:
+    """Evaluate a parse tree with set operations.
+
+    Args:
+        node (Tuple): parse tree returned by ``parse_query()``
+        lookup (Callable[[Optional[str], str, bool], Set[int]]): function
+            returning the positions matching a field, term and whether
+            the term is quoted
+        universe (Callable[[], Set[int]]): function returning all the
+            positions, used to negate ``NOT`` clauses
+
+    Returns:
+        Set[int]
+    """
+    kind = node[0]
+    if kind == "term":
+        return lookup(*node[1:])
+    if kind == "not":
+        return universe() - evaluate(node[1], lookup, universe)
+    if kind == "or":
+        positions = set()
+        for child in node[1]:
+            positions |= evaluate(child, lookup, universe)
+        return positions
+    # evaluate negated clauses last, as differences, and stop early on an
+    # empty intersection
+    positions = None
+    children = sorted(node[1], key=lambda child: child[0] == "not")
+    for child in children:
+        if child[0] == "not" and positions is not None:
+            positions = positions - evaluate(child[1], lookup, universe)
+        else:
+            found = evaluate(child, lookup, universe)
+            positions = found if positions is None else positions & found
+        if not positions:
+            break
+    return positions
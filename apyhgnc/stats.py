@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import threading
+from typing import Dict, Any, Callable
+
+PHASES = ("wait", "network", "decode", "frame")
+COUNTERS = ("requests", "errors", "retries", "cache_hits", "cache_misses",
+            "bytes", "rows")
+
+
+class Stats:
+    """Timings and counters of the requests performed by a client.
+
+    Attach a Stats instance to a ``Client`` to record, for every request,
+    the time spent in each phase:
+
+    * wait: throttling by the rate limiter and backoff between retries;
+    * network: sending the request and downloading the response;
+    * decode: parsing the json response;
+    * frame: building the dataframe (recorded by Search and Fetch).
+
+    Bytes downloaded, retries, errors, cache hits and misses are counted
+    as well.
+    Hooks added with ``add_hook()`` are called with the name and data of
+    each event as it is recorded ("request", "error", "cache" or
+    "frame"), so that they can be forwarded to logs or tracing systems.
+    A Stats instance can be shared by several clients and threads.
+
+    Examples:
+        >>> stats = Stats()
+        >>> client = Client(stats=stats)
+        >>> Fetch("symbol", "ZNF3", client=client).query()
+        >>> stats.as_dict()
+        >>> print(stats.to_prometheus())
+        >>> stats.add_hook(lambda event, data: print(event, data))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hooks = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all the timings and counters."""
+        with self._lock:
+            self._counters = {name: 0 for name in COUNTERS}
+            self._phases = {phase: [0, 0.0, 0.0] for phase in PHASES}
+
+    def add_hook(self, hook: Callable[[str, Dict[str, Any]], Any]) -> None:
+        """Call the given function for each recorded event.
+
+        Args:
+            hook (Callable[[str, Dict[str, Any]], Any]): function called
+                with the event name and its data
+        """
+        self._hooks.append(hook)
+
+    def _time(self, phase: str, seconds: float) -> None:
+        """Add the duration of a phase; the lock must be held.
+
+        Args:
+            phase (str): name of the phase
+            seconds (float): duration of the phase
+        """
+        timing = self._phases[phase]
+        timing[0] += 1
+        timing[1] += seconds
+        timing[2] = max(timing[2], seconds)
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        """Call the hooks with the given event.
+
+        Args:
+            event (str): event name
+            data (Dict[str, Any]): event data
+        """
+        for hook in self._hooks:
+            hook(event, data)
+
+    def record_request(self,
+                       url: str,
+                       status: int,
+                       wait: float,
+                       network: float,
+                       decode: float,
+                       size: int,
+                       retries: int) -> None:
+        """Record a completed request.
+
+        Args:
+            url (str): requested URL
+            status (int): HTTP status of the response
+            wait (float): seconds spent throttling and backing off
+            network (float): seconds spent on the network
+            decode (float): seconds spent decoding the response
+            size (int): bytes downloaded
+            retries (int): number of retries needed
+        """
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["retries"] += retries
+            self._counters["bytes"] += size
+            self._time("wait", wait)
+            self._time("network", network)
+            self._time("decode", decode)
+        self._emit("request", {"url": url, "status": status, "wait": wait,
+                               "network": network, "decode": decode,
+                               "bytes": size, "retries": retries})
+
+    def record_error(self,
+                     url: str,
+                     error: BaseException,
+                     retries: int) -> None:
+        """Record a request that failed after all retries.
+
+        Args:
+            url (str): requested URL
+            error (BaseException): error raised by the request
+            retries (int): number of retries performed
+        """
+        with self._lock:
+            self._counters["errors"] += 1
+            self._counters["retries"] += retries
+        self._emit("error", {"url": url, "error": error,
+                             "retries": retries})
+
+    def record_cache(self, url: str, hit: bool) -> None:
+        """Record a cache lookup.
+
+        Args:
+            url (str): requested URL
+            hit (bool): whether the response was served from the cache
+        """
+        with self._lock:
+            self._counters["cache_hits" if hit else "cache_misses"] += 1
+        self._emit("cache", {"url": url, "hit": hit})
+
+    def record_frame(self, rows: int, seconds: float) -> None:
+        """Record the conversion of a response to a dataframe.
+
+        Args:
+            rows (int): number of rows of the dataframe
+            seconds (float): seconds spent building the dataframe
+        """
+        with self._lock:
+            self._counters["rows"] += rows
+            self._time("frame", seconds)
+        self._emit("frame", {"rows": rows, "seconds": seconds})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return all the timings and counters.
+
+        Returns:
+            Dict[str, Any]: counters, plus a "phases" item with the count,
+                total and maximum seconds of each phase
+        """
+        with self._lock:
+            data = dict(self._counters)
+            data["phases"] = {phase: {"count": count, "sum": total,
+                                      "max": longest}
+                              for phase, (count, total, longest)
+                              in self._phases.items()}
+        return data
+
+    def to_prometheus(self, prefix: str = "apyhgnc") -> str:
+        """Return all the timings and counters in Prometheus text format.
+
+        Args:
+            prefix (str): prefix of the metric names (default: "apyhgnc")
+
+        Returns:
+            str
+        """
+        data = self.as_dict()
+        lines = []
+        for name in COUNTERS:
+            metric = "{}_{}_total".format(prefix, name)
+            lines.append("# TYPE {} counter".format(metric))
+            lines.append("{} {}".format(metric, data[name]))
+        metric = "{}_phase_seconds".format(prefix)
+        lines.append("# TYPE {} summary".format(metric))
+        for phase, timing in data["phases"].items():
+            lines.append('{}_sum{{phase="{}"}} {}'.format(
+                metric, phase, timing["sum"]))
+            lines.append('{}_count{{phase="{}"}} {}'.format(
+                metric, phase, timing["count"]))
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        return "HGNC Stats"
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import json
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+IPC_EXTENSIONS = (".arrow", ".feather", ".ipc")
+_METADATA_KEY = b"apyhgnc"
+
+
+def table_format(path: str) -> Optional[str]:
+    """Return the table format matching the extension of a path.
+
+    Args:
+        path (str): path of the table
+
+    Returns:
+        Optional[str]: "parquet", "ipc", or None for other extensions
+    """
+    if path.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if path.endswith(IPC_EXTENSIONS):
+        return "ipc"
+    return None
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow, along with its IPC and Parquet modules, which are 
+    only needed to store and load tables.
+
+    Returns:
+        Any: the pyarrow module
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover
+        raise ImportError("pyarrow is required for Arrow and Parquet tables")
+    return pyarrow
+
+
+def _check_format(path: str) -> str:
+    """Make sure a table can be stored at the given path.
+
+    Args:
+        path (str): path of the table
+
+    Returns:
+        str: table format
+    """
+    fmt = table_format(path)
+    if fmt is None:
+        raise ValueError("{} is neither a Parquet ({}) nor an Arrow IPC ({}) "
+                         "file".format(path, ", ".join(PARQUET_EXTENSIONS),
+                                       ", ".join(IPC_EXTENSIONS)))
+    return fmt
+
+
+def write_table(df: pd.DataFrame,
+                path: str,
+                metadata: Optional[Dict[str, str]] = None) -> None:
+    """Store a dataframe as a Parquet or Arrow IPC file.
+
+    The format is inferred from the file extension. Arrow IPC files are
+    written uncompressed, so that they can be reopened memory-mapped
+    without copying; Parquet files are smaller but need to be decoded.
+
+    Args:
+        df (pd.DataFrame): dataframe to store, such as query results
+        path (str): destination path (".parquet" or ".arrow")
+        metadata (Optional[Dict[str, str]]): additional information to
+            store along with the table (default: None)
+
+    Example:
+        >>> write_table(Fetch("symbol", "ZNF3").query(), "znf3.arrow")
+    """
+    fmt = _check_format(path)
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        stored = dict(table.schema.metadata or {})
+        stored[_METADATA_KEY] = json.dumps(metadata).encode("utf-8")
+        table = table.replace_schema_metadata(stored)
+    if fmt == "parquet":
+        pa.parquet.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _read(path: str,
+          memory_map: bool = True) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Load a table along with the metadata stored by ``write_table()``.
+
+    Args:
+        path (str): path of the table
+        memory_map (bool): memory-map the file instead of reading it
+            (default: True)
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, str]]
+    """
+    fmt = _check_format(path)
+    pa = _pyarrow()
+    if fmt == "parquet":
+        table = pa.parquet.read_table(path, memory_map=memory_map)
+    else:
+        source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+        table = pa.ipc.open_file(source).read_all()
+    stored = (table.schema.metadata or {}).get(_METADATA_KEY)
+    metadata = json.loads(stored.decode("utf-8")) if stored else {}
+    return table.to_pandas(types_mapper=pd.ArrowDtype), metadata
+
+
+def read_table(path: str, memory_map: bool = True) -> pd.DataFrame:
+    """Load a dataframe stored with ``write_table()``.
+
+    Columns are backed by Arrow arrays (``pd.ArrowDtype``); when an Arrow
+    IPC file is memory-mapped, they point straight into the file, so that
+    several processes can share the same table without parsing or
+    copying it.
+
+    Args:
+        path (str): path of the table (".parquet" or ".arrow")
+        memory_map (bool): memory-map the file instead of reading it
+            (default: True)
+
+    Returns:
+        pd.DataFrame
+
+    Example:
+        >>> df = read_table("znf3.arrow")
+    """
+    return _read(path, memory_map)[0]
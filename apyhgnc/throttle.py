@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import time
+import random
+import asyncio
+import threading
+from typing import Optional
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by sync and async calls.
+
+    Tokens are refilled at ``rate`` per second, up to ``burst`` tokens;
+    each request consumes one token, waiting for it if the bucket is
+    empty. The same limiter can be used from threads and coroutines at
+    the same time, and shared among several clients.
+
+    Args:
+        rate (float): maximum sustained number of requests per second
+            (default: 10)
+        burst (Optional[float]): maximum number of requests allowed in a
+            burst (default: same as rate)
+
+    Examples:
+        >>> limiter = RateLimiter(rate=10)
+        >>> limiter.acquire()           # in sync code
+        >>> await limiter.aacquire()    # in async code
+    """
+
+    def __init__(self,
+                 rate: float = 10.0,
+                 burst: Optional[float] = None) -> None:
+        self._rate = rate
+        self._capacity = burst if burst is not None else rate
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Return the maximum sustained number of requests per second.
+
+        Returns:
+            float
+        """
+        return self._rate
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait before using it.
+
+        Returns:
+            float
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self._capacity,
+                               self._tokens + elapsed * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> None:
+        """Wait until a request is allowed, blocking the thread."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Wait until a request is allowed, without blocking the loop."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def __repr__(self) -> str:
+        return "HGNC RateLimiter"
+
+
+def backoff_delay(attempt: int,
+                  backoff: float,
+                  max_backoff: float = 30.0,
+                  retry_after: Optional[str] = None) -> float:
+    """Return how long to wait before retrying a failed request.
+
+    Uses exponential backoff with full jitter, unless the server asked
+    for a specific delay through a Retry-After header.
+
+    Args:
+        attempt (int): number of the failed attempt, starting from 0
+        backoff (float): base delay in seconds
+        max_backoff (float): maximum delay in seconds (default: 30)
+        retry_after (Optional[str]): value of the Retry-After header
+            (default: None)
+
+    Returns:
+        float
+    """
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), max_backoff)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
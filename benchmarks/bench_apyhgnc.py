@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+# Offline benchmarks of apyhgnc, run against a local MockHGNCServer:
+#   python benchmarks/bench_apyhgnc.py --requests 200 --latency 0.02
+import os
+import copy
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from apyhgnc import apyhgnc
+from apyhgnc.aio import AsyncHGNCClient
+from apyhgnc.classes import Fetch, _Server
+from apyhgnc.client import Client
+from apyhgnc.mock import MockHGNCServer
+from apyhgnc.schema import Schema
+from apyhgnc.snapshot import Snapshot
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                    "tests", "data", "hgnc_subset.json")
+
+
+def synthetic_docs(size):
+    """Return ``size`` distinct entries modelled on the recorded ones."""
+    with open(DATA) as f:
+        base = json.load(f)["response"]["docs"]
+    docs = []
+    for i in range(size):
+        doc = copy.deepcopy(base[i % len(base)])
+        doc["hgnc_id"] = "HGNC:{}".format(i)
+        doc["symbol"] = "GENE{}".format(i)
+        docs.append(doc)
+    return docs
+
+
+def percentiles(values):
+    """Return the 50th, 90th and 99th percentiles of the given values."""
+    values = sorted(values)
+    return [values[min(len(values) - 1, int(len(values) * q))]
+            for q in (0.5, 0.9, 0.99)]
+
+
+def report(name, total, latencies):
+    """Print throughput and latency percentiles (if measured) of a mode."""
+    if isinstance(latencies, int):
+        print("{:<22} {:>8.1f} {:>9} {:>9} {:>9}".format(
+            name, latencies / total, "-", "-", "-"))
+        return
+    p50, p90, p99 = percentiles(latencies)
+    print("{:<22} {:>8.1f} {:>9.1f} {:>9.1f} {:>9.1f}".format(
+        name, len(latencies) / total, p50 * 1000, p90 * 1000, p99 * 1000))
+
+
+def timed(query):
+    start = time.perf_counter()
+    query.query()
+    return time.perf_counter() - start
+
+
+async def atimed(semaphore, query):
+    async with semaphore:
+        start = time.perf_counter()
+        await query.aquery()
+        return time.perf_counter() - start
+
+
+def bench_sync(host, terms, client):
+    start = time.perf_counter()
+    latencies = [timed(Fetch("symbol", t, client=client, host=host))
+                 for t in terms]
+    return time.perf_counter() - start, latencies
+
+
+def bench_threads(host, terms, client, workers):
+    queries = [Fetch("symbol", t, client=client, host=host) for t in terms]
+    start = time.perf_counter()
+    latencies = apyhgnc.query_many([_Timed(q) for q in queries], workers)
+    return time.perf_counter() - start, latencies
+
+
+def bench_async(host, terms, workers):
+    async def run():
+        async with AsyncHGNCClient(host=host, concurrency=workers,
+                                   rate_limit=None,
+                                   limit_per_host=workers) as hgnc:
+            semaphore = asyncio.Semaphore(workers)
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*[
+                atimed(semaphore, hgnc.fetch_query("symbol", t))
+                for t in terms])
+            return time.perf_counter() - start, latencies
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+
+def bench_bulk(host, terms, workers):
+    async def run():
+        async with AsyncHGNCClient(host=host, concurrency=workers,
+                                   rate_limit=None,
+                                   limit_per_host=workers) as hgnc:
+            start = time.perf_counter()
+            await hgnc.fetch_many("symbol", terms)
+            return time.perf_counter() - start
+
+    loop = asyncio.new_event_loop()
+    try:
+        total = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    return total, len(terms)
+
+
+class _Timed:
+    """Query wrapper returning the time taken instead of the results."""
+
+    def __init__(self, query):
+        self._query = query
+
+    def query(self):
+        return timed(self._query)
+
+
+def bench_loop_lag(host, repeat, executor=None):
+    """Return the event loop lags (s) seen by a 1 ms ticker while large
+    fetches are decoded and converted, inline or in ``executor``."""
+    async def run():
+        lags = []
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        async with AsyncHGNCClient(host=host, rate_limit=None,
+                                   executor=executor) as hgnc:
+            task = asyncio.ensure_future(ticker())
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await hgnc.fetch("status", "Approved")
+            total = time.perf_counter() - start
+            done.set()
+            await task
+        return total, lags
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+
+def report_lag(name, total, lags):
+    p50, p90, p99 = percentiles(lags)
+    print("{:<22} {:>8.1f} {:>9.1f} {:>9.1f} {:>9.1f}".format(
+        name, total * 1000, p50 * 1000, p99 * 1000, max(lags) * 1000))
+
+
+def _serve(size, urls):
+    """Run a mock server in a separate process, so that building its
+    responses does not compete with the client for the GIL."""
+    with MockHGNCServer(Snapshot(synthetic_docs(size))) as server:
+        urls.put(server.url)
+        while True:
+            time.sleep(1)
+
+
+def bench_lag(size, repeat):
+    urls = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(size, urls),
+                                      daemon=True)
+    process.start()
+    try:
+        host = urls.get()
+        print()
+        print("{:<22} {:>8} {:>9} {:>9} {:>9}".format(
+            "loop lag ({} docs)".format(size), "total ms", "p50 ms",
+            "p99 ms", "max ms"))
+        report_lag("inline", *bench_loop_lag(host, repeat))
+        with ThreadPoolExecutor(2) as executor:
+            report_lag("thread pool", *bench_loop_lag(host, repeat,
+                                                      executor))
+    finally:
+        process.terminate()
+
+
+def bench_frames(size, repeat=5):
+    docs = synthetic_docs(size)
+    response = {"docs": docs}
+    servers = [("default", _Server()),
+               ("typed", _Server(typed=True)),
+               ("typed arrow lists", _Server(typed=Schema(lists="arrow"))),
+               ("projected (3 fields)",
+                _Server(fields=["hgnc_id", "symbol", "ensembl_gene_id"]))]
+    print()
+    print("{:<22} {:>9} {:>9}".format("_to_frame ({} docs)".format(size),
+                                      "best ms", "MiB"))
+    for name, server in servers:
+        try:
+            best = min(_frame_time(server, response) for _ in range(repeat))
+        except ImportError:
+            continue
+        df = server._to_frame(response)
+        size_mib = df.memory_usage(deep=True).sum() / 2 ** 20
+        print("{:<22} {:>9.1f} {:>9.1f}".format(name, best * 1000, size_mib))
+
+
+def _frame_time(server, response):
+    start = time.perf_counter()
+    server._to_frame(response)
+    return time.perf_counter() - start
+
+
+def bench_suggest(size, terms=1000):
+    snap = Snapshot(synthetic_docs(size))
+    start = time.perf_counter()
+    snap.fuzzy_index()
+    build = time.perf_counter() - start
+    # misspell symbols by dropping a character and adding another one
+    queries = ["GENE{}X".format(i)[1:] for i in range(0, size, size // terms)]
+    start = time.perf_counter()
+    snap.suggest_many(queries)
+    lookup = time.perf_counter() - start
+    print()
+    print("{:<22} {:>9} {:>9}".format("suggest ({} docs)".format(size),
+                                      "build s", "ms/term"))
+    print("{:<22} {:>9.1f} {:>9.3f}".format(
+        "suggest_many", build, lookup / len(queries) * 1000))
+
+
+def bench_search(size, repeat=20):
+    snap = Snapshot(synthetic_docs(size))
+    queries = [("keywords", {"symbol": "GENE12*", "status": "Approved"}),
+               ("query", ("symbol:GENE1* AND NOT status:Approved", )),
+               ("leading wildcard", {"symbol": "*99"})]
+    print()
+    print("{:<22} {:>9} {:>9}".format("local search ({} docs)".format(size),
+                                      "best ms", "rows"))
+    for name, query in queries:
+        args, kwargs = (query, {}) if isinstance(query, tuple) \
+            else ((), query)
+        snap.search_positions(*args, **kwargs)     # build the indexes
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(snap.search_positions(*args, **kwargs))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("{:<22} {:>9.2f} {:>9}".format(name, best * 1000, rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline benchmarks of apyhgnc against a mock server.")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="number of fetch requests per mode")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="simulated server latency in seconds")
+    parser.add_argument("--workers", type=int, default=10,
+                        help="threads or concurrent requests in flight")
+    parser.add_argument("--docs", type=int, default=40000,
+                        help="number of entries converted to dataframes")
+    parser.add_argument("--lag-docs", type=int, default=5000,
+                        help="number of entries per response when "
+                             "measuring the event loop lag")
+    args = parser.parse_args()
+
+    snap = Snapshot(synthetic_docs(args.requests))
+    terms = ["GENE{}".format(i) for i in range(args.requests)]
+    with MockHGNCServer(snap, latency=args.latency) as server, \
+            Client(rate_limit=None, limit_per_host=args.workers) as client:
+        host = server.url
+        print("{} requests, {:.0f} ms latency, {} workers".format(
+            args.requests, args.latency * 1000, args.workers))
+        print("{:<22} {:>8} {:>9} {:>9} {:>9}".format(
+            "mode", "req/s", "p50 ms", "p90 ms", "p99 ms"))
+        report("sync sequential", *bench_sync(host, terms, client))
+        report("sync threads", *bench_threads(host, terms, client,
+                                              args.workers))
+        report("async gather", *bench_async(host, terms, args.workers))
+        report("async fetch_many", *bench_bulk(host, terms, args.workers))
+    bench_lag(args.lag_docs, 5)
+    bench_frames(args.docs)
+    bench_suggest(args.docs)
+    bench_search(args.docs)
+
+
+if __name__ == "__main__":
+    main()
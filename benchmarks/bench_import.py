@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+# Import-time benchmark of apyhgnc, failing if startup exceeds a budget:
+#   python benchmarks/bench_import.py --budget 150
+import sys
+import argparse
+import subprocess
+
+STATEMENTS = [("import apyhgnc", 50.0),
+              ("from apyhgnc import Info", 150.0),
+              ("from apyhgnc import Fetch", 150.0),
+              ("from apyhgnc import Snapshot", 600.0)]
+# recent pandas releases import pyarrow themselves; pyarrow.parquet is
+# only loaded by apyhgnc when tables are stored or loaded
+HEAVY = ("pandas", "aiohttp", "requests", "pyarrow", "pyarrow.parquet")
+
+
+def import_time(statement, repeat):
+    """Return the best time (ms) of a statement and the heavy modules
+    it loaded, each run in a fresh interpreter."""
+    code = ("import sys, time; s = time.perf_counter(); {}; "
+            "e = time.perf_counter(); "
+            "print((e - s) * 1000, *[m for m in {!r} if m in sys.modules])"
+            ).format(statement, HEAVY)
+    best, loaded = None, []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             stdout=subprocess.PIPE,
+                             universal_newlines=True).stdout.split()
+        elapsed, loaded = float(out[0]), out[1:]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import-time benchmark of apyhgnc.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="fresh interpreters per statement")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="budget in ms for every statement (default: "
+                             "a budget per statement)")
+    args = parser.parse_args()
+
+    over = False
+    print("{:<28} {:>8} {:>8}  {}".format("statement", "ms", "budget",
+                                          "heavy modules"))
+    for statement, budget in STATEMENTS:
+        budget = args.budget or budget
+        elapsed, loaded = import_time(statement, args.repeat)
+        over = over or elapsed > budget
+        print("{:<28} {:>8.1f} {:>8.1f}  {}".format(
+            statement, elapsed, budget, ", ".join(loaded) or "-"))
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,11 @@ with open("README.rst") as readme_file:
 with open("HISTORY.rst") as history_file:
     history = history_file.read()
 
-requirements = ["requests>=2.21", "pandas>=0.24.2", "asyncio>=3.4.3",
-                "aiohttp>=3.5.4"]
+requirements = ["requests>=2.21", "pandas>=1.5", "numpy>=1.20.3",
+                "asyncio>=3.4.3", "aiohttp>=3.5.4"]
+
+extra_requirements = {"arrow": ["pyarrow>=6.0"],
+                      "orjson": ["orjson>=3.0"]}
 
 setup_requirements = ["pytest-runner", ]
 
@@ -25,12 +28,14 @@ setup(  # pragma: no cover
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
     description="Async pythonic interface to HGNC.",
     install_requires=requirements,
+    extras_require=extra_requirements,
     license="MIT license",
     long_description=readme + "\n\n" + history,
     long_description_content_type="text/x-rst",
@@ -38,6 +43,7 @@ setup(  # pragma: no cover
     keywords="apyhgnc",
     name="apyhgnc",
     packages=find_packages(include=["apyhgnc"]),
+    python_requires=">=3.8",
     setup_requires=setup_requirements,
     test_suite="tests",
     tests_require=test_requirements,
@@ -43,6 +43,17 @@ def stored_fields() -> List[str]:
     return fields
 
 
+@pytest.fixture
+def hgnc_subset_path() -> str:
+    """Return the path of a small, hand-made subset of the HGNC complete 
+    set, in json format.
+
+    Returns: 
+        str
+    """
+    return os.path.join(DATADIR, "hgnc_subset.json")
+
+
 @pytest.fixture
 def df_fetch_symbol_znf3() -> pd.DataFrame:
     """Return a dataframe with fetch results for symbol = ZNF3.
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import pytest
+import asyncio
+from apyhgnc.aio import AsyncHGNCClient
+from apyhgnc.classes import Fetch
+from apyhgnc.client import Client
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def fake_aget(monkeypatch):
+    """Serve one fake entry per fetched symbol, slower for earlier ones."""
+    state = {"active": 0, "peak": 0}
+
+    async def aget(self, url, use_cache=True, convert=None):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        term = url.rsplit("/", 1)[1]
+        await asyncio.sleep(0.05 if term == "SLOW" else 0.01)
+        state["active"] -= 1
+        docs = [] if term == "NOTAGENE" \
+            else [{"hgnc_id": "HGNC:{}".format(term), "symbol": term}]
+        resp = {"response": {"numFound": len(docs), "docs": docs}}
+        return resp if convert is None else convert(resp)
+
+    monkeypatch.setattr(Client, "aget", aget)
+    return state
+
+
+class TestAsyncHGNCClient:
+
+    def test_fetch(self, fake_aget):
+        async def run():
+            async with AsyncHGNCClient() as hgnc:
+                return await hgnc.fetch("symbol", "ZNF3")
+
+        result = _run(run())
+
+        assert list(result["symbol"]) == ["ZNF3"]
+
+    def test_gather_order(self, fake_aget):
+        terms = ["SLOW", "ZNF3", "BRAF"]
+
+        async def run():
+            async with AsyncHGNCClient() as hgnc:
+                return await hgnc.gather([hgnc.fetch_query("symbol", t)
+                                          for t in terms])
+
+        result = _run(run())
+
+        assert [df.loc[0, "symbol"] for df in result] == terms
+
+    def test_concurrency(self, fake_aget):
+        async def run():
+            async with AsyncHGNCClient(concurrency=2) as hgnc:
+                return await hgnc.gather([hgnc.fetch_query("symbol", t)
+                                          for t in "ABCDEF"])
+
+        _run(run())
+
+        assert fake_aget["peak"] == 2
+
+    def test_as_completed(self, fake_aget):
+        async def run():
+            async with AsyncHGNCClient() as hgnc:
+                queries = [Fetch("symbol", t) for t in ["SLOW", "ZNF3"]]
+                return [df.loc[0, "symbol"]
+                        async for _, df in hgnc.as_completed(queries)]
+
+        result = _run(run())
+
+        assert result == ["ZNF3", "SLOW"]
+
+    def test_fetch_many(self, fake_aget):
+        async def run():
+            async with AsyncHGNCClient() as hgnc:
+                return await hgnc.fetch_many("symbol", ["ZNF3", "NOTAGENE"])
+
+        result = _run(run())
+
+        assert list(result["query_status"]) == ["found", "not found"]
+
+    def test_owned_client_closed(self):
+        async def run():
+            async with AsyncHGNCClient() as hgnc:
+                session = hgnc.client.asession
+            return session
+
+        result = _run(run())
+
+        assert result.closed
+
+    def test_repr(self):
+        expect = "HGNC AsyncHGNCClient"
+        result = repr(AsyncHGNCClient())
+
+        assert result == expect
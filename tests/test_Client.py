@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import gc
+import pytest
+import asyncio
+import warnings
+import requests
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from pandas.testing import assert_frame_equal
+from apyhgnc.classes import Fetch, Search
+from apyhgnc.cache import MemoryCache
+from apyhgnc.client import Client, get_default_client
+from apyhgnc.mock import MockHGNCServer
+from apyhgnc.stats import Stats
+
+
+class TestClient:
+    c = Client()
+
+    def test_session_reused(self):
+        result = self.c.session
+
+        assert result is self.c.session
+
+    def test_asession_reused(self):
+        async def sessions():
+            return self.c.asession, self.c.asession
+
+        loop = asyncio.new_event_loop()
+        first, second = loop.run_until_complete(sessions())
+        loop.run_until_complete(self.c.aclose())
+        loop.close()
+
+        assert first is second
+        assert first.closed
+
+    def test_context_manager(self):
+        with Client() as client:
+            session = client.session
+
+        assert client._session is None
+        assert session is not client.session
+
+    def test_repr(self):
+        expect = "HGNC Client"
+        result = repr(self.c)
+
+        assert result == expect
+
+
+def test_default_client_shared():
+    f = Fetch("symbol", "ZNF3")
+    s = Search("BRAF")
+
+    assert f.client is get_default_client()
+    assert s.client is f.client
+
+
+def test_explicit_client():
+    client = Client()
+    f = Fetch("symbol", "ZNF3", client=client)
+
+    assert f.client is client
+
+
+def test_fetch_with_client(hgnc_subset_path, df_fetch_symbol_znf3):
+    with MockHGNCServer(path=hgnc_subset_path) as server, \
+            Client() as client:
+        result = Fetch("symbol", "ZNF3", client=client,
+                       host=server.url).query()
+
+    assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                       check_dtype=False, check_column_type=False)
+
+
+def test_fetch_with_client_async(hgnc_subset_path, df_fetch_symbol_znf3):
+    async def run(host):
+        async with Client() as client:
+            return await Fetch("symbol", "ZNF3", client=client,
+                               host=host).aquery()
+
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        loop = asyncio.new_event_loop()
+        result = loop.run_until_complete(run(server.url))
+        loop.close()
+
+    assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                       check_dtype=False, check_column_type=False)
+
+
+def test_asession_per_loop(hgnc_subset_path):
+    async def run(client, url):
+        await client.aget(url)
+        return client.asession
+
+    client = Client(rate_limit=None)
+    with MockHGNCServer(path=hgnc_subset_path) as server, \
+            warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        url = server.url + "fetch/symbol/ZNF3"
+        loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+        first, second = [loop.run_until_complete(run(client, url))
+                         for loop in loops]
+        client.close()
+        for loop in loops:
+            loop.close()
+        gc.collect()
+
+    assert first is not second
+    assert first.closed and second.closed
+    assert not [w for w in caught
+                if issubclass(w.category, ResourceWarning)]
+
+
+def test_inflight_coalescing(monkeypatch):
+    calls = []
+
+    async def _aget(self, url, use_cache, convert):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        resp = {"response": {"numFound": 0, "docs": []}}
+        return resp, convert(resp)
+
+    async def run():
+        client = Client()
+        return await asyncio.gather(*[
+            Fetch("symbol", "ZNF3", client=client).aquery()
+            for _ in range(5)
+        ])
+
+    monkeypatch.setattr(Client, "_aget", _aget)
+    loop = asyncio.new_event_loop()
+    result = loop.run_until_complete(run())
+    loop.close()
+
+    assert len(result) == 5
+    assert calls == ["http://rest.genenames.org/fetch/symbol/ZNF3"]
+
+
+def test_memory_cache_hits():
+    cache = MemoryCache()
+    cache.invalidate("2019-08-31T00:00:00Z")
+    cache.set("http://rest.genenames.org/fetch/symbol/ZNF3",
+              {"response": {"numFound": 0, "docs": []}})
+    client = Client(cache=cache)
+    for _ in range(3):
+        Fetch("symbol", "ZNF3", client=client).query()
+
+    assert cache.hits == 3
+    assert cache.misses == 0
+
+
+def test_retry_on_server_error(monkeypatch):
+    statuses = [503, 429, 200]
+
+    def get(self, url, **kwargs):
+        resp = requests.Response()
+        resp.status_code = statuses.pop(0)
+        resp._content = b'{"response": {"numFound": 0, "docs": []}}'
+        resp._content_consumed = True
+        return resp
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    client = Client(rate_limit=None, backoff=0.01)
+    result = client.get("http://rest.genenames.org/fetch/symbol/ZNF3")
+
+    assert result == {"response": {"numFound": 0, "docs": []}}
+    assert statuses == []
+
+
+def test_retry_gives_up(monkeypatch):
+    def get(self, url, **kwargs):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    client = Client(rate_limit=None, retries=2, backoff=0.01)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://rest.genenames.org/fetch/symbol/ZNF3")
+
+
+def test_compressed(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path) as server, \
+            Client(rate_limit=None) as client:
+        resp = client.session.get(server.url + "fetch/symbol/ZNF3")
+
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.json()["response"]["numFound"] == 1
+
+
+def test_conditional_revalidation(hgnc_subset_path):
+    statuses = []
+    stats = Stats()
+    stats.add_hook(lambda event, data: statuses.append(data["status"])
+                   if event == "request" else None)
+    cache = MemoryCache(ttl=-1)
+    cache.invalidate("2019-08-31T00:00:00Z")
+    with MockHGNCServer(path=hgnc_subset_path) as server, \
+            Client(rate_limit=None, cache=cache, stats=stats) as client:
+        url = server.url + "fetch/symbol/ZNF3"
+        first = client.get(url)
+        second = client.get(url)
+
+    assert statuses == [200, 304]
+    assert second == first
+
+
+def test_async_conditional_revalidation(hgnc_subset_path):
+    statuses = []
+    stats = Stats()
+    stats.add_hook(lambda event, data: statuses.append(data["status"])
+                   if event == "request" else None)
+    cache = MemoryCache(ttl=-1)
+    cache.invalidate("2019-08-31T00:00:00Z")
+
+    async def run(client, url):
+        first = await client.aget(url)
+        second = await client.aget(url)
+        await client.aclose()
+        return first, second
+
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        client = Client(rate_limit=None, cache=cache, stats=stats)
+        loop = asyncio.new_event_loop()
+        first, second = loop.run_until_complete(
+            run(client, server.url + "fetch/symbol/ZNF3"))
+        loop.close()
+
+    assert statuses == [200, 304]
+    assert second == first
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.calls.append(fn.__name__)
+        return super().submit(fn, *args, **kwargs)
+
+
+def _aquery(client, query):
+    async def run():
+        df = await query.aquery()
+        await client.aclose()
+        return df
+
+    loop = asyncio.new_event_loop()
+    result = loop.run_until_complete(run())
+    loop.close()
+    return result
+
+
+def test_offload(hgnc_subset_path, df_fetch_symbol_znf3):
+    executor = _CountingExecutor(2)
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        client = Client(rate_limit=None, executor=executor,
+                        offload_threshold=0, offload_rows=1)
+        result = _aquery(client, Fetch("symbol", "ZNF3", client=client,
+                                       host=server.url))
+    executor.shutdown()
+
+    assert executor.calls == ["_decode"]
+    assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                       check_dtype=False, check_column_type=False)
+
+
+def test_offload_rows(hgnc_subset_path):
+    executor = _CountingExecutor(2)
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        client = Client(rate_limit=None, executor=executor,
+                        offload_rows=1)
+        result = _aquery(client, Fetch("symbol", "ZNF3", client=client,
+                                       host=server.url))
+    executor.shutdown()
+
+    assert executor.calls == ["_response_frame"]
+    assert list(result["symbol"]) == ["ZNF3"]
+
+
+def test_offload_threshold(hgnc_subset_path):
+    executor = _CountingExecutor(2)
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        client = Client(rate_limit=None, executor=executor)
+        result = _aquery(client, Fetch("symbol", "ZNF3", client=client,
+                                       host=server.url))
+    executor.shutdown()
+
+    assert executor.calls == []
+    assert list(result["symbol"]) == ["ZNF3"]
+
+
+def test_offload_process_pool():
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            Client(executor=executor)
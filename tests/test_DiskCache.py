@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import json
+import zlib
+import pytest
+import sqlite3
+from apyhgnc.cache import DiskCache
+from apyhgnc.classes import Fetch
+from apyhgnc.client import Client
+
+URL = "http://rest.genenames.org/fetch/symbol/ZNF3"
+RESPONSE = {"response": {"numFound": 1,
+                         "docs": [{"hgnc_id": "HGNC:13089",
+                                   "symbol": "ZNF3"}]}}
+
+
+@pytest.fixture
+def cache(tmp_path) -> DiskCache:
+    return DiskCache(os.path.join(str(tmp_path), "cache.sqlite"))
+
+
+class TestDiskCache:
+
+    def test_get_missing(self, cache):
+        assert cache.get(URL) is None
+
+    def test_set_get(self, cache):
+        cache.set(URL, RESPONSE)
+
+        assert cache.get(URL) == RESPONSE
+        assert len(cache) == 1
+
+    def test_persistent(self, cache):
+        cache.set(URL, RESPONSE)
+        cache.close()
+        result = DiskCache(cache.path).get(URL)
+
+        assert result == RESPONSE
+
+    def test_ttl(self, tmp_path):
+        cache = DiskCache(os.path.join(str(tmp_path), "cache.sqlite"),
+                          ttl=-1)
+        cache.set(URL, RESPONSE)
+
+        assert cache.get(URL) is None
+
+    def test_stale(self, tmp_path):
+        cache = DiskCache(os.path.join(str(tmp_path), "cache.sqlite"),
+                          ttl=-1)
+        cache.set(URL, RESPONSE, {"ETag": '"abc"'})
+        cache.set(URL + "1", RESPONSE)
+
+        assert cache.get(URL) is None
+        assert cache.stale(URL) == (RESPONSE, {"ETag": '"abc"'})
+        assert cache.stale(URL + "1") is None
+
+    def test_touch(self, tmp_path):
+        cache = DiskCache(os.path.join(str(tmp_path), "cache.sqlite"),
+                          ttl=60)
+        cache.set(URL, RESPONSE, {"ETag": '"abc"'})
+        cache._conn.execute("UPDATE responses SET stored = 0")
+        assert cache.get(URL) is None
+        cache.touch(URL)
+
+        assert cache.get(URL) == RESPONSE
+
+    def test_migrate(self, tmp_path):
+        path = os.path.join(str(tmp_path), "cache.sqlite")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE responses (url TEXT PRIMARY KEY, "
+                     "value BLOB, stored REAL, accessed REAL, size INTEGER)")
+        conn.commit()
+        conn.close()
+        cache = DiskCache(path)
+        cache.set(URL, RESPONSE, {"ETag": '"abc"'})
+
+        assert cache.get(URL) == RESPONSE
+
+    def test_lru_eviction(self, tmp_path):
+        size = len(zlib.compress(json.dumps(RESPONSE).encode("utf-8")))
+        cache = DiskCache(os.path.join(str(tmp_path), "cache.sqlite"),
+                          max_size=2 * size)
+        cache.set(URL + "1", RESPONSE)
+        cache.set(URL + "2", RESPONSE)
+        cache.get(URL + "1")
+        cache.set(URL + "3", RESPONSE)
+
+        assert len(cache) == 2
+        assert cache.get(URL + "1") == RESPONSE
+        assert cache.get(URL + "2") is None
+
+    def test_eviction_running_size(self, tmp_path):
+        size = len(zlib.compress(json.dumps(RESPONSE).encode("utf-8")))
+        path = os.path.join(str(tmp_path), "cache.sqlite")
+        cache = DiskCache(path, max_size=2 * size)
+        cache.set(URL + "1", RESPONSE)
+        cache.set(URL + "1", RESPONSE)
+        cache.set(URL + "2", RESPONSE)
+
+        assert len(cache) == 2
+
+        cache.close()
+        cache = DiskCache(path, max_size=2 * size)
+        cache.set(URL + "3", RESPONSE)
+
+        assert len(cache) == 2
+        cache.clear()
+        cache.set(URL + "1", RESPONSE)
+        cache.set(URL + "2", RESPONSE)
+
+        assert len(cache) == 2
+
+    def test_invalidate(self, cache):
+        assert cache.needs_check()
+        assert not cache.invalidate("2019-08-31T00:00:00Z")
+        cache.set(URL, RESPONSE)
+        assert not cache.needs_check()
+        assert not cache.invalidate("2019-08-31T00:00:00Z")
+        assert cache.get(URL) == RESPONSE
+        assert cache.invalidate("2019-09-01T00:00:00Z")
+        assert cache.get(URL) is None
+
+    def test_repr(self, cache):
+        expect = "HGNC DiskCache"
+        result = repr(cache)
+
+        assert result == expect
+
+
+def test_client_serves_cached(cache):
+    cache.invalidate("2019-08-31T00:00:00Z")
+    cache.set(URL, RESPONSE)
+    result = Fetch("symbol", "ZNF3", client=Client(cache=cache)).query()
+
+    assert list(result["symbol"]) == ["ZNF3"]
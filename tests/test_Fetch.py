@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+import json
 import pytest
 from pandas.testing import assert_frame_equal
 from apyhgnc.classes import Fetch
+from apyhgnc.client import Client
 
 
 class TestFetch:
@@ -25,3 +27,57 @@ class TestFetch:
         result = repr(self.f)
 
         assert result == expect
+
+
+class TestFetchValidation:
+
+    def test_int_term(self):
+        expect = "http://rest.genenames.org/fetch/gene_group_id/28"
+        result = Fetch("gene_group_id", 28).url
+
+        assert result == expect
+
+    def test_invalid_field(self):
+        with pytest.raises(ValueError):
+            Fetch("symbl", "ZNF3")
+
+    def test_empty_term(self):
+        with pytest.raises(ValueError):
+            Fetch("symbol", " ")
+
+
+class TestFetchFields:
+
+    @pytest.fixture(autouse=True)
+    def fake_get(self, monkeypatch, hgnc_subset_path):
+        with open(hgnc_subset_path) as f:
+            resp = json.load(f)
+
+        def get(self, url, use_cache=True):
+            return resp
+
+        monkeypatch.setattr(Client, "get", get)
+
+    def test_fields(self):
+        fields = ["hgnc_id", "symbol", "ensembl_gene_id"]
+        result = Fetch("symbol", "ZNF3", fields=fields).query()
+
+        assert list(result.columns) == fields
+        assert len(result) == 8
+
+    def test_fields_missing(self):
+        result = Fetch("symbol", "ZNF3", fields=["symbol", "lncipedia"]).query()
+
+        assert list(result.columns) == ["symbol", "lncipedia"]
+        assert result["lncipedia"].isna().all()
+
+    def test_fields_typed(self):
+        result = Fetch("symbol", "ZNF3", typed=True,
+                       fields=["symbol", "entrez_id"]).query()
+
+        assert list(result.columns) == ["symbol", "entrez_id"]
+        assert result["entrez_id"].dtype == "Int64"
+
+    def test_invalid_fields(self):
+        with pytest.raises(ValueError, match="did you mean symbol"):
+            Fetch("symbol", "ZNF3", fields=["symbl"])
@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+import os
+import time
 import pytest
+import asyncio
+from apyhgnc import apyhgnc
 from apyhgnc.classes import Info
+from apyhgnc.client import Client
 
 
 class TestInfo:
@@ -29,3 +34,64 @@ class TestInfo:
         result = repr(self.i)
 
         assert result == expect
+
+
+class TestInfoCache:
+    resp = {"lastModified": "2019-08-08T00:00:00Z", "numDoc": 8,
+            "searchableFields": ["symbol"], "storedFields": ["symbol"]}
+
+    @pytest.fixture(autouse=True)
+    def calls(self, monkeypatch):
+        calls = []
+
+        def get(client, url, use_cache=True):
+            calls.append(url)
+            return dict(self.resp)
+
+        async def aget(client, url, use_cache=True):
+            return get(client, url, use_cache)
+
+        Info.clear_cache()
+        monkeypatch.setattr(Client, "get", get)
+        monkeypatch.setattr(Client, "aget", aget)
+        yield calls
+        Info.clear_cache()
+
+    def test_lazy(self, calls):
+        Info()
+
+        assert calls == []
+
+    def test_shared(self, calls):
+        first = Info().lastModified
+        second = Info().numDoc
+
+        assert (first, second) == ("2019-08-08T00:00:00Z", 8)
+        assert len(calls) == 1
+
+    def test_ttl(self, calls):
+        i = Info(ttl=0)
+        i.lastModified
+        time.sleep(0.01)
+        i.lastModified
+
+        assert len(calls) == 2
+
+    def test_path(self, calls, tmp_path):
+        path = os.path.join(str(tmp_path), "info.json")
+        Info(path=path).numDoc
+        Info.clear_cache()
+        result = Info(path=path).numDoc
+
+        assert result == 8
+        assert len(calls) == 1
+        assert os.listdir(str(tmp_path)) == ["info.json"]
+
+    def test_ainfo(self, calls):
+        loop = asyncio.new_event_loop()
+        i = loop.run_until_complete(apyhgnc.ainfo())
+        loop.close()
+        result = i.storedFields
+
+        assert result == ["symbol"]
+        assert len(calls) == 1
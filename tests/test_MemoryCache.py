@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import pytest
+from apyhgnc.cache import MemoryCache
+
+URL = "http://rest.genenames.org/fetch/symbol/ZNF3"
+RESPONSE = {"response": {"numFound": 1,
+                         "docs": [{"hgnc_id": "HGNC:13089",
+                                   "symbol": "ZNF3"}]}}
+
+
+class TestMemoryCache:
+
+    def test_set_get(self):
+        cache = MemoryCache()
+        cache.set(URL, RESPONSE)
+
+        assert cache.get(URL) is RESPONSE
+        assert len(cache) == 1
+
+    def test_counters(self):
+        cache = MemoryCache()
+        cache.get(URL)
+        cache.set(URL, RESPONSE)
+        cache.get(URL)
+        cache.get(URL)
+
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=-1)
+        cache.set(URL, RESPONSE)
+
+        assert cache.get(URL) is None
+        assert len(cache) == 0
+
+    def test_stale(self):
+        cache = MemoryCache(ttl=-1)
+        cache.set(URL, RESPONSE, {"ETag": '"abc"'})
+
+        assert cache.get(URL) is None
+        assert cache.stale(URL) == (RESPONSE, {"ETag": '"abc"'})
+        cache.set(URL + "1", RESPONSE)
+        assert cache.stale(URL + "1") is None
+
+    def test_touch(self):
+        cache = MemoryCache(ttl=60)
+        cache.set(URL, RESPONSE, {"ETag": '"abc"'})
+        cache._entries[URL] = (RESPONSE, 0.0, {"ETag": '"abc"'})
+        assert cache.get(URL) is None
+        cache.touch(URL)
+
+        assert cache.get(URL) is RESPONSE
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set(URL + "1", RESPONSE)
+        cache.set(URL + "2", RESPONSE)
+        cache.get(URL + "1")
+        cache.set(URL + "3", RESPONSE)
+
+        assert len(cache) == 2
+        assert cache.get(URL + "1") is RESPONSE
+        assert cache.get(URL + "2") is None
+
+    def test_invalidate(self):
+        cache = MemoryCache()
+        assert cache.needs_check()
+        assert not cache.invalidate("2019-08-31T00:00:00Z")
+        cache.set(URL, RESPONSE)
+        assert not cache.needs_check()
+        assert cache.invalidate("2019-09-01T00:00:00Z")
+        assert cache.get(URL) is None
+
+    def test_repr(self):
+        expect = "HGNC MemoryCache"
+        result = repr(MemoryCache())
+
+        assert result == expect
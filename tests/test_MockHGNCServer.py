@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import pytest
+import asyncio
+from pandas.testing import assert_frame_equal
+from apyhgnc import apyhgnc
+from apyhgnc.aio import AsyncHGNCClient
+from apyhgnc.classes import Info, Fetch, Search
+from apyhgnc.client import Client
+from apyhgnc.mock import MockHGNCServer
+
+
+@pytest.fixture
+def server(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        yield server
+
+
+@pytest.fixture
+def client():
+    with Client(rate_limit=None) as client:
+        yield client
+
+
+class TestMockHGNCServer:
+
+    def test_info(self, server, client):
+        Info.clear_cache()
+        result = Info(client=client, host=server.url)
+
+        assert result.numDoc == 8
+        assert result.lastModified == "2019-08-08T00:00:00Z"
+        Info.clear_cache()
+
+    def test_fetch(self, server, client, df_fetch_symbol_znf3):
+        result = Fetch("symbol", "ZNF3", client=client,
+                       host=server.url).query()
+
+        assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                           check_dtype=False, check_column_type=False)
+
+    def test_search(self, server, client):
+        result = Search(symbol=["BRAF", "ZNF3"], client=client,
+                        host=server.url).query()
+
+        assert list(result["symbol"]) == ["BRAF", "ZNF3"]
+        assert list(result.columns) == ["hgnc_id", "score", "symbol"]
+
+    def test_search_field(self, server, client):
+        result = Search("alias_symbol", "BRAF2", client=client,
+                        host=server.url).query()
+
+        assert list(result["symbol"]) == ["BRAFP1"]
+
+    def test_search_wildcard(self, server, client):
+        result = Search(symbol="ZNF*", status="Approved", client=client,
+                        host=server.url).query()
+
+        assert list(result["symbol"]) == ["ZNF3", "ZNF33A", "ZNF33B"]
+
+    def test_search_query(self, server, client):
+        result = Search("symbol:ZNF33* AND NOT symbol:ZNF33B",
+                        client=client, host=server.url).query()
+
+        assert list(result["symbol"]) == ["ZNF33A"]
+
+    def test_search_pages(self, server, client):
+        s = Search(status="Approved", client=client, host=server.url)
+        result = [len(page) for page in s.iter_query(rows=3)]
+
+        assert result == [3, 3, 1]
+
+    def test_invalid_field(self, server, client):
+        url = server.url + "fetch/symbl/ZNF3"
+        result = client.session.get(url)
+
+        assert result.status_code == 400
+
+    def test_range_not_searchable(self, server, client):
+        url = server.url + "search/date_modified:[2019-01-01 TO *]"
+        result = client.session.get(url)
+
+        assert result.status_code == 400
+
+    def test_async(self, server):
+        async def run():
+            async with AsyncHGNCClient(host=server.url,
+                                       rate_limit=None) as hgnc:
+                return await hgnc.fetch_many("symbol", ["ZNF3", "NOTAGENE"])
+
+        loop = asyncio.new_event_loop()
+        result = loop.run_until_complete(run())
+        loop.close()
+
+        assert list(result["query_status"]) == ["found", "not found"]
+
+    def test_repr(self, server):
+        expect = "HGNC MockHGNCServer"
+        result = repr(server)
+
+        assert result == expect
+
+
+def test_rate_limit(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path, rate_limit=2) as server, \
+            Client(rate_limit=None, retries=0) as client:
+        urls = [server.url + "fetch/symbol/ZNF3"] * 3
+        result = [client.session.get(url).status_code for url in urls]
+
+    assert result == [200, 200, 429]
+
+
+def test_latency(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path, latency=0.1) as server, \
+            Client(rate_limit=None) as client:
+        queries = [Fetch("symbol", "ZNF3", client=client, host=server.url)
+                   for _ in range(4)]
+        result = apyhgnc.query_many(queries, workers=4)
+
+    assert len(result) == 4
+    assert server.requests == 4
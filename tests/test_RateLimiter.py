@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import time
+import pytest
+import asyncio
+from apyhgnc.throttle import RateLimiter, backoff_delay
+
+
+class TestRateLimiter:
+
+    def test_burst(self):
+        limiter = RateLimiter(rate=5)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    def test_throttle(self):
+        limiter = RateLimiter(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+
+        assert time.monotonic() - start >= 0.19
+
+    def test_throttle_async(self):
+        limiter = RateLimiter(rate=20, burst=1)
+
+        async def run():
+            await asyncio.gather(*[limiter.aacquire() for _ in range(5)])
+
+        loop = asyncio.new_event_loop()
+        start = time.monotonic()
+        loop.run_until_complete(run())
+        loop.close()
+
+        assert time.monotonic() - start >= 0.19
+
+    def test_repr(self):
+        expect = "HGNC RateLimiter"
+        result = repr(RateLimiter())
+
+        assert result == expect
+
+
+def test_backoff_delay():
+    for attempt in range(5):
+        result = backoff_delay(attempt, 0.5, max_backoff=4)
+        assert 0 <= result <= min(4, 0.5 * 2 ** attempt)
+
+
+def test_backoff_delay_retry_after():
+    assert backoff_delay(0, 0.5, retry_after="2") == 2.0
+    assert backoff_delay(0, 0.5, max_backoff=1, retry_after="2") == 1.0
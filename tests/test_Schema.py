@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import json
+import pytest
+import pandas as pd
+from apyhgnc.classes import Fetch
+from apyhgnc.client import Client
+from apyhgnc.schema import Schema, loads
+
+
+@pytest.fixture
+def docs(hgnc_subset_path):
+    with open(hgnc_subset_path) as f:
+        return json.load(f)["response"]["docs"]
+
+
+class TestSchema:
+
+    def test_categorical(self, docs):
+        result = Schema().to_frame(docs)
+
+        for field in ["status", "locus_type", "locus_group"]:
+            assert isinstance(result[field].dtype, pd.CategoricalDtype)
+
+    def test_nullable_integer(self, docs):
+        result = Schema().to_frame(docs)
+
+        assert result["entrez_id"].dtype == "Int64"
+        assert result["entrez_id"][0] == 673
+        assert result["entrez_id"].isna().sum() == 1
+
+    def test_large_integer(self):
+        result = Schema().to_frame([{"_version_": 1630012345678901248}, {}])
+
+        assert result["_version_"][0] == 1630012345678901248
+        assert result["_version_"].isna().sum() == 1
+
+    def test_lists(self, docs):
+        result = Schema().to_frame(docs)
+
+        assert result["alias_symbol"][0] == ["BRAF1", "B-RAF1"]
+
+    def test_arrow_lists(self, docs):
+        pytest.importorskip("pyarrow")
+        result = Schema(lists="arrow").to_frame(docs)
+
+        assert isinstance(result["alias_symbol"].dtype, pd.ArrowDtype)
+        assert list(result["alias_symbol"][0]) == ["BRAF1", "B-RAF1"]
+
+    def test_arrow_lists_mixed(self):
+        pytest.importorskip("pyarrow")
+        result = Schema(lists="arrow").to_frame(
+            [{"pubmed_id": [1, "2"]}, {"pubmed_id": [3]}, {}])
+
+        assert list(result["pubmed_id"][0]) == ["1", "2"]
+        assert list(result["pubmed_id"][1]) == ["3"]
+        assert result["pubmed_id"].isna().sum() == 1
+
+    def test_explode(self, docs):
+        result = Schema(explode="uniprot_ids").to_frame(docs)
+
+        assert len(result) == len(docs) + 1
+        assert list(result.loc[result["symbol"] == "ZNF33B",
+                               "uniprot_ids"]) == ["Q06732", "A0A024R7X9"]
+
+    def test_fields(self, docs):
+        result = Schema().to_frame(docs, ["symbol", "status"])
+
+        assert list(result.columns) == ["symbol", "status"]
+        assert isinstance(result["status"].dtype, pd.CategoricalDtype)
+
+    def test_unknown_fields(self):
+        result = Schema(stored_fields=["symbol"]).to_frame(
+            [{"symbol": "BRAF", "status": "Approved"}])
+
+        assert not isinstance(result["status"].dtype, pd.CategoricalDtype)
+
+    def test_invalid_lists(self):
+        with pytest.raises(ValueError):
+            Schema(lists="numpy")
+
+    def test_repr(self):
+        expect = "HGNC Schema"
+        result = repr(Schema())
+
+        assert result == expect
+
+
+def test_loads():
+    result = loads(b'{"response": {"numFound": 0, "docs": []}}')
+
+    assert result == {"response": {"numFound": 0, "docs": []}}
+
+
+def test_fetch_typed(monkeypatch, docs):
+    def get(self, url, use_cache=True):
+        return {"response": {"numFound": 1, "docs": docs[2:3]}}
+
+    monkeypatch.setattr(Client, "get", get)
+    result = Fetch("symbol", "ZNF3", typed=True).query()
+
+    assert result["kznf_gene_catalog"].dtype == "Int64"
+    assert isinstance(result["status"].dtype, pd.CategoricalDtype)
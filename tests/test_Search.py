@@ -2,9 +2,13 @@
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
 import pytest
+import asyncio
+import urllib.parse
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from apyhgnc.classes import Search
+from apyhgnc.client import Client
+from apyhgnc.mock import MockHGNCServer
 
 
 class TestSearchAll:
@@ -112,3 +116,171 @@ class TestSearchKeywords:
         result = repr(self.s)
 
         assert result == expect
+
+
+class TestSearchKeywordChunks:
+    symbols = ["GENE{}".format(i) for i in range(1000)]
+    s = Search(symbol=symbols, status="Approved")
+
+    def test_chunks(self):
+        result = self.s._chunks
+
+        assert len(result) > 1
+        assert all(len(url) <= Search._MAX_URL_LENGTH for url in result)
+        assert all(url.startswith(Search._BASE_URL +
+                                  "search/status:Approved+AND+")
+                   for url in result)
+
+    def test_chunks_cover_terms(self):
+        result = []
+        for url in self.s._chunks:
+            query = url.split("symbol:")[1].split("+AND+")[0]
+            result.extend(query.split("+OR+"))
+
+        assert result == sorted(self.symbols)
+
+    def test_url(self):
+        expect = "http://rest.genenames.org/search/" + \
+                 "status:Approved+AND+symbol:" + \
+                 "+OR+".join(sorted(self.symbols))
+        result = self.s.url
+
+        assert result == expect
+
+    def test_merge(self):
+        responses = [
+            {"docs": [{"hgnc_id": "HGNC:1", "score": 1.0, "symbol": "A"},
+                      {"hgnc_id": "HGNC:2", "score": 3.0, "symbol": "B"}]},
+            {"docs": [{"hgnc_id": "HGNC:2", "score": 3.0, "symbol": "B"},
+                      {"hgnc_id": "HGNC:3", "score": 2.0, "symbol": "C"}]},
+        ]
+        result = Search._merge(responses)
+
+        assert [doc["hgnc_id"] for doc in result["docs"]] == \
+            ["HGNC:2", "HGNC:3", "HGNC:1"]
+        assert result["numFound"] == 3
+
+    def test_query(self, monkeypatch, hgnc_subset_path,
+                   df_search_symbols_braf_znf3):
+        with MockHGNCServer(path=hgnc_subset_path) as server:
+            # room for a single symbol per query
+            monkeypatch.setattr(Search, "_MAX_URL_LENGTH",
+                                len(server.url + "search/symbol:ZNF3") + 4)
+            s = Search(symbol=["BRAF", "ZNF3"], host=server.url)
+            result = s.query()
+
+        assert len(s._chunks) == 2
+        assert set(result["hgnc_id"]) == \
+            set(df_search_symbols_braf_znf3["hgnc_id"])
+
+    def test_query_fields(self, monkeypatch, hgnc_subset_path):
+        with MockHGNCServer(path=hgnc_subset_path) as server:
+            monkeypatch.setattr(Search, "_MAX_URL_LENGTH",
+                                len(server.url + "search/symbol:ZNF3") + 4)
+            s = Search(symbol=["ZNF*", "ZNF3"], fields=["symbol"],
+                       host=server.url)
+            result = s.query()
+
+        assert len(s._chunks) == 2
+        assert list(result.columns) == ["symbol"]
+        assert list(result["symbol"]) == ["ZNF3", "ZNF33A", "ZNF33B"]
+
+
+class TestSearchValidation:
+
+    def test_canonical_url(self):
+        first = Search(symbol=["ZNF3", "BRAF", " BRAF"], status="Approved")
+        second = Search(status=["Approved"], symbol=["BRAF", "ZNF3"])
+
+        assert first.url == second.url
+
+    def test_invalid_field(self):
+        with pytest.raises(ValueError, match="did you mean symbol"):
+            Search(symbl="BRAF")
+
+    def test_invalid_field_args(self):
+        with pytest.raises(ValueError):
+            Search("symbl", "BRAF")
+
+    def test_empty_terms(self):
+        with pytest.raises(ValueError):
+            Search(symbol=[])
+
+    def test_no_terms(self):
+        with pytest.raises(ValueError):
+            Search()
+
+
+def _paged_get(self, url, use_cache=True):
+    """Serve 5 fake results, paginated according to start and rows."""
+    params = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    start, rows = int(params["start"][0]), int(params["rows"][0])
+    docs = [{"hgnc_id": "HGNC:{}".format(i), "score": 1.0,
+             "symbol": "GENE{}".format(i)} for i in range(5)]
+    return {"response": {"numFound": 5, "docs": docs[start:start + rows]}}
+
+
+class TestSearchPages:
+    s = Search(status="Approved")
+
+    def test_iter_query(self, monkeypatch):
+        monkeypatch.setattr(Client, "get", _paged_get)
+        result = list(self.s.iter_query(rows=2))
+
+        assert [len(page) for page in result] == [2, 2, 1]
+        assert list(pd.concat(result)["symbol"]) == \
+            ["GENE{}".format(i) for i in range(5)]
+
+    def test_iter_query_fields(self, monkeypatch):
+        monkeypatch.setattr(Client, "get", _paged_get)
+        s = Search(status="Approved", fields=["symbol"])
+        result = next(s.iter_query(rows=2, records=True))
+
+        assert result == [{"symbol": "GENE0"}, {"symbol": "GENE1"}]
+
+    def test_query_fields(self, monkeypatch):
+        def get(self, url, use_cache=True):
+            terms = url.split("symbol:")[1].split("+OR+")
+            docs = [{"hgnc_id": "HGNC:" + t, "score": 1.0, "symbol": t}
+                    for t in terms]
+            return {"response": {"numFound": len(docs), "docs": docs}}
+
+        monkeypatch.setattr(Search, "_MAX_URL_LENGTH", 80)
+        monkeypatch.setattr(Client, "get", get)
+        s = Search(symbol=["GENE{}".format(i) for i in range(10)],
+                   fields=["symbol"])
+        result = s.query()
+
+        assert len(s._chunks) > 1
+        assert list(result.columns) == ["symbol"]
+        assert len(result) == 10
+
+    def test_iter_query_records(self, monkeypatch):
+        monkeypatch.setattr(Client, "get", _paged_get)
+        result = next(self.s.iter_query(rows=2, records=True))
+
+        assert result == [{"hgnc_id": "HGNC:0", "score": 1.0,
+                           "symbol": "GENE0"},
+                          {"hgnc_id": "HGNC:1", "score": 1.0,
+                           "symbol": "GENE1"}]
+
+    def test_aiter_query(self, monkeypatch):
+        async def aget(self, url, use_cache=True):
+            return _paged_get(self, url)
+
+        async def run():
+            return [page async for page in self.s.aiter_query(rows=3)]
+
+        monkeypatch.setattr(Client, "aget", aget)
+        loop = asyncio.new_event_loop()
+        result = loop.run_until_complete(run())
+        loop.close()
+
+        assert [len(page) for page in result] == [3, 2]
+
+    def test_page_url(self):
+        expect = "http://rest.genenames.org/search/status:Approved" \
+                 "?start=10&rows=5"
+        result = Search._page_url(self.s.url, 10, 5)
+
+        assert result == expect
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import copy
+import json
+import pytest
+from pandas.testing import assert_frame_equal
+from apyhgnc import apyhgnc
+from apyhgnc.client import Client
+from apyhgnc.mock import MockHGNCServer
+from apyhgnc.snapshot import Snapshot
+
+
+@pytest.fixture
+def snap(hgnc_subset_path) -> Snapshot:
+    return Snapshot.from_json(hgnc_subset_path)
+
+
+class TestSnapshot:
+
+    def test_len(self, snap):
+        assert len(snap) == 8
+
+    def test_last_modified(self, snap):
+        expect = "2019-08-08T00:00:00Z"
+        result = snap.last_modified
+
+        assert result == expect
+
+    def test_fetch(self, snap, df_fetch_symbol_znf3):
+        result = snap.fetch("symbol", "ZNF3")
+
+        assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                           check_dtype=False, check_column_type=False)
+
+    def test_fetch_case_insensitive(self, snap):
+        result = snap.fetch("symbol", "znf3")
+
+        assert list(result["hgnc_id"]) == ["HGNC:13089"]
+
+    def test_fetch_list_field(self, snap):
+        result = snap.fetch("prev_symbol", "ZNF33")
+
+        assert list(result["symbol"]) == ["ZNF33A", "ZNF33B"]
+
+    def test_fetch_int_field(self, snap):
+        result = snap.fetch("gene_group_id", 28)
+
+        assert list(result["symbol"]) == ["ZNF3"]
+
+    def test_fetch_missing(self, snap):
+        result = snap.fetch("symbol", "NOTAGENE")
+
+        assert result.empty
+
+    def test_fetch_invalid_field(self, snap):
+        with pytest.raises(ValueError):
+            snap.fetch("symbl", "ZNF3")
+
+    def test_search_all(self, snap):
+        result = snap.search("BRAF2")
+
+        assert list(result["symbol"]) == ["BRAF", "BRAFP1"]
+        assert list(result.columns) == ["hgnc_id", "score", "symbol"]
+
+    def test_search_field(self, snap):
+        result = snap.search("alias_symbol", "BRAF2")
+
+        assert list(result["symbol"]) == ["BRAFP1"]
+
+    def test_search_keywords(self, snap):
+        result = snap.search(symbol=["BRAF", "ZNF3", "OLDGENE~withdrawn"],
+                             status="Approved")
+
+        assert list(result["symbol"]) == ["BRAF", "ZNF3"]
+
+    def test_save_load(self, snap, tmp_path):
+        path = os.path.join(str(tmp_path), "hgnc.pkl.gz")
+        snap.save(path)
+        result = Snapshot.load(path)
+
+        assert_frame_equal(result.frame, snap.frame)
+        assert result.last_modified == snap.last_modified
+
+    def test_repr(self, snap):
+        expect = "HGNC Snapshot"
+        result = repr(snap)
+
+        assert result == expect
+
+
+def test_snapshot_from_path(hgnc_subset_path):
+    result = apyhgnc.snapshot(hgnc_subset_path)
+
+    assert len(result) == 8
+
+
+def test_snapshot_update_complete_set(hgnc_subset_path):
+    with pytest.raises(ValueError):
+        apyhgnc.snapshot(hgnc_subset_path, update=True)
+
+
+class TestQuery:
+
+    def test_wildcard_keywords(self, snap):
+        result = snap.search(symbol="ZNF*", status="Approved")
+
+        assert list(result["symbol"]) == ["ZNF3", "ZNF33A", "ZNF33B"]
+
+    def test_wildcard_patterns(self, snap):
+        assert list(snap.search("symbol", "znf33?")["symbol"]) == \
+            ["ZNF33A", "ZNF33B"]
+        assert list(snap.search("symbol", "*P1")["symbol"]) == ["BRAFP1"]
+        assert snap.search("symbol", "ZNF3?").empty
+
+    def test_operators(self, snap):
+        result = snap.search("symbol:(ZNF* OR BRAF) AND NOT "
+                             "prev_symbol:ZNF33")
+
+        assert list(result["symbol"]) == ["BRAF", "ZNF3"]
+
+    def test_search_query(self, snap):
+        result = snap.query_positions("symbol:BRAF OR TP53 AND "
+                                      "status:Approved")
+
+        assert snap.docs(result)[1]["symbol"] == "TP53"
+        assert len(result) == 2
+
+    def test_quoted(self, snap):
+        assert snap.query_positions('symbol:"ZNF*"') == []
+
+    def test_fetch_literal(self, snap):
+        assert snap.fetch("symbol", "ZNF*").empty
+
+    def test_invalid_query(self, snap):
+        with pytest.raises(ValueError):
+            snap.search("symbol:(ZNF3")
+        with pytest.raises(ValueError):
+            snap.query_positions("ZNF3", "symbl")
+
+    def test_range(self, snap):
+        result = snap.search("symbol:[ZNF3 TO ZNF33Z]")
+
+        assert list(result["symbol"]) == ["ZNF3", "ZNF33A", "ZNF33B"]
+
+    def test_not_searchable_field(self, snap):
+        with pytest.raises(ValueError):
+            snap.search("date_modified:2019-01-01")
+        with pytest.raises(ValueError):
+            snap.search("date_modified:[2019-01-01 TO *]")
+        with pytest.raises(ValueError):
+            snap.search("date_modified:2019*")
+
+    def test_patch(self, snap):
+        assert snap.query_positions("symbol:NEW*") == []
+        snap.patch([{"hgnc_id": "HGNC:99999", "symbol": "NEWGENE"}])
+
+        assert snap.query_positions("symbol:NEW*") == [8]
+
+
+class TestResolveSymbols:
+    terms = ["BRAF", "ERBB", "her1", "NOTAGENE", "ZNF33", "OLDGENE", "braf"]
+
+    def test_resolved(self, snap):
+        result = snap.resolve_symbols(self.terms)
+
+        assert list(result["term"]) == self.terms
+        assert list(result["symbol"][:3]) == ["BRAF", "EGFR", "EGFR"]
+        assert list(result["match_type"][:3]) == ["symbol", "prev_symbol",
+                                                  "alias_symbol"]
+        assert result.loc[6, "hgnc_id"] == "HGNC:1097"
+
+    def test_status(self, snap):
+        expect = ["resolved", "resolved", "resolved", "not found",
+                  "ambiguous", "withdrawn", "resolved"]
+        result = snap.resolve_symbols(self.terms)
+
+        assert list(result["status"]) == expect
+
+    def test_ambiguous_candidates(self, snap):
+        result = snap.resolve_symbols(["ZNF33"])
+
+        assert result.loc[0, "candidates"] == ["ZNF33A", "ZNF33B"]
+
+    def test_exact_before_case_insensitive(self, snap):
+        result = snap.resolve_symbols(["p53", "P53"])
+
+        assert list(result["symbol"]) == ["TP53", "TP53"]
+
+    def test_withdrawn_does_not_block(self):
+        snap = Snapshot([{"hgnc_id": "HGNC:1", "symbol": "OLD~withdrawn",
+                          "status": "Entry Withdrawn"},
+                         {"hgnc_id": "HGNC:2", "symbol": "NEW",
+                          "prev_symbol": ["OLD"], "status": "Approved"}])
+        result = snap.resolve_symbols(["OLD", "old"])
+
+        assert list(result["hgnc_id"]) == ["HGNC:2", "HGNC:2"]
+        assert list(result["match_type"]) == ["prev_symbol", "prev_symbol"]
+        assert list(result["status"]) == ["resolved", "resolved"]
+
+
+def test_resolve_symbols(snap):
+    result = apyhgnc.resolve_symbols(["ERBB"], snap)
+
+    assert list(result["symbol"]) == ["EGFR"]
+
+
+class TestIdMap:
+
+    def test_one_to_one(self, snap):
+        result = snap.id_map("hgnc_id", "ensembl_gene_id",
+                             ["HGNC:13089", "hgnc:1097"])
+
+        assert list(result.columns) == ["hgnc_id", "ensembl_gene_id"]
+        assert list(result["ensembl_gene_id"]) == ["ENSG00000166526",
+                                                   "ENSG00000157764"]
+
+    def test_one_to_many(self, snap):
+        result = snap.id_map("symbol", "uniprot_ids", ["ZNF33B", "BRAF"])
+
+        assert list(result["symbol"]) == ["ZNF33B", "ZNF33B", "BRAF"]
+        assert list(result["uniprot_ids"]) == ["Q06732", "A0A024R7X9",
+                                               "P15056"]
+
+    def test_reverse(self, snap):
+        result = snap.id_map("uniprot_ids", "symbol", ["A0A024R7X9"])
+
+        assert list(result["symbol"]) == ["ZNF33B"]
+        assert ("symbol", "uniprot_ids") in snap._id_tables
+
+    def test_missing(self, snap):
+        result = snap.id_map("entrez_id", "symbol", [673, "NOTANID"])
+
+        assert result.loc[0, "symbol"] == "BRAF"
+        assert result["symbol"].isna().tolist() == [False, True]
+
+    def test_invalid_field(self, snap):
+        with pytest.raises(ValueError):
+            snap.id_map("ensembl_id", "symbol", ["ENSG00000157764"])
+
+
+def test_id_map(snap):
+    result = apyhgnc.id_map("symbol", "hgnc_id", ["ZNF3"], snap)
+
+    assert list(result["hgnc_id"]) == ["HGNC:13089"]
+
+
+class TestSuggest:
+
+    def test_ranking(self, snap):
+        result = snap.suggest("BRAFF")
+
+        assert list(result["suggestion"]) == ["BRAF", "BRAF2", "BRAF1",
+                                              "BRAFP1", "B-RAF1"]
+        assert list(result["distance"]) == [1, 1, 1, 2, 2]
+        assert list(result["match_type"][:3]) == ["symbol", "prev_symbol",
+                                                  "alias_symbol"]
+        assert list(result["symbol"]) == ["BRAF", "BRAF", "BRAF", "BRAFP1",
+                                          "BRAF"]
+
+    def test_limit(self, snap):
+        assert list(snap.suggest("braff", limit=1)["suggestion"]) == ["BRAF"]
+        assert len(snap.suggest("braff", max_distance=1, limit=None)) == 3
+
+    def test_no_suggestion(self, snap):
+        result = snap.suggest("NOTAGENE")
+
+        assert result.empty
+        assert "distance" in result.columns
+
+    def test_many(self, snap):
+        terms = ["her2", "NOTAGENE", None, "her2"]
+        result = snap.suggest_many(terms, max_distance=1)
+
+        assert list(result["term"][[0, 1, 3]]) == ["her2", "NOTAGENE",
+                                                   "her2"]
+        assert list(result["suggestion"][[0, 3]]) == ["HER1", "HER1"]
+        assert list(result["symbol"][[0, 3]]) == ["EGFR", "EGFR"]
+        assert list(result["status"][1:3]) == ["not found", "not found"]
+        assert result["distance"].isna().tolist() == [False, True, True,
+                                                      False]
+
+    def test_patch(self, snap):
+        assert snap.suggest("ZNF3NEX").empty
+        doc = snap.docs(snap.fetch_positions("symbol", "ZNF3"))[0]
+        doc["alias_symbol"] = ["ZNF3NEW"]
+        snap.patch([doc])
+        result = snap.suggest("ZNF3NEX")
+
+        assert list(result["suggestion"]) == ["ZNF3NEW"]
+        assert list(result["symbol"]) == ["ZNF3"]
+
+
+def test_suggest(snap):
+    result = apyhgnc.suggest_many(["ERBC"], max_distance=1, snap=snap)
+
+    assert list(result["symbol"]) == ["EGFR"]
+    assert list(apyhgnc.suggest("p54", snap=snap)["suggestion"])[0] == "p53"
+
+
+class TestUpdate:
+
+    @pytest.fixture
+    def server(self, hgnc_subset_path):
+        with open(hgnc_subset_path) as f:
+            docs = json.load(f)["response"]["docs"]
+        docs = copy.deepcopy(docs)
+        for doc in docs:
+            if doc["symbol"] == "ZNF3":
+                doc["name"] = "zinc finger protein 3, renamed"
+                doc["alias_symbol"] = ["ZNF3NEW"]
+                doc["date_modified"] = "2019-09-01T00:00:00Z"
+        docs.append({"hgnc_id": "HGNC:99999", "symbol": "NEWGENE",
+                     "status": "Approved",
+                     "date_modified": "2019-09-02T00:00:00Z"})
+        with MockHGNCServer(Snapshot(docs)) as server:
+            yield server
+
+    def test_patch(self, snap):
+        snap.index("alias_symbol")
+        snap.patch([{"hgnc_id": "HGNC:13089", "symbol": "ZNF3",
+                     "alias_symbol": ["ZNF3NEW"]},
+                    {"hgnc_id": "HGNC:99999", "symbol": "NEWGENE"}])
+
+        assert len(snap) == 9
+        assert list(snap.fetch("alias_symbol", "ZNF3NEW")["hgnc_id"]) == \
+            ["HGNC:13089"]
+        assert snap.fetch("alias_symbol", "A8K8O4").empty
+        assert "name" not in snap.fetch("symbol", "ZNF3").columns
+        assert list(snap.fetch("symbol", "NEWGENE")["hgnc_id"]) == \
+            ["HGNC:99999"]
+
+    def test_update(self, snap, server):
+        snap.index("symbol")
+        url = server.url + "hgnc_complete_set.json"
+        with Client(rate_limit=None) as client:
+            result = snap.update(client=client, host=server.url, url=url)
+            again = snap.update(client=client, host=server.url, url=url)
+
+        assert result == 2
+        assert again == 0
+        assert len(snap) == 9
+        assert snap.last_modified == "2019-09-02T00:00:00Z"
+        assert list(snap.fetch("symbol", "NEWGENE")["hgnc_id"]) == \
+            ["HGNC:99999"]
+        assert list(snap.resolve_symbols(["ZNF3NEW"])["symbol"]) == ["ZNF3"]
+
+    def test_update_error(self, snap, server):
+        last_modified = snap.last_modified
+        with Client(rate_limit=None) as client:
+            with pytest.raises(ValueError):
+                snap.update(client=client, host=server.url,
+                            url=server.url + "missing.json")
+
+        assert snap.last_modified == last_modified
+        assert len(snap) == 8
+
+    def test_update_arrow(self, snap, server, tmp_path):
+        pytest.importorskip("pyarrow")
+        path = os.path.join(str(tmp_path), "hgnc.arrow")
+        snap.save(path)
+        with Client(rate_limit=None) as client:
+            result = Snapshot.load(path)
+            changed = result.update(client=client, host=server.url,
+                                    url=server.url + "hgnc_complete_set.json")
+        result.save(path)
+        result = Snapshot.load(path)
+
+        assert changed == 2
+        assert len(result) == 9
+        assert list(result.fetch("prev_symbol", "ZNF33")["symbol"]) == \
+            ["ZNF33A", "ZNF33B"]
+        assert list(result.fetch("alias_symbol", "ZNF3NEW")["symbol"]) == \
+            ["ZNF3"]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import pytest
+import asyncio
+import requests
+from apyhgnc.cache import MemoryCache
+from apyhgnc.classes import Fetch
+from apyhgnc.client import Client
+from apyhgnc.mock import MockHGNCServer
+from apyhgnc.stats import Stats
+
+
+@pytest.fixture
+def server(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        yield server
+
+
+class TestStats:
+
+    def test_request(self, server):
+        stats = Stats()
+        with Client(rate_limit=None, stats=stats) as client:
+            Fetch("symbol", "ZNF3", client=client, host=server.url).query()
+        result = stats.as_dict()
+
+        assert result["requests"] == 1
+        assert result["rows"] == 1
+        assert result["bytes"] > 0
+        assert result["errors"] == 0
+        for phase in ["network", "decode", "frame"]:
+            assert result["phases"][phase]["count"] == 1
+            assert result["phases"][phase]["sum"] > 0
+
+    def test_async_request(self, server):
+        async def run(client):
+            return await Fetch("symbol", "ZNF3", client=client,
+                               host=server.url).aquery()
+
+        stats = Stats()
+        client = Client(rate_limit=None, stats=stats)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(run(client))
+        loop.run_until_complete(client.aclose())
+        loop.close()
+        result = stats.as_dict()
+
+        assert result["requests"] == 1
+        assert result["bytes"] > 0
+
+    def test_cache(self, server):
+        stats = Stats()
+        cache = MemoryCache()
+        cache.invalidate("2019-08-08T00:00:00Z")
+        with Client(rate_limit=None, cache=cache, stats=stats) as client:
+            for _ in range(3):
+                Fetch("symbol", "ZNF3", client=client,
+                      host=server.url).query()
+        result = stats.as_dict()
+
+        assert (result["cache_hits"], result["cache_misses"]) == (2, 1)
+        assert result["requests"] == 1
+
+    def test_retries_and_errors(self, monkeypatch):
+        def get(self, url, **kwargs):
+            raise requests.ConnectionError("connection refused")
+
+        monkeypatch.setattr(requests.Session, "get", get)
+        stats = Stats()
+        client = Client(rate_limit=None, retries=2, backoff=0.001,
+                        stats=stats)
+        with pytest.raises(requests.ConnectionError):
+            client.get("http://rest.genenames.org/fetch/symbol/ZNF3")
+        result = stats.as_dict()
+
+        assert (result["errors"], result["retries"]) == (1, 2)
+
+    def test_hooks(self, server):
+        events = []
+        stats = Stats()
+        stats.add_hook(lambda event, data: events.append(event))
+        with Client(rate_limit=None, stats=stats) as client:
+            Fetch("symbol", "ZNF3", client=client, host=server.url).query()
+
+        assert events == ["request", "frame"]
+
+    def test_prometheus(self):
+        stats = Stats()
+        stats.record_frame(10, 0.5)
+        result = stats.to_prometheus().splitlines()
+
+        assert "apyhgnc_rows_total 10" in result
+        assert 'apyhgnc_phase_seconds_sum{phase="frame"} 0.5' in result
+        assert 'apyhgnc_phase_seconds_count{phase="frame"} 1' in result
+
+    def test_reset(self):
+        stats = Stats()
+        stats.record_cache("http://rest.genenames.org/info", True)
+        stats.reset()
+        result = stats.as_dict()
+
+        assert result["cache_hits"] == 0
+
+    def test_repr(self):
+        expect = "HGNC Stats"
+        result = repr(Stats())
+
+        assert result == expect
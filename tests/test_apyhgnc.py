@@ -1,10 +1,22 @@
 #!/usr/bin/env python
 # -*- coding: UTF-8 -*-
 # Created by Roberto Preste
+import sys
+import time
 import pytest
+import subprocess
 import asyncio
+import pandas as pd
 from pandas.testing import assert_frame_equal
 from apyhgnc import apyhgnc
+from apyhgnc.classes import Fetch
+from apyhgnc.mock import MockHGNCServer
+
+
+@pytest.fixture
+def server(hgnc_subset_path):
+    with MockHGNCServer(path=hgnc_subset_path) as server:
+        yield server
 
 
 # apyhgnc.info
@@ -91,3 +103,156 @@ def test_search_symbol_and_status_async(df_search_symbol_and_status):
         apyhgnc.asearch(symbol="BRAF", status="Approved")
     )
     assert_frame_equal(result, df_search_symbol_and_status)
+
+
+# apyhgnc.fetch_many
+
+def test_fetch_many_znf3(server, df_fetch_symbol_znf3):
+    result = apyhgnc.fetch_many("symbol", ["ZNF3"], host=server.url)
+    result = result.drop(columns=["query_term", "query_status"])
+    assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                       check_dtype=False, check_column_type=False)
+
+
+def test_fetch_many_znf3_async(server, df_fetch_symbol_znf3):
+    loop = asyncio.new_event_loop()
+    result = loop.run_until_complete(
+        apyhgnc.afetch_many("symbol", ["ZNF3"], host=server.url)
+    )
+    loop.close()
+    result = result.drop(columns=["query_term", "query_status"])
+    assert_frame_equal(result, df_fetch_symbol_znf3, check_like=True,
+                       check_dtype=False, check_column_type=False)
+
+
+def test_fetch_many_invalid_term(server):
+    result = apyhgnc.fetch_many("symbol", [" ", "ZNF3"], host=server.url,
+                                return_exceptions=True)
+
+    assert list(result["query_status"]) == ["error", "found"]
+    assert "empty query term" in result.loc[0, "query_error"]
+
+
+def test_fetch_many_order_and_status(monkeypatch, df_fetch_symbol_znf3):
+    def query(self):
+        if self.url.endswith("ZNF3"):
+            return df_fetch_symbol_znf3
+        return pd.DataFrame()
+
+    monkeypatch.setattr(Fetch, "query", query)
+    result = apyhgnc.fetch_many("symbol", ["NOTAGENE", "ZNF3"],
+                                concurrency=1)
+
+    assert list(result["query_term"]) == ["NOTAGENE", "ZNF3"]
+    assert list(result["query_status"]) == ["not found", "found"]
+    assert result.loc[1, "hgnc_id"] == "HGNC:13089"
+
+
+def test_afetch_many_order_and_status(monkeypatch, df_fetch_symbol_znf3):
+    async def aquery(self):
+        if self.url.endswith("ZNF3"):
+            return df_fetch_symbol_znf3
+        return pd.DataFrame()
+
+    monkeypatch.setattr(Fetch, "aquery", aquery)
+    loop = asyncio.new_event_loop()
+    result = loop.run_until_complete(
+        apyhgnc.afetch_many("symbol", ["NOTAGENE", "ZNF3"], concurrency=1)
+    )
+    loop.close()
+
+    assert list(result["query_status"]) == ["not found", "found"]
+
+
+def _slow_query(self):
+    """Answer fetch queries out of order, failing on BROKEN."""
+    term = self.url.rsplit("/", 1)[1]
+    if term == "BROKEN":
+        raise ConnectionError("connection refused")
+    time.sleep(0.05 if term == "SLOW" else 0.01)
+    return pd.DataFrame({"hgnc_id": ["HGNC:" + term], "symbol": [term]})
+
+
+def test_fetch_many_errors(monkeypatch):
+    monkeypatch.setattr(Fetch, "query", _slow_query)
+    result = apyhgnc.fetch_many("symbol", ["SLOW", "BROKEN", "ZNF3"],
+                                return_exceptions=True)
+
+    assert list(result["query_term"]) == ["SLOW", "BROKEN", "ZNF3"]
+    assert list(result["query_status"]) == ["found", "error", "found"]
+    assert "connection refused" in result.loc[1, "query_error"]
+
+
+def test_fetch_many_raises(monkeypatch):
+    monkeypatch.setattr(Fetch, "query", _slow_query)
+    with pytest.raises(ConnectionError):
+        apyhgnc.fetch_many("symbol", ["SLOW", "BROKEN"])
+
+
+# apyhgnc.query_many
+
+def test_query_many_order(monkeypatch):
+    monkeypatch.setattr(Fetch, "query", _slow_query)
+    queries = [Fetch("symbol", term) for term in ["SLOW", "BRAF", "ZNF3"]]
+    result = apyhgnc.query_many(queries, workers=3)
+
+    assert [df.loc[0, "symbol"] for df in result] == ["SLOW", "BRAF", "ZNF3"]
+
+
+def test_query_many_errors(monkeypatch):
+    monkeypatch.setattr(Fetch, "query", _slow_query)
+    queries = [Fetch("symbol", term) for term in ["BROKEN", "ZNF3"]]
+    result = apyhgnc.query_many(queries, return_exceptions=True)
+
+    assert isinstance(result[0], ConnectionError)
+    assert result[1].loc[0, "symbol"] == "ZNF3"
+
+
+# apyhgnc.iter_search
+
+def test_iter_search_symbol_braf(server, df_search_symbol_braf):
+    pages = list(apyhgnc.iter_search("symbol", "BRAF", host=server.url))
+    result = pd.concat(pages, ignore_index=True)
+
+    assert list(result.columns) == list(df_search_symbol_braf.columns)
+    assert list(result["hgnc_id"]) == list(df_search_symbol_braf["hgnc_id"])
+
+
+def test_iter_search_pages(server):
+    pages = list(apyhgnc.iter_search(status="Approved", rows=3,
+                                     host=server.url))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+
+# lazy imports
+
+@pytest.mark.parametrize("statement", ["import apyhgnc",
+                                       "from apyhgnc import Info, Client"])
+def test_lazy_imports(statement):
+    code = "import sys; {}; print(*sorted(m for m in ('pandas', " \
+           "'aiohttp', 'requests') if m in sys.modules))".format(statement)
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout.split()
+
+    assert result == []
+
+
+def test_lazy_attributes():
+    import apyhgnc as package
+
+    assert package.Fetch is Fetch
+    assert "fetch_many" in dir(package)
+    with pytest.raises(AttributeError):
+        package.NotAnAttribute
+
+
+def test_lazy_submodules():
+    code = "import apyhgnc; print(apyhgnc.apyhgnc.fetch.__name__, " \
+           "apyhgnc.classes.Fetch.__name__)"
+    result = subprocess.run([sys.executable, "-c", code], check=True,
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout.split()
+
+    assert result == ["fetch", "Fetch"]
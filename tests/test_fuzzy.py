@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import random
+import pytest
+from apyhgnc.fuzzy import FuzzyIndex, distance
+
+
+def _levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char != other)))
+        previous = current
+    return previous[-1]
+
+
+def _words(rng: random.Random, size: int):
+    return ["".join(rng.choice("abc1-") for _ in range(rng.randint(0, 9)))
+            for _ in range(size)]
+
+
+@pytest.mark.parametrize("a, b, expect", [("braf", "braf", 0),
+                                          ("braf", "braf1", 1),
+                                          ("braf1", "b-raf1", 1),
+                                          ("her1", "erbb1", 3),
+                                          ("", "tp53", 4),
+                                          ("tp53", "", 4)])
+def test_distance(a, b, expect):
+    assert distance(a, b) == expect
+
+
+def test_distance_random():
+    rng = random.Random(0)
+    words = _words(rng, 400)
+    for a, b in zip(words, reversed(words)):
+        assert distance(a, b) == _levenshtein(a, b)
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 2])
+def test_lookup(max_distance):
+    rng = random.Random(max_distance)
+    keys = sorted(set(_words(rng, 300)))
+    index = FuzzyIndex(keys, max_distance=2)
+    for term in _words(rng, 30):
+        expect = sorted((_levenshtein(term, key), key) for key in keys
+                        if _levenshtein(term, key) <= max_distance)
+
+        assert index.lookup(term, max_distance) == expect
+
+
+def test_lookup_default():
+    index = FuzzyIndex(["braf", "araf", "raf1", "egfr"], max_distance=1)
+
+    assert index.lookup("brafx") == [(1, "braf")]
+    assert len(index) == 4
+
+
+def test_lookup_invalid_distance():
+    index = FuzzyIndex(["braf"], max_distance=1)
+    with pytest.raises(ValueError):
+        index.lookup("braf", 2)
+    with pytest.raises(ValueError):
+        FuzzyIndex(["braf"], max_distance=-1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import pytest
+from apyhgnc.solr import evaluate, parse_query, wildcard_regex
+
+
+@pytest.mark.parametrize("query, expect", [
+    ("BRAF", ("term", None, "BRAF", False)),
+    ("symbol:BRAF", ("term", "symbol", "BRAF", False)),
+    ("hgnc_id:HGNC:1097", ("term", "hgnc_id", "HGNC:1097", False)),
+    ("HGNC:1097", ("term", None, "HGNC:1097", False)),
+    ('symbol:"ZNF*"', ("term", "symbol", "ZNF*", True)),
+    ("name:zinc finger protein 3",
+     ("term", "name", "zinc finger protein 3", False)),
+    ("date_modified:[2019-01-01 TO *]",
+     ("term", None, "date_modified:[2019-01-01 TO *]", False)),
+])
+def test_parse_term(query, expect):
+    assert parse_query(query) == expect
+
+
+def test_parse_search_query():
+    result = parse_query("symbol:BRAF OR ZNF3 AND status:Approved")
+
+    assert result == ("and", [("or", [("term", "symbol", "BRAF", False),
+                                      ("term", "symbol", "ZNF3", False)]),
+                              ("term", "status", "Approved", False)])
+
+
+def test_parse_groups():
+    result = parse_query("symbol:(BRAF OR ZNF*) AND NOT status:Approved")
+
+    assert result == ("and", [("or", [("term", "symbol", "BRAF", False),
+                                      ("term", "symbol", "ZNF*", False)]),
+                              ("not", ("term", "status", "Approved",
+                                       False))])
+
+
+def test_parse_fields():
+    result = parse_query("date_modified:[2019-01-01 TO *]", "symbol",
+                         ["date_modified"])
+
+    assert result == ("term", "date_modified", "[2019-01-01 TO *]", False)
+    assert parse_query("BRAF", "symbol") == ("term", "symbol", "BRAF",
+                                             False)
+
+
+@pytest.mark.parametrize("query", ["", "(BRAF", "BRAF AND", "symbol:",
+                                   "BRAF)", "AND BRAF"])
+def test_parse_invalid(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+def test_wildcard_regex():
+    assert wildcard_regex("znf3*").match("znf33a")
+    assert wildcard_regex("znf3?").match("znf33")
+    assert not wildcard_regex("znf3?").match("znf33a")
+    assert wildcard_regex("b.r*").match("b.raf")
+    assert not wildcard_regex("b.r*").match("bxraf")
+
+
+def test_evaluate():
+    values = {"a": {1, 2, 3}, "b": {3, 4}, "c": {2, 3}}
+
+    def lookup(field, term, quoted):
+        return set(values.get(term, ()))
+
+    def universe():
+        return set(range(6))
+
+    assert evaluate(parse_query("a AND b"), lookup, universe) == {3}
+    assert evaluate(parse_query("a OR b AND c"), lookup, universe) == {2, 3}
+    assert evaluate(parse_query("a AND NOT c"), lookup, universe) == {1}
+    assert evaluate(parse_query("NOT a"), lookup, universe) == {0, 4, 5}
+    assert evaluate(parse_query("d AND a"), lookup, universe) == set()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Created by Roberto Preste
+import os
+import pytest
+import pandas as pd
+from apyhgnc.schema import Schema
+from apyhgnc.snapshot import Snapshot
+from apyhgnc.tables import table_format, write_table, read_table
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def snap(hgnc_subset_path) -> Snapshot:
+    return Snapshot.from_json(hgnc_subset_path)
+
+
+@pytest.mark.parametrize("name", ["znf3.arrow", "znf3.parquet"])
+def test_roundtrip(tmp_path, df_fetch_symbol_znf3, name):
+    path = os.path.join(str(tmp_path), name)
+    write_table(df_fetch_symbol_znf3, path)
+    result = read_table(path)
+
+    assert list(result.columns) == list(df_fetch_symbol_znf3.columns)
+    assert list(result["symbol"]) == ["ZNF3"]
+    assert list(result.loc[0, "alias_symbol"]) == \
+        list(df_fetch_symbol_znf3.loc[0, "alias_symbol"])
+    assert isinstance(result["symbol"].dtype, pd.ArrowDtype)
+
+
+def test_typed_roundtrip(tmp_path, snap):
+    path = os.path.join(str(tmp_path), "typed.arrow")
+    df = Schema().to_frame(snap.docs(list(range(len(snap)))))
+    write_table(df, path)
+    result = read_table(path, memory_map=False)
+
+    assert len(result) == len(snap)
+    assert list(result["status"].astype(str)) == list(df["status"].astype(str))
+
+
+def test_format():
+    assert table_format("hgnc.parquet") == "parquet"
+    assert table_format("hgnc.arrow") == "ipc"
+    assert table_format("hgnc.pkl.gz") is None
+    with pytest.raises(ValueError):
+        write_table(pd.DataFrame(), "hgnc.csv")
+
+
+@pytest.mark.parametrize("name", ["hgnc.arrow", "hgnc.parquet"])
+def test_snapshot(tmp_path, snap, name):
+    path = os.path.join(str(tmp_path), name)
+    snap.save(path)
+    result = Snapshot.load(path)
+
+    assert len(result) == len(snap)
+    assert result.last_modified == snap.last_modified
+    assert list(result.fetch("prev_symbol", "ZNF33")["symbol"]) == \
+        ["ZNF33A", "ZNF33B"]
+    assert list(result.id_map("symbol", "uniprot_ids",
+                              ["ZNF33B"])["uniprot_ids"]) == \
+        ["Q06732", "A0A024R7X9"]
+    assert list(result.resolve_symbols(["OLDGENE"])["status"]) == \
+        ["withdrawn"]